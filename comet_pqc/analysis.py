@@ -0,0 +1,227 @@
+"""Analysis stage running analysis functions in worker processes."""
+
+import concurrent.futures
+import functools
+import logging
+import multiprocessing
+import sys
+import threading
+import time
+import types
+
+import numpy as np
+
+__all__ = [
+    'analysis_registry',
+    'analysis_status_passed',
+    'analysis_function',
+    'parse_analysis_tasks',
+    'run_analysis',
+    'fit_points',
+    'AnalysisJob',
+    'AnalysisExecutor'
+]
+
+@functools.lru_cache(maxsize=None)
+def analysis_registry():
+    """Return read only mapping of analysis names to analysis functions of
+    module `analysis_pqc`, built once on first use.
+    """
+    import analysis_pqc
+    prefix = 'analyse_'
+    return types.MappingProxyType({
+        name[len(prefix):]: function
+        for name, function in vars(analysis_pqc).items()
+        if name.startswith(prefix) and callable(function)
+    })
+
+def analysis_status_passed():
+    """Return status of passed analysis results, importing module
+    `analysis_pqc` on first use.
+    """
+    import analysis_pqc
+    return analysis_pqc.STATUS_PASSED
+
+def analysis_function(name):
+    """Return analysis function `name`, raises `KeyError` if no such
+    function exists.
+    """
+    function = analysis_registry().get(name)
+    if function is None:
+        raise KeyError(f"No such analysis function: {name}")
+    return function
+
+def parse_analysis_tasks(functions):
+    """Return tuple of validated `(name, kwargs)` analysis tasks from a list
+    of analysis names or dictionaries providing key `type` and keyword
+    arguments.
+
+    >>> parse_analysis_tasks(['iv', {'type': 'cv', 'min_r_value': .9}])
+    (('iv', {}), ('cv', {'min_r_value': 0.9}))
+    """
+    tasks = []
+    for analysis in functions:
+        # String only argument to dictionary
+        if isinstance(analysis, str):
+            analysis = {'type': analysis}
+        if not isinstance(analysis, dict):
+            raise TypeError(f"Invalid analysis type: '{analysis}'")
+        kwargs = dict(analysis)
+        name = kwargs.pop('type', None)
+        analysis_function(name)
+        tasks.append((name, kwargs))
+    return tuple(tasks)
+
+def run_analysis(name, kwargs, series):
+    """Run analysis function `name` with keyword arguments `kwargs` on
+    dictionary of `series` arrays, returns tuple of result type name and
+    result dictionary. Executed in worker processes.
+    """
+    logging.info("Running analysis function '%s'...", name)
+    result = analysis_function(name)(**series, **kwargs)
+    logging.info("Running analysis function '%s'... done.", name)
+    return type(result).__name__, result._asdict()
+
+def fit_points(values):
+    """Return list of linear fit points `(x, a * x + b)` of an analysis result
+    dictionary or an empty list if it provides no fit.
+    """
+    if 'x_fit' not in values:
+        return []
+    a, b = values.get('a'), values.get('b')
+    return [(x, a * x + b) for x in values.get('x_fit')]
+
+class AnalysisJob:
+    """Analysis functions submitted for one measurement.
+
+    Results are collected in order of completion, failed functions are
+    logged and skipped.
+    """
+
+    def __init__(self, futures, result=None):
+        self.results = []
+        self.__result = result
+        self.__callbacks = []
+        self.__pending = len(futures)
+        self.__finished = not futures
+        self.__lock = threading.Lock()
+        self.__done = threading.Event()
+        if self.__finished:
+            self.__done.set()
+        for future in futures:
+            future.add_done_callback(self.__future_done)
+
+    def done(self):
+        return self.__done.is_set()
+
+    def wait(self, timeout=None):
+        """Wait until all analysis functions finished and all callbacks
+        returned, returns `False` on timeout.
+        """
+        return self.__done.wait(timeout)
+
+    def add_done_callback(self, callback):
+        """Call `callback(job)` once all analysis functions finished,
+        immediately if already done.
+        """
+        with self.__lock:
+            if not self.__finished:
+                self.__callbacks.append(callback)
+                return
+        callback(self)
+
+    def __future_done(self, future):
+        try:
+            key, values = future.result()
+        except Exception as exc:
+            logging.error("analysis failed: %s", exc)
+        else:
+            self.results.append((key, values))
+            if self.__result is not None:
+                try:
+                    self.__result(key, values)
+                except Exception as exc:
+                    logging.error("analysis result handler failed: %s", exc)
+        with self.__lock:
+            self.__pending -= 1
+            if self.__pending > 0:
+                return
+            callbacks, self.__callbacks = self.__callbacks, []
+            self.__finished = True
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as exc:
+                logging.error("analysis callback failed: %s", exc)
+        self.__done.set()
+
+class AnalysisExecutor:
+    """Runs analysis functions on snapshots of series arrays in a pool of
+    worker processes, created on first use.
+
+    >>> executor = AnalysisExecutor()
+    >>> job = executor.submit([('iv', {})], dict(v=v, i=i), result=print)
+    >>> job.wait()
+    """
+
+    def __init__(self, max_workers=None, executor_factory=None):
+        self.max_workers = max_workers
+        self.executor_factory = executor_factory or self.create_process_pool
+        self.__executor = None
+        self.__jobs = []
+        self.__lock = threading.Lock()
+
+    def create_process_pool(self):
+        # Argument mp_context requires Python >= 3.7, older versions use the
+        # platform default start method
+        if sys.version_info < (3, 7):
+            return concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers)
+        # Do not fork the GUI process
+        context = multiprocessing.get_context('spawn')
+        return concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+
+    @property
+    def executor(self):
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = self.executor_factory()
+            return self.__executor
+
+    def submit(self, tasks, series, result=None):
+        """Submit analysis `tasks`, a list of `(name, kwargs)` tuples, for a
+        copy of `series` arrays. Calls `result(key, values)` for every
+        finished analysis function. Returns an analysis job.
+        """
+        series = {key: np.array(values, dtype=np.float64) for key, values in series.items()}
+        futures = [self.executor.submit(run_analysis, name, kwargs, series) for name, kwargs in tasks]
+        job = AnalysisJob(futures, result)
+        with self.__lock:
+            self.__jobs = [other for other in self.__jobs if not other.done()]
+            self.__jobs.append(job)
+        return job
+
+    @property
+    def pending(self):
+        """Number of unfinished analysis jobs."""
+        with self.__lock:
+            return len([job for job in self.__jobs if not job.done()])
+
+    def wait(self, timeout=None):
+        """Wait for all submitted analysis jobs to finish, returns `False` if
+        jobs are still pending after `timeout` seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.__lock:
+            jobs = list(self.__jobs)
+        for job in jobs:
+            remaining = None if deadline is None else max(0., deadline - time.monotonic())
+            if not job.wait(remaining):
+                return False
+        return True
+
+    def shutdown(self):
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+            self.__jobs.clear()
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -2,6 +2,7 @@ import copy
 import glob
 import os
 import re
+import threading
 
 import jsonschema
 import yaml
@@ -17,7 +18,9 @@ __all__ = [
     'load_chuck',
     'load_sample',
     'load_sequence',
-    'list_configs'
+    'list_configs',
+    'config_name',
+    'config_cache'
 ]
 
 ASSETS_DIR = make_path('assets')
@@ -35,32 +38,128 @@ def make_id(name):
     """
     return re.sub(r'[^\w\-]+', '_', name.strip()).strip('_')
 
+class ConfigCache:
+    """Cache of parsed YAML files keyed on path, modification time and size.
+
+    Values derived from a file (e.g. compiled validators or validation
+    results) are stored along with the parsed data and discarded whenever
+    the file changes.
+    """
+
+    def __init__(self):
+        self.__entries = {}
+        self.__lock = threading.RLock()
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def entry(self, filename):
+        """Return cache entry dictionary of file, parses the file if not
+        cached or modified.
+        """
+        path = os.path.abspath(filename)
+        stat = os.stat(path)
+        key = stat.st_mtime_ns, stat.st_size
+        with self.__lock:
+            entry = self.__entries.get(path)
+            if entry is None or entry.get('key') != key:
+                with open(path) as f:
+                    data = yaml.safe_load(f.read())
+                entry = {'key': key, 'data': data}
+                self.__entries[path] = entry
+            return entry
+
+    def derived(self, filename, name, factory):
+        """Return value `name` derived from cached file data, created by
+        `factory(data)` once per file version.
+        """
+        with self.__lock:
+            entry = self.entry(filename)
+            if name not in entry:
+                entry[name] = factory(entry.get('data'))
+            return entry[name]
+
+    def load(self, filename):
+        """Return copy of parsed file data."""
+        with self.__lock:
+            return copy.deepcopy(self.entry(filename).get('data'))
+
+config_cache = ConfigCache()
+"""Shared cache of configuration and schema files."""
+
+def schema_filename(name):
+    return os.path.join(SCHEMA_DIR, f'{name}.yaml')
+
 def load_schema(name):
     """Loads a YAML validation schema from the schema directory.
 
     >>> load_schema("sample")
     {...}
     """
-    with open(os.path.join(SCHEMA_DIR, f'{name}.yaml')) as f:
-        return yaml.safe_load(f.read())
+    return config_cache.load(schema_filename(name))
+
+def schema_validator(name):
+    """Returns compiled validator of a schema from the schema directory,
+    created once per schema file version.
+    """
+    def create_validator(schema_data):
+        cls = jsonschema.validators.validator_for(schema_data)
+        cls.check_schema(schema_data)
+        return cls(schema_data)
+    return config_cache.derived(schema_filename(name), 'validator', create_validator)
 
 def validate_config(data, schema):
     """Validate config data using schema name."""
-    schema_data = load_schema(schema)
-    jsonschema.validate(data, schema_data)
+    error = jsonschema.exceptions.best_match(schema_validator(schema).iter_errors(data))
+    if error is not None:
+        raise error
 
 def load_config(filename, schema=None):
     """Loads a YAML configuration file and optionally validates the content
-    using the provided schema.
+    using the provided schema. Parsed files and validation results are
+    cached until the file changes.
 
     >>> load_config("sample.yaml", schema="sample")
     {...}
     """
-    with open(filename) as f:
-        config_data = yaml.safe_load(f.read())
     if schema is not None:
-        validate_config(config_data, schema)
-    return config_data
+        def validate(config_data):
+            validate_config(config_data, schema)
+            return True
+        config_cache.derived(filename, f'valid:{schema}', validate)
+    return config_cache.load(filename)
+
+_config_names = {}
+
+def config_name(filename):
+    """Returns name of a configuration file reading only the top level
+    `name` entry if possible, cached until the file changes.
+
+    >>> config_name("sample.yaml")
+    'Default HMW N'
+    """
+    path = os.path.abspath(filename)
+    stat = os.stat(path)
+    key = stat.st_mtime_ns, stat.st_size
+    cached = _config_names.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    name = None
+    with open(path) as f:
+        for line in f:
+            if line.startswith('name:'):
+                try:
+                    value = yaml.safe_load(line).get('name')
+                except (yaml.YAMLError, AttributeError):
+                    value = None
+                if isinstance(value, str) and value:
+                    name = value
+                break
+    if name is None:
+        name = (load_config(path) or {}).get('name')
+    _config_names[path] = key, name
+    return name
 
 def load_chuck(filename):
     """Returns a chuck configuration object, provided for convenience.
@@ -96,8 +195,7 @@ def list_configs(directory):
     """
     items = []
     for filename in glob.glob(os.path.join(directory, '*.yaml')):
-        data = load_config(filename)
-        items.append((data.get('name'), filename))
+        items.append((config_name(filename), filename))
     return items
 
 class Chuck:
@@ -172,11 +270,12 @@ class Sequence:
 class SequenceContact:
     """Sequence contact point."""
 
-    def __init__(self, name, contact_id, id=None, enabled=True, description="", measurements=None):
+    def __init__(self, name, contact_id, id=None, enabled=True, pinned=False, description="", measurements=None):
         self.id = id or make_id(name)
         self.name = name
         self.contact_id = contact_id
         self.enabled = enabled
+        self.pinned = pinned
         self.description = description
         self.measurements = list(map(lambda kwargs: SequenceMeasurement(**kwargs), measurements or []))
 
@@ -36,6 +36,7 @@ from .tabs import EnvironmentTab
 from .tabs import MeasurementTab
 from .tabs import StatusTab
 from .tabs import SummaryTab
+from .analysis import fit_points
 from .logwindow import LogWidget
 from .formatter import CSVFormatter
 from .settings import settings
@@ -290,11 +291,19 @@ class Dashboard(ui.Splitter, ProcessMixin, SettingsMixin):
         )
         self.start_measurement_action.qt.setEnabled(False)
 
+        self.route_report_action = ui.Action(
+            text="Contact &Route...",
+            triggered=self.on_route_report
+        )
+        self.route_report_action.qt.setEnabled(False)
+
         self.start_menu = ui.Menu()
         self.start_menu.append(self.start_all_action)
         self.start_menu.append(self.start_sample_action)
         self.start_menu.append(self.start_contact_action)
         self.start_menu.append(self.start_measurement_action)
+        self.start_menu.qt.addSeparator()
+        self.start_menu.append(self.route_report_action)
 
         self.start_button = ui.Button(
             text="Start",
@@ -441,9 +450,11 @@ class Dashboard(ui.Splitter, ProcessMixin, SettingsMixin):
 
         self.environ_process = self.processes.get("environ")
         self.environ_process.pc_data_updated = self.on_pc_data_updated
+        self.environ_process.sample_interval = self.environment_poll_interval
 
         self.status_process = self.processes.get("status")
         self.status_process.finished = self.on_status_finished
+        self.status_process.updated = self.on_status_updated
 
         self.table_process = self.processes.get("table")
         self.table_process.joystick_changed = self.on_table_joystick_changed
@@ -453,6 +464,7 @@ class Dashboard(ui.Splitter, ProcessMixin, SettingsMixin):
         self.measure_process.finished = self.on_finished
         self.measure_process.measurement_state = self.on_measurement_state
         self.measure_process.save_to_image = self.on_save_to_image
+        self.measure_process.analysis_result = self.on_analysis_result
 
         # Experimental
 
@@ -557,6 +569,27 @@ class Dashboard(ui.Splitter, ProcessMixin, SettingsMixin):
     def export_txt(self):
         return bool(self.settings.get("export_txt", True))
 
+    def export_npz(self):
+        return bool(self.settings.get("export_npz", False))
+
+    def flush_interval(self):
+        return float(self.settings.get("flush_interval", 1.0))
+
+    def optimize_route(self):
+        return bool(self.settings.get("optimize_route", False))
+
+    def pipeline_setup(self):
+        return bool(self.settings.get("pipeline_setup", False))
+
+    def skip_identical_reset(self):
+        return bool(self.settings.get("skip_identical_reset", False))
+
+    def event_rate(self):
+        return float(self.settings.get("event_rate", 25.0))
+
+    def concurrent_analysis(self):
+        return bool(self.settings.get("concurrent_analysis", False))
+
     # Callbacks
 
     def lock_controls(self):
@@ -602,11 +635,13 @@ class Dashboard(ui.Splitter, ProcessMixin, SettingsMixin):
         self.start_sample_action.qt.setEnabled(False)
         self.start_contact_action.qt.setEnabled(False)
         self.start_measurement_action.qt.setEnabled(False)
+        self.route_report_action.qt.setEnabled(False)
         if isinstance(item, SampleTreeItem):
             panel = self.panels.get("sample")
             panel.visible = True
             panel.mount(item)
             self.start_sample_action.qt.setEnabled(True)
+            self.route_report_action.qt.setEnabled(True)
         if isinstance(item, ContactTreeItem):
             panel = self.panels.get("contact")
             panel.visible = True
@@ -732,6 +767,21 @@ class Dashboard(ui.Splitter, ProcessMixin, SettingsMixin):
                 move_to_after_position=dialog.move_to_position()
             )
 
+    @handle_exception
+    def on_route_report(self):
+        sample_item = self.sequence_tree.current
+        if not isinstance(sample_item, SampleTreeItem):
+            return
+        for contact_item in sample_item.children:
+            if contact_item.enabled and not contact_item.has_position:
+                raise RuntimeError(f"No contact position assigned for {sample_item.name} -> {contact_item.name}")
+        enabled_items, report = self.measure_process.route_report(sample_item, self.table_position())
+        order = ", ".join(enabled_items[index].name for index in report.order)
+        ui.show_info(
+            title="Contact Route",
+            text=f"{report}\n\nOptimized order: {order}"
+        )
+
     def _on_start(self, context, move_to_contact=False, move_to_after_position=None):
         # Create output directory
         self.create_output_dir()
@@ -751,7 +801,14 @@ class Dashboard(ui.Splitter, ProcessMixin, SettingsMixin):
         measure.set("use_table", self.use_table())
         measure.set("serialize_json", self.export_json())
         measure.set("serialize_txt", self.export_txt())
+        measure.set("serialize_npz", self.export_npz())
+        measure.set("flush_interval", self.flush_interval())
         measure.set("move_to_contact", move_to_contact)
+        measure.set("optimize_route", self.optimize_route())
+        measure.set("pipeline_setup", self.pipeline_setup())
+        measure.set("skip_identical_reset", self.skip_identical_reset())
+        measure.set("event_rate", self.event_rate())
+        measure.set("concurrent_analysis", self.concurrent_analysis())
         measure.set("move_to_after_position", move_to_after_position)
         def show_measurement(item):
             item.selectable = True
@@ -765,6 +822,7 @@ class Dashboard(ui.Splitter, ProcessMixin, SettingsMixin):
             panel.visible = True
             panel.mount(item)
             measure.reading = panel.append_reading
+            measure.readings = panel.append_readings
             measure.update = panel.update_readings
             measure.append_analysis = panel.append_analysis
             measure.state = panel.state
@@ -781,6 +839,22 @@ class Dashboard(ui.Splitter, ProcessMixin, SettingsMixin):
         item.quality = quality
         self.sequence_tree.fit()
 
+    def on_analysis_result(self, item, key, values):
+        """Show result of concurrent analysis, the measurement might be no
+        longer mounted.
+        """
+        points = fit_points(values)
+        panel = self.panels.get(item.type)
+        if panel and panel.measurement is item:
+            panel.append_analysis(key, values)
+            if points:
+                x_values, y_values = zip(*points)
+                panel.append_readings("xfit", x_values, y_values)
+        else:
+            item.analysis[key] = values
+            if points:
+                item.series["xfit"] = points
+
     def on_save_to_image(self, item, filename):
         plot_png = self.settings.get("png_plots") or False
         panel = self.panels.get(item.type)
@@ -867,6 +941,9 @@ class Dashboard(ui.Splitter, ProcessMixin, SettingsMixin):
         # Fix: stay in status tab
         self.tab_widget.current = self.status_tab
 
+    def on_status_updated(self):
+        self.status_tab.update_status(self.status_process)
+
     def on_status_finished(self):
         self.unlock_controls()
         self.status_tab.update_status(self.status_process)
@@ -973,7 +1050,9 @@ class Dashboard(ui.Splitter, ProcessMixin, SettingsMixin):
         """Syncronize environment controls."""
         if self.use_environment():
             with self.environ_process as environment:
-                environment.request_pc_data()
+                # Updates are emitted by the background sampling
+                if environment.latest_pc_data(max_age=2 * self.environment_poll_interval) is None:
+                    environment.request_pc_data()
 
         else:
             self.environment_tab.enabled = False
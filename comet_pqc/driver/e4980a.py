@@ -201,3 +201,31 @@ class E4980A(IEC60488):
         self.fetch = Fetch(resource)
         self.frequency = Frequency(resource)
         self.system = System(resource)
+
+    LIST_SIZE_MAXIMUM = 201
+
+    @lock
+    def acquire_batch(self, count: int) -> List[Tuple[float, float]]:
+        """Acquire `count` readings at the current measurement frequency using
+        a single triggered list sweep, return list of primary and secondary
+        values. Switches display to the list sweep page during acquisition.
+        Raises `ValueError` if the reply does not match the list size.
+        """
+        if not 0 < count <= self.LIST_SIZE_MAXIMUM:
+            raise ValueError(f"invalid batch size: {count}")
+        frequency = float(self.resource.query(':FREQ:CW?'))
+        self.resource.write(':DISP:PAGE LIST')
+        try:
+            self.resource.write(':LIST:MODE SEQ')
+            self.resource.write(f':LIST:FREQ {",".join([format(frequency, "E")] * count)}')
+            self.resource.write(':TRIG:IMM')
+            self.resource.query('*OPC?')
+            values = list(map(float, self.resource.query(':FETC?').split(',')))
+        finally:
+            self.resource.write(':DISP:PAGE MEAS')
+            self.resource.query('*OPC?')
+        # Every list point returns data A, data B, status and comparator result
+        width = len(values) // count
+        if width < 2 or len(values) != count * width:
+            raise ValueError(f"unexpected list sweep reply: {len(values)} values for {count} points")
+        return [(values[index], values[index + 1]) for index in range(0, width * count, width)]
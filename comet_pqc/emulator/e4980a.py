@@ -7,13 +7,51 @@ class PQCE4980AHandler(E4980AHandler):
 
     bias_voltage_level = 0.0
     bias_state = False
+    frequency = 1000.0
+    display_page = 'MEAS'
+    list_mode = 'SEQ'
+    list_frequencies = []
 
     @message(r':?FETC[H]?\?')
     @message(r':?FETC[H]:FORM[AT]?\?')
     @message(r':?FETC[H]:IMP:FORM[AT]?\?')
     def query_fetch(self):
+        if type(self).display_page == 'LIST' and type(self).list_frequencies:
+            # Data A, data B, status and comparator result for every list point
+            return ','.join(
+                '{:E},{:E},{:+d},{:+d}'.format(random.random(), random.random(), 0, 0)
+                for _ in type(self).list_frequencies
+            )
         return '{:E},{:E},{:+d}'.format(random.random(), random.random(), 0)
 
+    @message(r':?FREQ(?::CW)?\?')
+    def get_frequency(self):
+        return format(type(self).frequency, 'E')
+
+    @message(r':?FREQ(?::CW)?\s+(.*)')
+    def set_frequency(self, value):
+        type(self).frequency = float(value)
+
+    @message(r':?DISP:PAGE\s+(\w+)')
+    def set_display_page(self, value):
+        type(self).display_page = value.upper()
+
+    @message(r':?LIST:MODE\s+(\w+)')
+    def set_list_mode(self, value):
+        type(self).list_mode = value.upper()
+
+    @message(r':?LIST:FREQ\s+(.*)')
+    def set_list_frequencies(self, values):
+        type(self).list_frequencies = [float(value) for value in values.split(',')]
+
+    @message(r':?LIST:FREQ\?')
+    def get_list_frequencies(self):
+        return ','.join(format(value, 'E') for value in type(self).list_frequencies)
+
+    @message(r':?TRIG:IMM')
+    def trigger_immediate(self):
+        pass
+
     @message(r':?BIAS:POL:CURR\?')
     @message(r':?BIAS:POL:CURR:LEV\?')
     def get_bias_polarity_current_level(self):
@@ -0,0 +1,151 @@
+"""Rate limited coalescing of process events."""
+
+import threading
+import time
+
+__all__ = ['EventMetrics', 'EventBus']
+
+class EventMetrics:
+    """Event bus counters."""
+
+    def __init__(self):
+        self.received = {}
+        self.delivered = 0
+        self.flushes = 0
+        self.max_depth = 0
+
+    @property
+    def total_received(self):
+        return sum(self.received.values())
+
+    def __str__(self):
+        received = ", ".join(f"{name}: {count}" for name, count in self.received.items())
+        return (
+            f"received: {self.total_received} ({received}), delivered: {self.delivered}, "
+            f"flushes: {self.flushes}, max depth: {self.max_depth}"
+        )
+
+class EventBus:
+    """Coalesces events emitted by a worker thread and delivers them at a
+    maximum `rate` (flushes per second) using `deliver(event, *args)`.
+
+    - `message` and `progress` events keep only the latest arguments,
+    - `state` dictionaries are merged,
+    - `reading` events `(name, x, y)` are batched per series and delivered
+      as `readings` events `(name, x_values, y_values)`,
+    - `update` events are delivered once after the readings.
+
+    All other events flush pending events and are delivered immediately,
+    preserving their order relative to coalesced events. A rate of zero
+    disables coalescing.
+
+    >>> bus = EventBus(process_emit, rate=25)
+    >>> bus.start()
+    >>> bus.emit("reading", "hvsrc", 1.0, 4.2e-9)
+    >>> bus.close()
+    """
+
+    latest_events = 'message', 'progress'
+
+    merged_events = 'state',
+
+    batched_events = 'reading',
+
+    trailing_events = 'update',
+
+    def __init__(self, deliver, rate=25.0, clock=time.monotonic):
+        self.deliver = deliver
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self.clock = clock
+        self.metrics = EventMetrics()
+        self.__lock = threading.RLock()
+        self.__pending = {}
+        self.__depth = 0
+        self.__flushed = clock()
+        self.__stop_event = threading.Event()
+        self.__thread = None
+
+    @property
+    def depth(self):
+        """Number of events waiting for delivery."""
+        with self.__lock:
+            return self.__depth
+
+    def emit(self, event, *args):
+        with self.__lock:
+            received = self.metrics.received
+            received[event] = received.get(event, 0) + 1
+            if not self.interval or not self.coalesce(event, args):
+                self.flush()
+                self.__deliver(event, *args)
+                return
+            self.__depth += 1
+            self.metrics.max_depth = max(self.metrics.max_depth, self.__depth)
+            if self.clock() - self.__flushed >= self.interval:
+                self.flush()
+
+    def coalesce(self, event, args):
+        """Add event to pending events, returns `False` if event can not be
+        coalesced.
+        """
+        pending = self.__pending
+        if event in self.latest_events:
+            pending[event] = args
+        elif event in self.merged_events and len(args) == 1 and isinstance(args[0], dict):
+            pending.setdefault(event, {}).update(args[0])
+        elif event in self.batched_events and len(args) == 3:
+            name, x, y = args
+            x_values, y_values = pending.setdefault((event, name), ([], []))
+            x_values.append(x)
+            y_values.append(y)
+        elif event in self.trailing_events and not args:
+            pending[event] = args
+        else:
+            return False
+        return True
+
+    def flush(self):
+        """Deliver all pending events."""
+        with self.__lock:
+            pending, self.__pending = self.__pending, {}
+            self.__depth = 0
+            self.__flushed = self.clock()
+            if not pending:
+                return
+            self.metrics.flushes += 1
+            trailing = []
+            for key, value in pending.items():
+                if key in self.trailing_events:
+                    trailing.append((key, value))
+                elif key in self.merged_events:
+                    self.__deliver(key, value)
+                elif isinstance(key, tuple):
+                    event, name = key
+                    self.__deliver(f"{event}s", name, *value)
+                else:
+                    self.__deliver(key, *value)
+            for event, args in trailing:
+                self.__deliver(event, *args)
+
+    def __deliver(self, event, *args):
+        self.metrics.delivered += 1
+        self.deliver(event, *args)
+
+    def __run(self):
+        while not self.__stop_event.wait(self.interval):
+            self.flush()
+
+    def start(self):
+        """Start background thread flushing pending events every interval."""
+        if self.interval and self.__thread is None:
+            self.__stop_event.clear()
+            self.__thread = threading.Thread(target=self.__run, daemon=True)
+            self.__thread.start()
+
+    def close(self):
+        """Stop background thread and deliver all pending events."""
+        thread, self.__thread = self.__thread, None
+        if thread is not None:
+            self.__stop_event.set()
+            thread.join()
+        self.flush()
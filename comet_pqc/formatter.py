@@ -1,5 +1,9 @@
 import csv
+import io
 import os
+import re
+
+import numpy as np
 
 __all__ = [
     'FormatterError',
@@ -16,6 +20,35 @@ class Formatter:
 
     pass
 
+def printf_format(format_spec):
+    """Return printf style format for a numeric format spec or None if spec
+    can not be mapped.
+
+    >>> printf_format('+.3E')
+    '%+.3E'
+    """
+    match = re.match(r'^([+\- ]?)(\d*)(\.\d+)?([eEfFgG])$', format_spec)
+    if match:
+        return '%' + ''.join(group or '' for group in match.groups())
+    return None
+
+def format_column(values, format_spec):
+    """Return list of formatted strings for a column of values, numeric
+    columns are formatted vectorized using NumPy.
+
+    >>> format_column([1.0, 2.0], 'E')
+    ['1.000000E+00', '2.000000E+00']
+    """
+    fmt = printf_format(format_spec)
+    if fmt is not None:
+        try:
+            array = np.asarray(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            pass
+        else:
+            return np.char.mod(fmt, array).tolist()
+    return [format(value, format_spec) for value in values]
+
 class CSVFormatter(Formatter):
     """CSV formatter.
 
@@ -25,10 +58,15 @@ class CSVFormatter(Formatter):
     >>>     fmt.add_column('value', '+E')
     >>>     fmt.write_header()
     >>>     fmt.write_row(dict(key='spam', value=42.0))
+    >>>     fmt.write_columns(dict(key=['eggs', 'ham'], value=[4.2, 2.4]))
     """
 
+    chunk_size = 4096
+    """Number of rows written at once by bulk writes."""
+
     def __init__(self, f, linesep=None, **kwargs):
         self.__writer = csv.DictWriter(f, [], lineterminator='', **kwargs)
+        self.__writer_kwargs = kwargs
         self.__format_specs = {}
         self.__f = f
         self.__has_rows = False
@@ -71,6 +109,76 @@ class CSVFormatter(Formatter):
         self.__f.write(self.linesep)
         self.__has_rows = True
 
+    def write_rows(self, rows):
+        """Write multiple CSV rows, applying column formats."""
+        rows = list(rows)
+        columns = {}
+        if rows:
+            for key in rows[0].keys():
+                columns[key] = [row[key] for row in rows]
+        self.write_columns(columns)
+
+    def write_columns(self, columns):
+        """Write rows from a dictionary of equally sized column sequences,
+        applying column formats to whole columns at once.
+
+        Rows are written in buffered chunks of `chunk_size`.
+        """
+        wrong_fields = columns.keys() - self.columns
+        if wrong_fields:
+            raise ValueError(f"dict contains fields not in fieldnames: {', '.join(map(repr, wrong_fields))}")
+        sizes = {len(values) for values in columns.values()}
+        if len(sizes) > 1:
+            raise ValueError("inconsistent column sizes")
+        size = sizes.pop() if sizes else 0
+        if size:
+            array = self.__numeric_array(columns)
+            if array is not None:
+                self.__write_numeric(array)
+            else:
+                self.__write_formatted(columns, size)
+        self.__has_rows = True
+
+    def __numeric_array(self, columns):
+        """Return 2D float array of columns if all columns are numeric with
+        printf compatible format specs, else None.
+        """
+        if columns.keys() != set(self.columns):
+            return None
+        arrays = []
+        for key in self.columns:
+            if printf_format(self.format_spec(key)) is None:
+                return None
+            try:
+                arrays.append(np.asarray(columns[key], dtype=np.float64))
+            except (TypeError, ValueError):
+                return None
+        return np.column_stack(arrays)
+
+    def __write_numeric(self, array):
+        # Numeric values never require CSV quoting
+        delimiter = self.__writer.writer.dialect.delimiter
+        line_format = delimiter.join(printf_format(self.format_spec(key)) for key in self.columns) + self.linesep
+        for offset in range(0, len(array), self.chunk_size):
+            chunk = array[offset:offset + self.chunk_size]
+            self.__f.write((line_format * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+    def __write_formatted(self, columns, size):
+        formatted = []
+        for key in self.columns:
+            if key in columns:
+                formatted.append(format_column(columns[key], self.format_spec(key)))
+            else:
+                formatted.append([''] * size)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator=self.linesep, **self.__writer_kwargs)
+        for offset in range(0, size, self.chunk_size):
+            chunk = [values[offset:offset + self.chunk_size] for values in formatted]
+            writer.writerows(zip(*chunk))
+            self.__f.write(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+
     def flush(self):
         """Flush write buffer."""
         self.__f.flush()
@@ -143,3 +251,10 @@ class PQCFormatter(CSVFormatter):
         """Write CSV row, applying column formats."""
         super().write_row(row)
         self.__has_rows = True
+
+    def write_columns(self, columns):
+        """Write rows from a dictionary of column sequences, applying column
+        formats.
+        """
+        super().write_columns(columns)
+        self.__has_rows = True
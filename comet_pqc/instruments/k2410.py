@@ -1,3 +1,5 @@
+import time
+
 from .smu import SMUInstrument
 from comet.driver.keithley import K2410
 
@@ -204,3 +206,53 @@ class K2410Instrument(SMUInstrument):
         self.context.resource.write(":SENS:FUNC:ON 'VOLT'")
         self.context.resource.query("*OPC?")
         return self.context.read()[0]
+
+    # Buffered sweep
+
+    def sweep_voltage(self, voltages, delay):
+        voltages = list(voltages)
+        if not 0 < len(voltages) <= self.SWEEP_SIZE_MAXIMUM:
+            raise ValueError(f"invalid sweep size: {len(voltages)}")
+        resource = self.context.resource
+        # Settings modified by the sweep, restored afterwards
+        elements = resource.query(":FORM:ELEM?").strip()
+        delay_auto = int(resource.query(":SOUR:DEL:AUTO?"))
+        source_delay = float(resource.query(":SOUR:DEL?"))
+        resource.write(":SENS:FUNC:CONC ON")
+        resource.write(":SENS:FUNC:ON 'CURR'")
+        resource.write(":FORM:ELEM VOLT,CURR")
+        resource.write(f":SOUR:DEL {delay:E}")
+        resource.write(f":SOUR:LIST:VOLT {','.join(format(voltage, 'E') for voltage in voltages)}")
+        # Abort sweep on compliance
+        resource.write(":SOUR:SWE:CAB EARL")
+        resource.write(f":TRIG:COUN {len(voltages):d}")
+        resource.write(":SOUR:VOLT:MODE LIST")
+        resource.query("*OPC?")
+        # Fixed level applied when leaving list mode, start of sweep on failure
+        level = voltages[0]
+        try:
+            resource.write("*CLS")
+            resource.write(":INIT")
+            resource.write("*OPC")
+            threshold = time.time() + self.sweep_timeout(len(voltages), delay)
+            while not int(resource.query("*ESR?")) & 0x1:
+                if time.time() > threshold:
+                    resource.write(":ABOR")
+                    raise RuntimeError(f"buffered sweep timeout, exceeded {self.sweep_timeout(len(voltages), delay):G} s")
+                time.sleep(self.SWEEP_POLL_INTERVAL)
+            values = [float(value) for value in resource.query(":FETC?").split(',')]
+            readings = values[1::2]
+            if readings:
+                # Programmed level of last sourced point
+                level = voltages[len(readings) - 1]
+            return readings
+        finally:
+            resource.write(f":SOUR:VOLT:LEV {level:E}")
+            resource.write(":SOUR:VOLT:MODE FIX")
+            resource.write(":TRIG:COUN 1")
+            resource.write(f":FORM:ELEM {elements}")
+            if delay_auto:
+                resource.write(":SOUR:DEL:AUTO ON")
+            else:
+                resource.write(f":SOUR:DEL {source_delay:E}")
+            resource.query("*OPC?")
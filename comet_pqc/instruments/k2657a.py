@@ -1,3 +1,5 @@
+import time
+
 from .smu import SMUInstrument
 from comet.driver.keithley import K2657A
 
@@ -190,3 +192,54 @@ class K2657AInstrument(SMUInstrument):
 
     def read_voltage(self):
         return self.context.measure.v()
+
+    # Buffered sweep
+
+    def sweep_voltage(self, voltages, delay):
+        voltages = list(voltages)
+        if not 0 < len(voltages) <= self.SWEEP_SIZE_MAXIMUM:
+            raise ValueError(f"invalid sweep size: {len(voltages)}")
+        resource = self.context.resource
+        # Source delay modified by the sweep, restored afterwards
+        source_delay = float(resource.query("print(smua.source.delay)"))
+        resource.write(f"smua.trigger.source.listv({{{', '.join(format(voltage, 'E') for voltage in voltages)}}})")
+        resource.write("smua.trigger.source.action = smua.ENABLE")
+        resource.write("smua.trigger.measure.i(smua.nvbuffer1)")
+        resource.write("smua.trigger.measure.action = smua.ENABLE")
+        resource.write("smua.trigger.endpulse.action = smua.SOURCE_HOLD")
+        resource.write("smua.trigger.endsweep.action = smua.SOURCE_HOLD")
+        resource.write(f"smua.source.delay = {delay:E}")
+        resource.write("smua.trigger.arm.count = 1")
+        resource.write(f"smua.trigger.count = {len(voltages):d}")
+        resource.write("smua.nvbuffer1.clear()")
+        resource.query("*OPC?")
+        # Source level after sweep, start of sweep on failure
+        level = voltages[0]
+        try:
+            resource.write("smua.trigger.initiate()")
+            threshold = time.time() + self.sweep_timeout(len(voltages), delay)
+            while True:
+                count = int(float(resource.query("print(smua.nvbuffer1.n)")))
+                if count >= len(voltages):
+                    break
+                # Abort sweep on compliance
+                if resource.query("print(smua.source.compliance)") == "true":
+                    resource.write("smua.abort()")
+                    count = int(float(resource.query("print(smua.nvbuffer1.n)")))
+                    break
+                if time.time() > threshold:
+                    resource.write("smua.abort()")
+                    raise RuntimeError(f"buffered sweep timeout, exceeded {self.sweep_timeout(len(voltages), delay):G} s")
+                time.sleep(self.SWEEP_POLL_INTERVAL)
+            readings = []
+            if count:
+                result = resource.query(f"printbuffer(1, {count:d}, smua.nvbuffer1.readings)")
+                readings = [float(value) for value in result.split(',')]
+                level = voltages[len(readings) - 1]
+            return readings
+        finally:
+            resource.write("smua.trigger.source.action = smua.DISABLE")
+            resource.write("smua.trigger.measure.action = smua.DISABLE")
+            resource.write(f"smua.source.delay = {source_delay:E}")
+            resource.write(f"smua.source.levelv = {level:E}")
+            resource.query("*OPC?")
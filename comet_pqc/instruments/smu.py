@@ -1,3 +1,5 @@
+import time
+
 from abc import abstractmethod
 
 from .instrument import Instrument
@@ -227,3 +229,30 @@ class SMUInstrument(Instrument):
     @abstractmethod
     def read_voltage(self):
         pass
+
+    # Buffered sweep
+
+    SWEEP_SIZE_MAXIMUM = 100
+    SWEEP_POLL_INTERVAL = 0.050
+
+    def sweep_voltage(self, voltages, delay):
+        """Source list of voltages applying source delay and return list of
+        current readings. The sweep stops early if compliance tripped, so less
+        readings than voltages can be returned.
+
+        This default implementation sources and reads every single point,
+        instruments providing an internal sweep/trigger model overwrite this
+        method to run the sweep on the instrument.
+        """
+        readings = []
+        for voltage in voltages:
+            self.set_source_voltage(voltage)
+            time.sleep(delay)
+            readings.append(self.read_current())
+            if self.compliance_tripped():
+                break
+        return readings
+
+    def sweep_timeout(self, count, delay):
+        """Return timeout in seconds for a buffered sweep."""
+        return count * (delay + 1.0) + 10.0
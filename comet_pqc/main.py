@@ -1,22 +1,10 @@
 import argparse
 import logging
+import multiprocessing
 import sys
 
-from PyQt5 import QtWidgets
-
-import comet
-from comet import ui
-
 from . import __version__
-
-from .processes import EnvironmentProcess
-from .processes import StatusProcess
-from .processes import AlternateTableProcess
-from .processes import MeasureProcess
-
-from .dashboard import Dashboard
-from .preferences import TableTab
-from .preferences import OptionsTab
+from .startup import ImportProfiler
 
 CONTENTS_URL = 'https://hephy-dd.github.io/comet-pqc/'
 GITHUB_URL = 'https://github.com/hephy-dd/comet-pqc/'
@@ -24,17 +12,43 @@ GITHUB_URL = 'https://github.com/hephy-dd/comet-pqc/'
 def parse_args():
     parser = argparse.ArgumentParser()
     parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument("--profile-startup", action="store_true", help="log import times of application startup")
     return parser.parse_args()
 
 def main():
 
+    # Analysis worker processes must not relaunch the frozen application
+    multiprocessing.freeze_support()
+
     args = parse_args()
 
+    profiler = ImportProfiler()
+    if args.profile_startup:
+        profiler.start()
+
     # Logging
 
     logging.getLogger().setLevel(logging.INFO)
     logging.info("PQC version %s", __version__)
 
+    # Imports are deferred to be covered by startup profiling
+
+    from qutie.qutie import QtCore
+
+    import comet
+    from comet import ui
+
+    from .processes import EnvironmentProcess
+    from .processes import StatusProcess
+    from .processes import AlternateTableProcess
+    from .processes import MeasureProcess
+
+    from .dashboard import Dashboard
+    from .preferences import TableTab
+    from .preferences import OptionsTab
+
+    profiler.mark("imports")
+
     app = comet.Application("comet-pqc")
     app.version = __version__
     app.title = f"PQC {__version__}"
@@ -130,6 +144,8 @@ def main():
         progress_changed=on_progress
     )
 
+    profiler.mark("dashboard")
+
     # Layout
 
     app.layout = dashboard
@@ -178,6 +194,15 @@ def main():
     dialog_size = app.settings.get('preferences_dialog_size', (640, 480))
     app.window.preferences_dialog.resize(*dialog_size)
 
+    def on_startup_finished():
+        profiler.mark("window")
+        profiler.stop()
+        logging.info("startup profile:\n%s", profiler.report())
+
+    if profiler.active:
+        # Called once the event loop is running and the window is shown
+        QtCore.QTimer.singleShot(0, on_startup_finished)
+
     result = app.run()
 
     dashboard.store_settings()
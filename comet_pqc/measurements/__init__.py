@@ -1,12 +1,38 @@
-from .iv_ramp import *
-from .iv_ramp_elm import *
-from .iv_ramp_bias import *
-from .iv_ramp_bias_elm import *
-from .iv_ramp_4_wire import *
-from .cv_ramp import *
-from .cv_ramp_vsrc import *
-from .cv_ramp_alt import *
-from .frequency_scan import *
+"""Measurements, modules are imported on first use."""
+
+import importlib
+
+__all__ = [
+    'MEASUREMENT_TYPES',
+    'measurement_class',
+    'measurement_factory'
+]
+
+MEASUREMENT_TYPES = {
+    'iv_ramp': ('.iv_ramp', 'IVRampMeasurement'),
+    'iv_ramp_elm': ('.iv_ramp_elm', 'IVRampElmMeasurement'),
+    'iv_ramp_bias': ('.iv_ramp_bias', 'IVRampBiasMeasurement'),
+    'iv_ramp_bias_elm': ('.iv_ramp_bias_elm', 'IVRampBiasElmMeasurement'),
+    'iv_ramp_4_wire': ('.iv_ramp_4_wire', 'IVRamp4WireMeasurement'),
+    'cv_ramp': ('.cv_ramp', 'CVRampMeasurement'),
+    'cv_ramp_vsrc': ('.cv_ramp_vsrc', 'CVRampHVMeasurement'),
+    'cv_ramp_alt': ('.cv_ramp_alt', 'CVRampAltMeasurement'),
+    'frequency_scan': ('.frequency_scan', 'FrequencyScanMeasurement')
+}
+"""Static registry of measurement type names to module and class name."""
+
+def measurement_class(key):
+    """Return measurement class by type name, importing its module on first
+    use. Raises `KeyError` for unknown types.
+
+    >>> measurement_class("iv_ramp")
+    <class 'comet_pqc.measurements.iv_ramp.IVRampMeasurement'>
+    """
+    if key not in MEASUREMENT_TYPES:
+        raise KeyError(f"no such measurement type: {key}")
+    module_name, class_name = MEASUREMENT_TYPES.get(key)
+    module = importlib.import_module(module_name, __name__)
+    return getattr(module, class_name)
 
 def measurement_factory(key, *args, **kwargs):
     """Factory function to create a new measurement instance by type name.
@@ -14,8 +40,11 @@ def measurement_factory(key, *args, **kwargs):
     >>> meas = measurement_factory("iv_ramp")
     >>> meas.run()
     """
-    for cls in globals().values():
-        if hasattr(cls, "type"):
-            if cls.type == key:
-                return cls(*args, **kwargs)
-    raise KeyError(f"no such measurement type: {key}")
+    return measurement_class(key)(*args, **kwargs)
+
+def __getattr__(name):
+    # Provide measurement classes as package attributes on demand
+    for key, (module_name, class_name) in MEASUREMENT_TYPES.items():
+        if class_name == name:
+            return measurement_class(key)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,8 +2,6 @@ import contextlib
 import logging
 import time
 
-import numpy as np
-
 import comet
 # from comet.driver.keysight import E4980A
 from ..driver import E4980A
@@ -14,7 +12,6 @@ from ..benchmark import Benchmark
 
 from .matrix import MatrixMeasurement
 from .measurement import format_estimate
-from .measurement import QUICK_RAMP_DELAY
 
 from .mixins import HVSourceMixin
 from .mixins import LCRMixin
@@ -53,14 +50,14 @@ class CVRampMeasurement(MatrixMeasurement, HVSourceMixin, LCRMixin, EnvironmentM
         ))
         if hvsrc_output_state:
             hvsrc_voltage_level = self.hvsrc_get_voltage_level(hvsrc)
-            ramp = comet.Range(hvsrc_voltage_level, 0, bias_voltage_step)
+            ramp = self.hvsrc_ramp(hvsrc, hvsrc_voltage_level, 0, bias_voltage_step)
             for step, voltage in enumerate(ramp):
                 self.process.emit("progress", step + 1, ramp.count)
                 self.hvsrc_set_voltage_level(hvsrc, voltage)
                 self.process.emit("state", dict(
                     hvsrc_voltage=voltage
                 ))
-                time.sleep(QUICK_RAMP_DELAY)
+                ramp.wait()
         hvsrc_output_state = self.hvsrc_get_output_state(hvsrc)
         self.process.emit("state", dict(
             hvsrc_output=hvsrc_output_state
@@ -149,10 +146,11 @@ class CVRampMeasurement(MatrixMeasurement, HVSourceMixin, LCRMixin, EnvironmentM
         hvsrc_voltage_level = self.hvsrc_get_voltage_level(hvsrc)
 
         logging.info("HV Source ramp to start voltage: from %E V to %E V with step %E V", hvsrc_voltage_level, bias_voltage_start, bias_voltage_step)
-        for voltage in comet.Range(hvsrc_voltage_level, bias_voltage_start, bias_voltage_step):
+        ramp = self.hvsrc_ramp(hvsrc, hvsrc_voltage_level, bias_voltage_start, bias_voltage_step)
+        for voltage in ramp:
             self.process.emit("message", "Ramp to start... {}".format(format_metric(voltage, "V")))
             self.hvsrc_set_voltage_level(hvsrc, voltage)
-            time.sleep(QUICK_RAMP_DELAY)
+            ramp.wait()
             self.process.emit("state", dict(
                 hvsrc_voltage=voltage,
             ))
@@ -256,21 +254,12 @@ class CVRampMeasurement(MatrixMeasurement, HVSourceMixin, LCRMixin, EnvironmentM
     def analyze(self, **kwargs):
         self.process.emit("progress", 0, 1)
 
-        v = np.array(self.get_series('voltage_hvsrc'))
-        c = np.array(self.get_series('capacitance'))
+        v = self.get_series('voltage_hvsrc')
+        c = self.get_series('capacitance')
 
         if len(v) > 1 and len(c) > 1:
 
-            for f in self.analysis_functions():
-                r = f(v=v, c=c)
-                logging.info(r)
-                key, values = type(r).__name__, r._asdict()
-                self.set_analysis(key, values)
-                self.process.emit("append_analysis", key, values)
-                if 'x_fit' in r._asdict():
-                    for x, y in [(x, r.a * x + r.b) for x in r.x_fit]:
-                        self.process.emit("reading", "xfit", x, y)
-                    self.process.emit("update")
+            self.analyze_series(v=v, c=c)
 
         self.process.emit("progress", 1, 1)
 
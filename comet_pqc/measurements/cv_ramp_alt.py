@@ -2,14 +2,13 @@ import contextlib
 import logging
 import time
 
-import numpy as np
-
 import comet
 # from comet.driver.keysight import E4980A
 from ..driver import E4980A
 
 from ..utils import format_metric
 from ..estimate import Estimate
+from ..ramp import Ramp
 from ..benchmark import Benchmark
 
 from .matrix import MatrixMeasurement
@@ -50,14 +49,14 @@ class CVRampAltMeasurement(MatrixMeasurement, LCRMixin, EnvironmentMixin, Analys
         ))
         if lcr_output:
             lcr_voltage_level = self.lcr_get_bias_voltage_level(lcr)
-            ramp = comet.Range(lcr_voltage_level, 0, bias_voltage_step)
+            ramp = Ramp(lcr_voltage_level, 0, bias_voltage_step, QUICK_RAMP_DELAY)
             for step, voltage in enumerate(ramp):
                 self.process.emit("progress", step + 1, ramp.count)
                 self.lcr_set_bias_voltage_level(lcr, voltage)
                 self.process.emit("state", dict(
                     lcr_voltage=voltage
                 ))
-                time.sleep(QUICK_RAMP_DELAY)
+                ramp.wait()
         self.process.emit("state", dict(
             lcr_output=self.lcr_get_bias_state(lcr)
         ))
@@ -134,11 +133,12 @@ class CVRampAltMeasurement(MatrixMeasurement, LCRMixin, EnvironmentMixin, Analys
         lcr_voltage_level = self.lcr_get_bias_voltage_level(lcr)
 
         logging.info("LCR Meter ramp to start voltage: from %E V to %E V with step %E V", lcr_voltage_level, bias_voltage_start, bias_voltage_step)
-        for voltage in comet.Range(lcr_voltage_level, bias_voltage_start, bias_voltage_step):
+        ramp = Ramp(lcr_voltage_level, bias_voltage_start, bias_voltage_step, QUICK_RAMP_DELAY)
+        for voltage in ramp:
             self.process.emit("message", "Ramp to start... {}".format(format_metric(voltage, "V")))
             self.process.emit("progress", 0, 1)
             self.lcr_set_bias_voltage_level(lcr, voltage)
-            time.sleep(QUICK_RAMP_DELAY)
+            ramp.wait()
             self.process.emit("state", dict(
                 lcr_voltage=voltage,
             ))
@@ -238,21 +238,12 @@ class CVRampAltMeasurement(MatrixMeasurement, LCRMixin, EnvironmentMixin, Analys
     def analyze(self, **kwargs):
         self.process.emit("progress", 0, 1)
 
-        v = np.array(self.get_series('voltage_lcr'))
-        c = np.array(self.get_series('capacitance'))
+        v = self.get_series('voltage_lcr')
+        c = self.get_series('capacitance')
 
         if len(v) > 1 and len(c) > 1:
 
-            for f in self.analysis_functions():
-                r = f(v=v, c=c)
-                logging.info(r)
-                key, values = type(r).__name__, r._asdict()
-                self.set_analysis(key, values)
-                self.process.emit("append_analysis", key, values)
-                if 'x_fit' in r._asdict():
-                    for x, y in [(x, r.a * x + r.b) for x in r.x_fit]:
-                        self.process.emit("reading", "xfit", x, y)
-                    self.process.emit("update")
+            self.analyze_series(v=v, c=c)
 
         self.process.emit("progress", 1, 1)
 
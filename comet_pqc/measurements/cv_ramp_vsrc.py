@@ -2,8 +2,6 @@ import contextlib
 import logging
 import time
 
-import numpy as np
-
 import comet
 # from comet.driver.keysight import E4980A
 from comet.driver.keithley import K2657A
@@ -15,7 +13,6 @@ from ..benchmark import Benchmark
 
 from .matrix import MatrixMeasurement
 from .measurement import format_estimate
-from .measurement import QUICK_RAMP_DELAY
 
 from .mixins import VSourceMixin
 from .mixins import LCRMixin
@@ -54,14 +51,14 @@ class CVRampHVMeasurement(MatrixMeasurement, VSourceMixin, LCRMixin, Environment
         ))
         if vsrc_output_state:
             vsrc_voltage_level = self.vsrc_get_voltage_level(vsrc)
-            ramp = comet.Range(vsrc_voltage_level, 0, bias_voltage_step)
+            ramp = self.vsrc_ramp(vsrc, vsrc_voltage_level, 0, bias_voltage_step)
             for step, voltage in enumerate(ramp):
                 self.process.emit("progress", step + 1, ramp.count)
                 self.vsrc_set_voltage_level(vsrc, voltage)
                 self.process.emit("state", dict(
                     vsrc_voltage=voltage
                 ))
-                time.sleep(QUICK_RAMP_DELAY)
+                ramp.wait()
         self.process.emit("state", dict(
             vsrc_output=self.vsrc_get_output_state(vsrc)
         ))
@@ -151,10 +148,11 @@ class CVRampHVMeasurement(MatrixMeasurement, VSourceMixin, LCRMixin, Environment
         vsrc_voltage_level = self.vsrc_get_voltage_level(vsrc)
 
         logging.info("V Source ramp to start voltage: from %E V to %E V with step %E V", vsrc_voltage_level, bias_voltage_start, bias_voltage_step)
-        for voltage in comet.Range(vsrc_voltage_level, bias_voltage_start, bias_voltage_step):
+        ramp = self.vsrc_ramp(vsrc, vsrc_voltage_level, bias_voltage_start, bias_voltage_step)
+        for voltage in ramp:
             self.process.emit("message", "Ramp to start... {}".format(format_metric(voltage, "V")))
             self.vsrc_set_voltage_level(vsrc, voltage)
-            time.sleep(QUICK_RAMP_DELAY)
+            ramp.wait()
             self.process.emit("state", dict(
                 vsrc_voltage=voltage,
             ))
@@ -260,21 +258,12 @@ class CVRampHVMeasurement(MatrixMeasurement, VSourceMixin, LCRMixin, Environment
     def analyze(self, **kwargs):
         self.process.emit("progress", 0, 1)
 
-        v = np.array(self.get_series('voltage_vsrc'))
-        c = np.array(self.get_series('capacitance'))
+        v = self.get_series('voltage_vsrc')
+        c = self.get_series('capacitance')
 
         if len(v) > 1 and len(c) > 1:
 
-            for f in self.analysis_functions():
-                r = f(v=v, c=c)
-                logging.info(r)
-                key, values = type(r).__name__, r._asdict()
-                self.set_analysis(key, values)
-                self.process.emit("append_analysis", key, values)
-                if 'x_fit' in r._asdict():
-                    for x, y in [(x, r.a * x + r.b) for x in r.x_fit]:
-                        self.process.emit("reading", "xfit", x, y)
-                    self.process.emit("update")
+            self.analyze_series(v=v, c=c)
 
         self.process.emit("progress", 1, 1)
 
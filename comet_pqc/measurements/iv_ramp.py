@@ -2,16 +2,14 @@ import contextlib
 import logging
 import time
 
-import numpy as np
-
 import comet
 
 from ..utils import format_metric
 from ..estimate import Estimate
 
 from .matrix import MatrixMeasurement
+from .measurement import ComplianceError
 from .measurement import format_estimate
-from .measurement import QUICK_RAMP_DELAY
 
 from .mixins import HVSourceMixin
 from .mixins import EnvironmentMixin
@@ -40,6 +38,8 @@ class IVRampMeasurement(MatrixMeasurement, HVSourceMixin, EnvironmentMixin, Anal
         self.register_parameter('voltage_step', unit='V', required=True)
         self.register_parameter('waiting_time', unit='s', required=True)
         self.register_parameter('hvsrc_current_compliance', unit='A', required=True)
+        self.register_parameter('hvsrc_buffered_sweep_enable', False, type=bool)
+        self.register_parameter('hvsrc_buffered_sweep_size', 25, type=int)
         self.register_hvsource()
         self.register_environment()
         self.register_analysis()
@@ -53,6 +53,8 @@ class IVRampMeasurement(MatrixMeasurement, HVSourceMixin, EnvironmentMixin, Anal
         voltage_step = self.get_parameter('voltage_step')
         waiting_time = self.get_parameter('waiting_time')
         hvsrc_current_compliance = self.get_parameter('hvsrc_current_compliance')
+        hvsrc_buffered_sweep_enable = self.get_parameter('hvsrc_buffered_sweep_enable')
+        hvsrc_buffered_sweep_size = self.get_parameter('hvsrc_buffered_sweep_size')
 
         # Extend meta data
         self.set_meta("voltage_start", f"{voltage_start:G} V")
@@ -60,6 +62,8 @@ class IVRampMeasurement(MatrixMeasurement, HVSourceMixin, EnvironmentMixin, Anal
         self.set_meta("voltage_step", f"{voltage_step:G} V")
         self.set_meta("waiting_time", f"{waiting_time:G} s")
         self.set_meta("hvsrc_current_compliance", f"{hvsrc_current_compliance:G} A")
+        self.set_meta("hvsrc_buffered_sweep_enable", hvsrc_buffered_sweep_enable)
+        self.set_meta("hvsrc_buffered_sweep_size", hvsrc_buffered_sweep_size)
         self.hvsrc_update_meta()
         self.environment_update_meta()
 
@@ -98,10 +102,11 @@ class IVRampMeasurement(MatrixMeasurement, HVSourceMixin, EnvironmentMixin, Anal
             voltage = self.hvsrc_get_voltage_level(hvsrc)
 
             logging.info("HV Source ramp to zero: from %E V to %E V with step %E V", voltage, 0, voltage_step)
-            for voltage in comet.Range(voltage, 0, voltage_step):
+            ramp = self.hvsrc_ramp(hvsrc, voltage, 0, voltage_step)
+            for voltage in ramp:
                 self.process.emit("message", f"{voltage:.3f} V")
                 self.hvsrc_set_voltage_level(hvsrc, voltage)
-                time.sleep(QUICK_RAMP_DELAY)
+                ramp.wait()
                 if not self.process.running:
                     break
         # If output disabled
@@ -123,10 +128,11 @@ class IVRampMeasurement(MatrixMeasurement, HVSourceMixin, EnvironmentMixin, Anal
             voltage = self.hvsrc_get_voltage_level(hvsrc)
 
             logging.info("HV Source ramp to start voltage: from %E V to %E V with step %E V", voltage, voltage_start, voltage_step)
-            for voltage in comet.Range(voltage, voltage_start, voltage_step):
+            ramp = self.hvsrc_ramp(hvsrc, voltage, voltage_start, voltage_step)
+            for voltage in ramp:
                 self.process.emit("message", "Ramp to start... {}".format(format_metric(voltage, "V")))
                 self.hvsrc_set_voltage_level(hvsrc, voltage)
-                time.sleep(QUICK_RAMP_DELAY)
+                ramp.wait()
 
                 # Compliance tripped?
                 self.hvsrc_check_compliance(hvsrc)
@@ -159,6 +165,11 @@ class IVRampMeasurement(MatrixMeasurement, HVSourceMixin, EnvironmentMixin, Anal
         est = Estimate(ramp.count)
         self.process.emit("progress", *est.progress)
 
+        if self.get_parameter('hvsrc_buffered_sweep_enable'):
+            self.measure_buffered(hvsrc, ramp, est, t0)
+            self.process.emit("progress", 0, 0)
+            return
+
         logging.info("HV Source ramp to end voltage: from %E V to %E V with step %E V", voltage, ramp.end, ramp.step)
         for voltage in ramp:
             self.hvsrc_set_voltage_level(hvsrc, voltage)
@@ -204,26 +215,83 @@ class IVRampMeasurement(MatrixMeasurement, HVSourceMixin, EnvironmentMixin, Anal
 
         self.process.emit("progress", 0, 0)
 
+    def measure_buffered(self, hvsrc, ramp, est, t0):
+        """Measure ramp using the instrument's buffered list sweep.
+
+        The ramp is split into chunks, every chunk is sourced and measured by
+        the instrument and fetched at once. Stop requests and compliance are
+        checked between chunks. Timestamps are interpolated within a chunk.
+        """
+        waiting_time = self.get_parameter('waiting_time')
+        chunk_size = min(max(1, self.get_parameter('hvsrc_buffered_sweep_size')), hvsrc.SWEEP_SIZE_MAXIMUM)
+
+        voltages = list(ramp)
+        if not voltages:
+            logging.info("HV Source buffered sweep: no voltages remaining")
+            return
+
+        logging.info("HV Source buffered sweep to end voltage: from %E V to %E V with step %E V", voltages[0], ramp.end, ramp.step)
+        for offset in range(0, len(voltages), chunk_size):
+            chunk = voltages[offset:offset + chunk_size]
+
+            t_begin = time.time() - t0
+            readings = self.hvsrc_sweep_voltage(hvsrc, chunk, waiting_time)
+            t_end = time.time() - t0
+            aborted = len(readings) < len(chunk)
+
+            self.environment_update()
+
+            self.process.emit("state", dict(
+                env_chuck_temperature=self.environment_temperature_chuck,
+                env_box_temperature=self.environment_temperature_box,
+                env_box_humidity=self.environment_humidity_box
+            ))
+
+            for index, (voltage, reading_current) in enumerate(zip(chunk, readings)):
+                td = t_begin + (t_end - t_begin) * (index + 1) / len(chunk)
+                self.process.emit("reading", "hvsrc", abs(voltage) if ramp.step < 0 else voltage, reading_current)
+
+                # Append series data
+                self.append_series(
+                    timestamp=td,
+                    voltage=voltage,
+                    current_hvsrc=reading_current,
+                    temperature_box=self.environment_temperature_box,
+                    temperature_chuck=self.environment_temperature_chuck,
+                    humidity_box=self.environment_humidity_box
+                )
+                est.advance()
+
+            if readings:
+                self.process.emit("update")
+                self.process.emit("state", dict(
+                    hvsrc_voltage=voltage,
+                    hvsrc_current=reading_current
+                ))
+                self.process.emit("message", "{} | HV Source {}".format(format_estimate(est), format_metric(voltage, "V")))
+                self.process.emit("progress", *est.progress)
+
+            # Sweep stops early only on compliance
+            if aborted:
+                raise ComplianceError(f"HV Source in compliance! Buffered sweep stopped after {len(readings)} of {len(chunk)} points.")
+
+            # Compliance tripped?
+            self.hvsrc_check_compliance(hvsrc)
+
+            if not self.process.running:
+                break
+
     def analyze(self, **kwargs):
         self.process.emit("progress", 1, 2)
 
         status = None
 
-        i = np.array(self.get_series('current_hvsrc'))
-        v = np.array(self.get_series('voltage'))
+        i = self.get_series('current_hvsrc')
+        v = self.get_series('voltage')
 
         if len(i) > 1 and len(v) > 1:
 
-            for f in self.analysis_functions():
-                r = f(v=v, i=i)
-                logging.info(r)
-                key, values = type(r).__name__, r._asdict()
-                self.set_analysis(key, values)
-                self.process.emit("append_analysis", key, values)
-                if 'x_fit' in r._asdict():
-                    for x, y in [(x, r.a * x + r.b) for x in r.x_fit]:
-                        self.process.emit("reading", "xfit", x, y)
-                    self.process.emit("update")
+            self.analyze_series(v=v, i=i)
 
     def finalize(self, hvsrc):
         voltage_step = self.get_parameter('voltage_step')
@@ -237,13 +305,14 @@ class IVRampMeasurement(MatrixMeasurement, HVSourceMixin, EnvironmentMixin, Anal
         ))
 
         logging.info("HV Source ramp to zero: from %E V to %E V with step %E V", voltage, 0, voltage_step)
-        for voltage in comet.Range(voltage, 0, voltage_step):
+        ramp = self.hvsrc_ramp(hvsrc, voltage, 0, voltage_step)
+        for voltage in ramp:
             self.process.emit("message", "Ramp to zero... {}".format(format_metric(voltage, "V")))
             self.hvsrc_set_voltage_level(hvsrc, voltage)
             self.process.emit("state", dict(
                 hvsrc_voltage=voltage
             ))
-            time.sleep(QUICK_RAMP_DELAY)
+            ramp.wait()
 
         self.hvsrc_set_output_state(hvsrc, hvsrc.OUTPUT_OFF)
 
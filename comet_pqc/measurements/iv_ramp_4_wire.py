@@ -5,10 +5,9 @@ import time
 import comet
 from comet.driver.keithley import K2657A
 
-import numpy as np
-
 from ..utils import format_metric
 from ..estimate import Estimate
+from ..ramp import Ramp
 
 from .matrix import MatrixMeasurement
 from .measurement import format_estimate
@@ -122,10 +121,11 @@ class IVRamp4WireMeasurement(MatrixMeasurement, VSourceMixin, EnvironmentMixin,
             current = self.vsrc_get_current_level(vsrc)
 
             logging.info("V Source ramp to start current: from %E A to %E A with step %E A", current, current_start, current_step)
-            for current in comet.Range(current, current_start, current_step):
+            ramp = Ramp(current, current_start, current_step, QUICK_RAMP_DELAY)
+            for current in ramp:
                 self.process.emit("message", "Ramp to start... {}".format(format_metric(current, "A")))
                 self.vsrc_set_current_level(vsrc, current)
-                time.sleep(QUICK_RAMP_DELAY)
+                ramp.wait()
 
                 self.process.emit("state", dict(
                     vsrc_current=current,
@@ -210,21 +210,12 @@ class IVRamp4WireMeasurement(MatrixMeasurement, VSourceMixin, EnvironmentMixin,
 
         status = None
 
-        i = np.array(self.get_series('current'))
-        v = np.array(self.get_series('voltage_vsrc'))
+        i = self.get_series('current')
+        v = self.get_series('voltage_vsrc')
 
         if len(i) > 1 and len(v) > 1:
 
-            for f in self.analysis_functions():
-                r = f(v=v, i=i)
-                logging.info(r)
-                key, values = type(r).__name__, r._asdict()
-                self.set_analysis(key, values)
-                self.process.emit("append_analysis", key, values)
-                if 'x_fit' in r._asdict():
-                    for x, y in [(x, r.a * x + r.b) for x in r.x_fit]:
-                        self.process.emit("reading", "xfit", x, y)
-                    self.process.emit("update")
+            self.analyze_series(v=v, i=i)
 
         self.process.emit("progress", 2, 2)
 
@@ -239,13 +230,14 @@ class IVRamp4WireMeasurement(MatrixMeasurement, VSourceMixin, EnvironmentMixin,
         current = self.vsrc_get_current_level(vsrc)
 
         logging.info("V Source ramp to zero: from %E A to %E A with step %E A", current, 0, current_step)
-        for current in comet.Range(current, 0, current_step):
+        ramp = Ramp(current, 0, current_step, QUICK_RAMP_DELAY)
+        for current in ramp:
             self.process.emit("message", "Ramp to zero... {}".format(format_metric(current, "A")))
             self.vsrc_set_current_level(vsrc, current)
             self.process.emit("state", dict(
                 vsrc_current=current,
             ))
-            time.sleep(QUICK_RAMP_DELAY)
+            ramp.wait()
 
         self.vsrc_set_output_state(vsrc, vsrc.OUTPUT_OFF)
         self.vsrc_check_error(vsrc)
@@ -2,8 +2,6 @@ import contextlib
 import logging
 import time
 
-import numpy as np
-
 import comet
 
 from comet.driver.keithley import K2657A
@@ -13,7 +11,6 @@ from ..estimate import Estimate
 
 from .matrix import MatrixMeasurement
 from .measurement import format_estimate
-from .measurement import QUICK_RAMP_DELAY
 
 from .mixins import HVSourceMixin
 from .mixins import VSourceMixin
@@ -132,13 +129,14 @@ class IVRampBiasMeasurement(MatrixMeasurement, HVSourceMixin, VSourceMixin, Envi
         voltage = self.vsrc_get_voltage_level(vsrc)
 
         logging.info("V Source ramp to bias voltage: from %E V to %E V with step %E V", voltage, bias_voltage, 1.0)
-        for voltage in comet.Range(voltage, bias_voltage, 1.0):
+        ramp = self.vsrc_ramp(vsrc, voltage, bias_voltage, 1.0)
+        for voltage in ramp:
             self.process.emit("message", "Ramp to bias... {}".format(format_metric(voltage, "V")))
             self.vsrc_set_voltage_level(vsrc, voltage)
             self.process.emit("state", dict(
                 vsrc_voltage=voltage,
             ))
-            time.sleep(QUICK_RAMP_DELAY)
+            ramp.wait()
 
             # Compliance tripped?
             self.vsrc_check_compliance(vsrc)
@@ -150,13 +148,14 @@ class IVRampBiasMeasurement(MatrixMeasurement, HVSourceMixin, VSourceMixin, Envi
         voltage = self.hvsrc_get_voltage_level(hvsrc)
 
         logging.info("HV Source ramp to start voltage: from %E V to %E V with step %E V", voltage, voltage_start, 1.0)
-        for voltage in comet.Range(voltage, voltage_start, 1.0):
+        ramp = self.hvsrc_ramp(hvsrc, voltage, voltage_start, 1.0)
+        for voltage in ramp:
             self.process.emit("message", "Ramp to start... {}".format(format_metric(voltage, "V")))
             self.hvsrc_set_voltage_level(hvsrc, voltage)
             self.process.emit("state", dict(
                 hvsrc_voltage=voltage,
             ))
-            time.sleep(QUICK_RAMP_DELAY)
+            ramp.wait()
 
             # Compliance tripped?
             self.hvsrc_check_compliance(hvsrc)
@@ -256,21 +255,12 @@ class IVRampBiasMeasurement(MatrixMeasurement, HVSourceMixin, VSourceMixin, Envi
 
         status = None
 
-        i = np.array(self.get_series('current_vsrc'))
-        v = np.array(self.get_series('voltage'))
+        i = self.get_series('current_vsrc')
+        v = self.get_series('voltage')
 
         if len(i) > 1 and len(v) > 1:
 
-            for f in self.analysis_functions():
-                r = f(v=v, i=i)
-                logging.info(r)
-                key, values = type(r).__name__, r._asdict()
-                self.set_analysis(key, values)
-                self.process.emit("append_analysis", key, values)
-                if 'x_fit' in r._asdict():
-                    for x, y in [(x, r.a * x + r.b) for x in r.x_fit]:
-                        self.process.emit("reading", "xfit", x, y)
-                    self.process.emit("update")
+            self.analyze_series(v=v, i=i)
 
     def finalize(self, hvsrc, vsrc):
         self.process.emit("progress", 1, 2)
@@ -281,24 +271,26 @@ class IVRampBiasMeasurement(MatrixMeasurement, HVSourceMixin, VSourceMixin, Envi
         voltage = self.hvsrc_get_voltage_level(hvsrc)
 
         logging.info("HV Source ramp to zero: from %E V to %E V with step %E V", voltage, 0, 1.0)
-        for voltage in comet.Range(voltage, 0, 1.0):
+        ramp = self.hvsrc_ramp(hvsrc, voltage, 0, 1.0)
+        for voltage in ramp:
             self.process.emit("message", "Ramp to zero... {}".format(format_metric(voltage, "V")))
             self.hvsrc_set_voltage_level(hvsrc, voltage)
             self.process.emit("state", dict(
                 hvsrc_voltage=voltage,
             ))
-            time.sleep(QUICK_RAMP_DELAY)
+            ramp.wait()
 
         bias_voltage = self.vsrc_get_voltage_level(vsrc)
 
         logging.info("V Source ramp bias to zero: from %E V to %E V with step %E V", bias_voltage, 0, 1.0)
-        for voltage in comet.Range(bias_voltage, 0, 1.0):
+        ramp = self.vsrc_ramp(vsrc, bias_voltage, 0, 1.0)
+        for voltage in ramp:
             self.process.emit("message", "Ramp bias to zero... {}".format(format_metric(voltage, "V")))
             self.vsrc_set_voltage_level(vsrc, voltage)
             self.process.emit("state", dict(
                 vsrc_voltage=voltage,
             ))
-            time.sleep(QUICK_RAMP_DELAY)
+            ramp.wait()
 
         self.hvsrc_set_output_state(hvsrc, hvsrc.OUTPUT_OFF)
         self.vsrc_set_output_state(vsrc, vsrc.OUTPUT_OFF)
@@ -2,8 +2,6 @@ import contextlib
 import logging
 import time
 
-import numpy as np
-
 import comet
 from comet.driver.keithley import K6517B
 
@@ -13,7 +11,6 @@ from ..benchmark import Benchmark
 
 from .matrix import MatrixMeasurement
 from .measurement import format_estimate
-from .measurement import QUICK_RAMP_DELAY
 
 from .mixins import HVSourceMixin
 from .mixins import ElectrometerMixin
@@ -145,14 +142,15 @@ class IVRampElmMeasurement(MatrixMeasurement, HVSourceMixin, ElectrometerMixin,
             voltage = self.hvsrc_get_voltage_level(hvsrc)
 
             logging.info("HV Source ramp to start voltage: from %E V to %E V with step %E V", voltage, voltage_start, voltage_step)
-            for voltage in comet.Range(voltage, voltage_start, voltage_step):
+            ramp = self.hvsrc_ramp(hvsrc, voltage, voltage_start, voltage_step)
+            for voltage in ramp:
                 self.process.emit("message", f"{voltage:.3f} V")
                 self.hvsrc_set_voltage_level(hvsrc, voltage)
                 self.process.emit("state", dict(
                     hvsrc_voltage=voltage,
                 ))
 
-                time.sleep(QUICK_RAMP_DELAY)
+                ramp.wait()
 
                 # Compliance tripped?
                 self.hvsrc_check_compliance(hvsrc)
@@ -160,24 +158,25 @@ class IVRampElmMeasurement(MatrixMeasurement, HVSourceMixin, ElectrometerMixin,
                 if not self.process.running:
                     break
 
-        self.elm_safe_write(elm, "*RST")
+        self.elm_reset(elm)
         self.elm_safe_write(elm, "*CLS")
 
-        # Filter
-        self.elm_safe_write(elm, f":SENS:CURR:AVER:COUN {elm_filter_count:d}")
+        with self.elm_transaction(elm):
+            # Filter
+            self.elm_safe_write(elm, f":SENS:CURR:AVER:COUN {elm_filter_count:d}")
 
-        if elm_filter_type == "repeat":
-            self.elm_safe_write(elm, ":SENS:CURR:AVER:TCON REP")
-        elif elm_filter_type == "repeat":
-            self.elm_safe_write(elm, ":SENS:CURR:AVER:TCON MOV")
+            if elm_filter_type == "repeat":
+                self.elm_safe_write(elm, ":SENS:CURR:AVER:TCON REP")
+            elif elm_filter_type == "repeat":
+                self.elm_safe_write(elm, ":SENS:CURR:AVER:TCON MOV")
 
-        if elm_filter_enable:
-            self.elm_safe_write(elm, ":SENS:CURR:AVER:STATE ON")
-        else:
-            self.elm_safe_write(elm, ":SENS:CURR:AVER:STATE OFF")
+            if elm_filter_enable:
+                self.elm_safe_write(elm, ":SENS:CURR:AVER:STATE ON")
+            else:
+                self.elm_safe_write(elm, ":SENS:CURR:AVER:STATE OFF")
 
-        nplc = elm_integration_rate / 10.
-        self.elm_safe_write(elm, f":SENS:CURR:NPLC {nplc:02f}")
+            nplc = elm_integration_rate / 10.
+            self.elm_safe_write(elm, f":SENS:CURR:NPLC {nplc:02f}")
 
         self.elm_set_zero_check(elm, True)
         assert self.elm_get_zero_check(elm) == True, "failed to enable zero check"
@@ -185,13 +184,14 @@ class IVRampElmMeasurement(MatrixMeasurement, HVSourceMixin, ElectrometerMixin,
         self.elm_safe_write(elm, ":SENS:FUNC 'CURR'") # note the quotes!
         assert elm.resource.query(":SENS:FUNC?") == '"CURR:DC"', "failed to set sense function to current"
 
-        self.elm_safe_write(elm, f":SENS:CURR:RANG {elm_current_range:E}")
-        if elm_zero_correction:
-            self.elm_safe_write(elm, ":SYST:ZCOR ON") # perform zero correction
-        # Auto range
-        self.elm_safe_write(elm, f":SENS:CURR:RANG:AUTO {elm_current_autorange_enable:d}")
-        self.elm_safe_write(elm, f":SENS:CURR:RANG:AUTO:LLIM {elm_current_autorange_minimum:E}")
-        self.elm_safe_write(elm, f":SENS:CURR:RANG:AUTO:ULIM {elm_current_autorange_maximum:E}")
+        with self.elm_transaction(elm):
+            self.elm_safe_write(elm, f":SENS:CURR:RANG {elm_current_range:E}")
+            if elm_zero_correction:
+                self.elm_safe_write(elm, ":SYST:ZCOR ON") # perform zero correction
+            # Auto range
+            self.elm_safe_write(elm, f":SENS:CURR:RANG:AUTO {elm_current_autorange_enable:d}")
+            self.elm_safe_write(elm, f":SENS:CURR:RANG:AUTO:LLIM {elm_current_autorange_minimum:E}")
+            self.elm_safe_write(elm, f":SENS:CURR:RANG:AUTO:ULIM {elm_current_autorange_maximum:E}")
 
         self.elm_set_zero_check(elm, False)
         assert self.elm_get_zero_check(elm) == False, "failed to disable zero check"
@@ -292,6 +292,7 @@ class IVRampElmMeasurement(MatrixMeasurement, HVSourceMixin, ElectrometerMixin,
         logging.info(benchmark_elm)
         logging.info(benchmark_hvsrc)
         logging.info(benchmark_environ)
+        self.elm_log_read_latencies()
 
         self.process.emit("progress", 4, 5)
 
@@ -300,21 +301,12 @@ class IVRampElmMeasurement(MatrixMeasurement, HVSourceMixin, ElectrometerMixin,
 
         status = None
 
-        i = np.array(self.get_series('current_elm'))
-        v = np.array(self.get_series('voltage'))
+        i = self.get_series('current_elm')
+        v = self.get_series('voltage')
 
         if len(i) > 1 and len(v) > 1:
 
-            for f in self.analysis_functions():
-                r = f(v=v, i=i)
-                logging.info(r)
-                key, values = type(r).__name__, r._asdict()
-                self.set_analysis(key, values)
-                self.process.emit("append_analysis", key, values)
-                if 'x_fit' in r._asdict():
-                    for x, y in [(x, r.a * x + r.b) for x in r.x_fit]:
-                        self.process.emit("reading", "xfit", x, y)
-                    self.process.emit("update")
+            self.analyze_series(v=v, i=i)
 
     def finalize(self, hvsrc, elm):
         self.process.emit("progress", 0, 2)
@@ -334,13 +326,14 @@ class IVRampElmMeasurement(MatrixMeasurement, HVSourceMixin, ElectrometerMixin,
             voltage = self.hvsrc_get_voltage_level(hvsrc)
 
             logging.info("HV Source ramp to zero: from %E V to %E V with step %E V", voltage, 0, voltage_step)
-            for voltage in comet.Range(voltage, 0, voltage_step):
+            ramp = self.hvsrc_ramp(hvsrc, voltage, 0, voltage_step)
+            for voltage in ramp:
                 self.process.emit("message", "Ramp to zero... {}".format(format_metric(voltage, "V")))
                 self.hvsrc_set_voltage_level(hvsrc, voltage)
                 self.process.emit("state", dict(
                     hvsrc_voltage=voltage,
                 ))
-                time.sleep(QUICK_RAMP_DELAY)
+                ramp.wait()
 
             self.hvsrc_set_output_state(hvsrc, hvsrc.OUTPUT_OFF)
 
@@ -16,26 +16,37 @@ class MatrixMeasurement(Measurement):
         self.register_parameter('matrix_channels', [], type=list)
 
     def before_initialize(self, **kwargs):
-        """Setup matrix switch."""
+        """Setup matrix switch.
+
+        If process setting `pipeline_setup` is enabled, channels are switched
+        and verified concurrently to the instrument setup in `initialize`.
+        """
         super().before_initialize(**kwargs)
         matrix_enable = self.get_parameter('matrix_enable')
         if matrix_enable:
             matrix_channels = self.get_parameter('matrix_channels')
-            logging.info("Matrix close channels: %s", matrix_channels)
-            try:
-                with self.resources.get("matrix") as matrix_res:
-                    matrix = K707B(matrix_res)
+            if self.process.get("pipeline_setup"):
+                self.run_concurrent(self.matrix_close_channels, matrix_channels)
+            else:
+                self.matrix_close_channels(matrix_channels)
+
+    def matrix_close_channels(self, matrix_channels):
+        """Close and verify matrix channels."""
+        logging.info("Matrix close channels: %s", matrix_channels)
+        try:
+            with self.resources.get("matrix") as matrix_res:
+                matrix = K707B(matrix_res)
+                closed_channels = matrix.channel.getclose()
+                if closed_channels:
+                    raise RuntimeError("Some matrix channels are still closed, " \
+                        f"please verify the situation and open closed channels. Closed channels: {closed_channels}")
+                if matrix_channels:
+                    matrix.channel.close(matrix_channels)
                     closed_channels = matrix.channel.getclose()
-                    if closed_channels:
-                        raise RuntimeError("Some matrix channels are still closed, " \
-                            f"please verify the situation and open closed channels. Closed channels: {closed_channels}")
-                    if matrix_channels:
-                        matrix.channel.close(matrix_channels)
-                        closed_channels = matrix.channel.getclose()
-                        if sorted(closed_channels) != sorted(matrix_channels):
-                            raise RuntimeError("Matrix mismatch in closed channels")
-            except Exception as exc:
-                raise RuntimeError(f"Failed to close matrix channels {matrix_channels}, {exc.args}") from exc
+                    if sorted(closed_channels) != sorted(matrix_channels):
+                        raise RuntimeError("Matrix mismatch in closed channels")
+        except Exception as exc:
+            raise RuntimeError(f"Failed to close matrix channels {matrix_channels}, {exc.args}") from exc
 
     def after_finalize(self, **kwargs):
         """Reset marix switch to a save state."""
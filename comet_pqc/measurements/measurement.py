@@ -1,26 +1,22 @@
+import collections.abc
+import concurrent.futures
 import datetime
 import logging
 import time
-import json
-
-import numpy as np
 
 import comet
 from comet.resource import ResourceMixin
 from comet.process import ProcessMixin
 
 from .. import __version__
-from ..formatter import PQCFormatter
+from ..series import SeriesTable
 
-__all__ = ['Measurement']
+__all__ = ['Measurement', 'ResolvedParameters']
 
 QUICK_RAMP_DELAY = 0.100
 
-class NumpyEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, np.ndarray):
-            return obj.tolist()
-        return super().default(obj)
+setup_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="setup")
+"""Executor for setup stages running concurrently to instrument setup."""
 
 class ComplianceError(ValueError):
     """Compliance tripped error."""
@@ -60,6 +56,39 @@ class ParameterType:
         self.type = type
         self.required = required
 
+class ResolvedParameters(collections.abc.Mapping):
+    """Immutable snapshot of validated and unit converted measurement
+    parameters, values are accessible by key or attribute.
+
+    >>> parameters = ResolvedParameters({'voltage_step': 1.0})
+    >>> parameters.voltage_step
+    1.0
+    """
+
+    def __init__(self, values):
+        object.__setattr__(self, '_ResolvedParameters__values', dict(values))
+
+    def __getitem__(self, key):
+        return self.__values[key]
+
+    def __iter__(self):
+        return iter(self.__values)
+
+    def __len__(self):
+        return len(self.__values)
+
+    def __getattr__(self, key):
+        try:
+            return self.__values[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.__values!r})"
+
 class Measurement(ResourceMixin, ProcessMixin):
     """Base measurement class."""
 
@@ -82,8 +111,18 @@ class Measurement(ResourceMixin, ProcessMixin):
         self.operator = operator
         self.quality = "Check"
         self.registered_parameters = {}
+        self.__resolved_parameters = None
         self.__timestamp = timestamp or time.time()
         self.__data = {}
+        self.__writers = []
+        self.__interlocks = []
+
+    @property
+    def resources(self):
+        """Returns resources of measure process, sharing its persistent
+        connections.
+        """
+        return self.process.resources
 
     @property
     def timestamp(self):
@@ -111,6 +150,17 @@ class Measurement(ResourceMixin, ProcessMixin):
         """Measurement data property."""
         return self.__data
 
+    @property
+    def writers(self):
+        """List of attached streaming data writers."""
+        return self.__writers
+
+    def add_writer(self, writer):
+        """Attach streaming data writer, opened after initialize and fed with
+        every appended series row.
+        """
+        self.__writers.append(writer)
+
     def register_parameter(self, key, default=None, *, values=None, unit=None, type=None,
                            required=False):
         """Register measurement parameter."""
@@ -120,8 +170,33 @@ class Measurement(ResourceMixin, ProcessMixin):
             key, default, values, unit, type, required
         )
 
+    @property
+    def resolved_parameters(self):
+        """Parameter snapshot of the current run, `None` before
+        `before_initialize`.
+        """
+        return self.__resolved_parameters
+
+    def resolve_parameters(self):
+        """Return snapshot of all registered parameters, raises on missing or
+        invalid parameters.
+        """
+        return ResolvedParameters({
+            key: self.resolve_parameter(key)
+            for key in self.registered_parameters
+        })
+
     def get_parameter(self, key):
-        """Get measurement parameter."""
+        """Get measurement parameter, from the parameter snapshot once
+        resolved.
+        """
+        parameters = self.__resolved_parameters
+        if parameters is not None and key in parameters:
+            return parameters[key]
+        return self.resolve_parameter(key)
+
+    def resolve_parameter(self, key):
+        """Validate and convert measurement parameter."""
         if key not in self.registered_parameters:
             raise KeyError(f"no such parameter: {key}")
         parameter = self.registered_parameters[key]
@@ -147,58 +222,28 @@ class Measurement(ResourceMixin, ProcessMixin):
         self.data.get(self.KEY_SERIES_UNITS)[key] = value
 
     def register_series(self, key):
-        series = self.data.get(self.KEY_SERIES)
-        if key in series:
-            raise KeyError(f"Series already exists: {key}")
-        series[key] = []
+        self.data.get(self.KEY_SERIES).register(key)
 
     def get_series(self, key):
-        return self.data.get(self.KEY_SERIES).get(key, [])
+        """Return array view of series values (no copy)."""
+        return self.data.get(self.KEY_SERIES).values_of(key)
 
     def set_analysis(self, key, value):
         self.data.get(self.KEY_ANALYSIS)[key] = value
 
     def append_series(self, **kwargs):
-        series = self.data.get(self.KEY_SERIES)
-        if sorted(series.keys()) != sorted(kwargs.keys()):
-            raise KeyError("Inconsistent series keys")
-        for key, value in kwargs.items():
-            series.get(key).append(value)
-
-    def serialize_json(self, fp):
-        """Serialize data dictionary to JSON."""
-        json.dump(self.data, fp, indent=2, cls=NumpyEncoder)
-
-    def serialize_txt(self, fp):
-        """Serialize data dictionary to plain text."""
-        meta = self.data.get("meta", {})
-        series_units = self.data.get("series_units", {})
-        series = self.data.get("series", {})
-        fmt = PQCFormatter(fp)
-        # Write meta data
-        for key, value in meta.items():
-            fmt.write_meta(key, value)
-        # Create columns
-        columns = list(series.keys())
-        for key in columns:
-            fmt.add_column(key, "E", unit=series_units.get(key))
-        # Write header
-        fmt.write_header()
-        # Write series
-        if columns:
-            size = len(series.get(columns[0]))
-            for i in range(size):
-                row = {}
-                for key in columns:
-                    row[key] = series.get(key)[i]
-                fmt.write_row(row)
-        fmt.flush()
+        self.data.get(self.KEY_SERIES).append(**kwargs)
+        for writer in self.__writers:
+            writer.append(kwargs)
 
     def before_initialize(self, **kwargs):
+        # Fail on invalid parameters before any instrument is touched
+        self.__resolved_parameters = None
+        self.__resolved_parameters = self.resolve_parameters()
         self.data.clear()
         self.data[self.KEY_META] = {}
         self.data[self.KEY_SERIES_UNITS] = {}
-        self.data[self.KEY_SERIES] = {}
+        self.data[self.KEY_SERIES] = SeriesTable()
         self.data[self.KEY_ANALYSIS] = {}
         self.set_meta("sample_name", self.sample_name)
         self.set_meta("sample_type", self.sample_type)
@@ -231,6 +276,29 @@ class Measurement(ResourceMixin, ProcessMixin):
     def after_finalize(self, **kwargs):
         pass
 
+    def run_concurrent(self, function, *args, **kwargs):
+        """Run setup stage concurrently on a separate resource. The stage is
+        registered as interlock, sources must not be enabled before all
+        interlocks are passed.
+        """
+        future = setup_executor.submit(function, *args, **kwargs)
+        self.__interlocks.append(future)
+        return future
+
+    def wait_interlocks(self, ignore_errors=False):
+        """Wait for all concurrent setup stages to finish, raises exceptions
+        of failed stages unless `ignore_errors` is set.
+        """
+        while self.__interlocks:
+            future = self.__interlocks.pop(0)
+            try:
+                future.result()
+            except Exception as exc:
+                if not ignore_errors:
+                    self.__interlocks.clear()
+                    raise
+                logging.error("setup stage failed: %s", exc)
+
     def run(self, **kwargs):
         """Run measurement."""
         self.__run(**kwargs)
@@ -240,7 +308,10 @@ class Measurement(ResourceMixin, ProcessMixin):
         self.process.emit("message", "Initialize...")
         self.before_initialize(**kwargs)
         self.initialize(**kwargs)
+        self.wait_interlocks()
         self.after_initialize(**kwargs)
+        for writer in self.__writers:
+            writer.open(self.data)
         self.process.emit("message", "Initialize... done.")
 
     @annotate_step("Measure")
@@ -258,6 +329,7 @@ class Measurement(ResourceMixin, ProcessMixin):
     @annotate_step("Finalize")
     def __finalize(self, **kwargs):
         self.process.emit("message", "Finalize...")
+        self.wait_interlocks(ignore_errors=True)
         self.before_finalize(**kwargs)
         self.finalize(**kwargs)
         self.after_finalize(**kwargs) # is not executed on error
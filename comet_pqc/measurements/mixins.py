@@ -1,19 +1,26 @@
+import contextlib
+import functools
 import logging
 import time
 
-from functools import partial
-
 import comet
-import analysis_pqc
+import pyvisa
 
 from .measurement import ComplianceError
 from .measurement import InstrumentError
+from .measurement import QUICK_RAMP_DELAY
 from ..instruments.k2657a import K2657AInstrument
 
+from ..analysis import fit_points
+from ..analysis import parse_analysis_tasks
+from ..analysis import run_analysis
+from ..ramp import Ramp
 from ..settings import settings
+from ..shadowstate import ShadowState
 
 from ..utils import format_metric
 from ..utils import std_mean_filter
+from ..utils import std_mean_filter_index
 
 __all__ = [
     'HVSourceMixin',
@@ -24,9 +31,121 @@ __all__ = [
     'AnalysisMixin'
 ]
 
+ELM_UNCACHED_SETTINGS = ('SYST:ZCOR',)
+"""Electrometer settings always written as they trigger an action."""
+
+def shadowed(name, key, invalidates=()):
+    """Decorator skipping instrument setter calls if `value` was already
+    written to configuration `key` of instrument `name`.
+    """
+    def shadowed(method):
+        @functools.wraps(method)
+        def shadowed(self, device, value):
+            state = self.shadow_state(name)
+            state.write(key, value, lambda: method(self, device, value), invalidates)
+        return shadowed
+    return shadowed
+
+class WriteTransaction:
+    """Queued configuration writes sent as semicolon joined batches.
+
+    Operation complete and the error queue are checked once on commit.
+
+    >>> transaction = WriteTransaction(resource)
+    >>> transaction.append(":SENS:CURR:NPLC 5")
+    >>> transaction.commit()
+    []
+    """
+
+    max_length = 256
+    """Maximum length of a batch message."""
+
+    max_errors = 32
+    """Maximum number of errors read from the error queue."""
+
+    def __init__(self, resource):
+        self.resource = resource
+        self.messages = []
+
+    def append(self, message):
+        self.messages.append(message)
+
+    def batches(self):
+        """Return list of semicolon joined batch messages."""
+        batches = []
+        batch = []
+        for message in self.messages:
+            # Commands must start from root to be joined
+            if not message.startswith((':', '*')):
+                message = f":{message}"
+            if batch and len(';'.join(batch + [message])) > self.max_length:
+                batches.append(';'.join(batch))
+                batch = []
+            batch.append(message)
+        if batch:
+            batches.append(';'.join(batch))
+        return batches
+
+    def read_errors(self):
+        """Drain error queue, return list of error codes and messages."""
+        errors = []
+        for _ in range(self.max_errors):
+            code, message = self.resource.query(":SYST:ERR?").split(",", 1)
+            code = int(code)
+            if code == 0:
+                break
+            errors.append((code, message.strip("\"")))
+        return errors
+
+    def commit(self):
+        """Write all batches, wait for operation complete and return list of
+        errors.
+        """
+        for batch in self.batches():
+            self.resource.write(batch)
+        self.resource.query("*OPC?")
+        return self.read_errors()
+
 class Mixin:
     """Base class for measurement mixins."""
 
+    def shadow_state(self, name):
+        """Return shadow state of instrument `name`, shared across
+        measurements while the measure process keeps connections open.
+        """
+        resource_pool = getattr(self.process, 'resource_pool', None)
+        if resource_pool is not None:
+            return resource_pool.shadow_state(name)
+        shadow_states = self.__dict__.setdefault('_shadow_states', {})
+        return shadow_states.setdefault(name, ShadowState())
+
+    def unsupported_features(self):
+        """Return set of instrument features found unsupported, shared
+        across measurements while the measure process keeps connections open.
+        """
+        resource_pool = getattr(self.process, 'resource_pool', None)
+        if resource_pool is not None:
+            return resource_pool.unsupported_features
+        return self.__dict__.setdefault('_unsupported_features', set())
+
+    def shadow_reset(self, name, reset):
+        """Call `reset` and invalidate shadow state of instrument `name`.
+
+        If process setting `skip_identical_reset` is enabled and the
+        instrument was configured by a measurement of identical type, the
+        reset is skipped and only changed settings are written. Returns `True`
+        if `reset` was called.
+        """
+        state = self.shadow_state(name)
+        if self.process.get("skip_identical_reset", False):
+            if state.owner == self.type and len(state):
+                logging.info("%s: skip reset, configured by identical measurement type '%s'", name, self.type)
+                return False
+        state.invalidate()
+        reset()
+        state.owner = self.type
+        return True
+
 class HVSourceMixin(Mixin):
 
     def register_hvsource(self):
@@ -38,6 +157,10 @@ class HVSourceMixin(Mixin):
         self.register_parameter('hvsrc_filter_type', 'repeat', values=('repeat', 'moving'))
         self.register_parameter('hvsrc_source_voltage_autorange_enable', True, type=bool)
         self.register_parameter('hvsrc_source_voltage_range', comet.ureg('20 V'), unit='V')
+        self.register_parameter('hvsrc_ramp_step', comet.ureg('0 V'), unit='V')
+        self.register_parameter('hvsrc_ramp_slew_rate', comet.ureg('0 V/s'), unit='V/s')
+        self.register_parameter('hvsrc_ramp_current_slope', comet.ureg('0 A/s'), unit='A/s')
+        self.register_parameter('hvsrc_ramp_sweep_enable', False, type=bool)
 
     def hvsrc_update_meta(self):
         """Update meta data parameters."""
@@ -48,6 +171,10 @@ class HVSourceMixin(Mixin):
         hvsrc_filter_type = self.get_parameter('hvsrc_filter_type')
         hvsrc_source_voltage_autorange_enable = self.get_parameter('hvsrc_source_voltage_autorange_enable')
         hvsrc_source_voltage_range = self.get_parameter('hvsrc_source_voltage_range')
+        hvsrc_ramp_step = self.get_parameter('hvsrc_ramp_step')
+        hvsrc_ramp_slew_rate = self.get_parameter('hvsrc_ramp_slew_rate')
+        hvsrc_ramp_current_slope = self.get_parameter('hvsrc_ramp_current_slope')
+        hvsrc_ramp_sweep_enable = self.get_parameter('hvsrc_ramp_sweep_enable')
 
         self.set_meta("hvsrc_sense_mode", hvsrc_sense_mode)
         self.set_meta("hvsrc_route_terminal", hvsrc_route_terminal)
@@ -56,6 +183,10 @@ class HVSourceMixin(Mixin):
         self.set_meta("hvsrc_filter_type", hvsrc_filter_type)
         self.set_meta("hvsrc_source_voltage_autorange_enable", hvsrc_source_voltage_autorange_enable)
         self.set_meta("hvsrc_source_voltage_range", f"{hvsrc_source_voltage_range:G} V")
+        self.set_meta("hvsrc_ramp_step", f"{hvsrc_ramp_step:G} V")
+        self.set_meta("hvsrc_ramp_slew_rate", f"{hvsrc_ramp_slew_rate:G} V/s")
+        self.set_meta("hvsrc_ramp_current_slope", f"{hvsrc_ramp_current_slope:G} A/s")
+        self.set_meta("hvsrc_ramp_sweep_enable", hvsrc_ramp_sweep_enable)
 
     def hvsrc_create(self, resource):
         """Return HV source instrument instance."""
@@ -76,7 +207,7 @@ class HVSourceMixin(Mixin):
             raise ComplianceError("HV Source in compliance!")
 
     def hvsrc_reset(self, hvsrc):
-        hvsrc.reset()
+        self.shadow_reset("hvsrc", hvsrc.reset)
 
     def hvsrc_clear(self, hvsrc):
         hvsrc.clear()
@@ -103,10 +234,12 @@ class HVSourceMixin(Mixin):
             self.hvsrc_set_source_voltage_range(hvsrc, hvsrc_source_voltage_range)
 
     def hvsrc_set_function_voltage(self, hvsrc):
+        self.shadow_state("hvsrc").invalidate("source")
         hvsrc.set_source_function(hvsrc.SOURCE_FUNCTION_VOLTAGE)
         self.hvsrc_check_error(hvsrc)
 
     def hvsrc_set_function_current(self, hvsrc):
+        self.shadow_state("hvsrc").invalidate("source")
         hvsrc.set_source_function(hvsrc.SOURCE_FUNCTION_CURRENT)
         self.hvsrc_check_error(hvsrc)
 
@@ -114,27 +247,33 @@ class HVSourceMixin(Mixin):
         return hvsrc.get_source_voltage()
 
     def hvsrc_set_voltage_level(self, hvsrc, voltage):
+        # Do not source while setup stages (e.g. matrix switching) are running
+        self.wait_interlocks()
         logging.info("HV Source set voltage level: %s", format_metric(voltage, "V"))
         hvsrc.set_source_voltage(voltage)
         self.hvsrc_check_error(hvsrc)
 
+    @shadowed("hvsrc", "route.terminal")
     def hvsrc_set_route_terminal(self, hvsrc, route_terminals):
         logging.info("HV Source set route terminals: '%s'", route_terminals)
         value = {"front": "FRONT", "rear": "REAR"}[route_terminals]
         hvsrc.set_terminal(value)
         self.hvsrc_check_error(hvsrc)
 
+    @shadowed("hvsrc", "sense.mode")
     def hvsrc_set_sense_mode(self, hvsrc, sense_mode):
         logging.info("HV Source set sense mode: '%s'", sense_mode)
         value = {"remote": "REMOTE", "local": "LOCAL"}[sense_mode]
         hvsrc.set_sense_mode(value)
         self.hvsrc_check_error(hvsrc)
 
+    @shadowed("hvsrc", "compliance.current")
     def hvsrc_set_current_compliance(self, hvsrc, compliance):
         logging.info("HV Source set current compliance: %s", format_metric(compliance, "A"))
         hvsrc.set_compliance_current(compliance)
         self.hvsrc_check_error(hvsrc)
 
+    @shadowed("hvsrc", "compliance.voltage")
     def hvsrc_set_voltage_compliance(self, hvsrc, compliance):
         logging.info("HV Source set voltage compliance: %s", format_metric(compliance, "V"))
         hvsrc.set_compliance_voltage(compliance)
@@ -143,21 +282,25 @@ class HVSourceMixin(Mixin):
     def hvsrc_compliance_tripped(self, hvsrc):
         return hvsrc.compliance_tripped()
 
+    @shadowed("hvsrc", "source.current.range.auto")
     def hvsrc_set_auto_range(self, hvsrc, enabled):
         logging.info("HV Source set auto range (current): %s", enabled)
         hvsrc.set_source_current_autorange(enabled)
         self.hvsrc_check_error(hvsrc)
 
+    @shadowed("hvsrc", "filter.enable")
     def hvsrc_set_filter_enable(self, hvsrc, enabled):
         logging.info("HV Source set filter enable: %s", enabled)
         hvsrc.set_filter_enable(enabled)
         self.hvsrc_check_error(hvsrc)
 
+    @shadowed("hvsrc", "filter.count")
     def hvsrc_set_filter_count(self, hvsrc, count):
         logging.info("HV Source set filter count: %s", count)
         hvsrc.set_filter_count(count)
         self.hvsrc_check_error(hvsrc)
 
+    @shadowed("hvsrc", "filter.type")
     def hvsrc_set_filter_type(self, hvsrc, type):
         logging.info("HV Source set filter type: %s", type)
         value = {"repeat": "REPEAT", "moving": "MOVING"}[type]
@@ -169,15 +312,19 @@ class HVSourceMixin(Mixin):
         return {hvsrc.OUTPUT_ON: True, hvsrc.OUTPUT_OFF: False}[value]
 
     def hvsrc_set_output_state(self, hvsrc, enabled):
+        if enabled == hvsrc.OUTPUT_ON:
+            self.wait_interlocks()
         logging.info("HV Source set output state: %s", enabled)
         hvsrc.set_output(enabled)
         self.hvsrc_check_error(hvsrc)
 
+    @shadowed("hvsrc", "source.voltage.range.auto")
     def hvsrc_set_source_voltage_autorange_enable(self, hvsrc, enabled):
         logging.info("HV Source set source voltage autorange enable: %s", enabled)
         hvsrc.set_source_voltage_autorange(enabled)
         self.hvsrc_check_error(hvsrc)
 
+    @shadowed("hvsrc", "source.voltage.range")
     def hvsrc_set_source_voltage_range(self, hvsrc, voltage):
         logging.info("HV Source set source voltage range: %s", format_metric(voltage, "V"))
         hvsrc.set_source_voltage_range(voltage)
@@ -195,6 +342,47 @@ class HVSourceMixin(Mixin):
         logging.info("HV Source current reading: %s", format_metric(current, "A"))
         return current
 
+    def hvsrc_ramp(self, hvsrc, begin, end, step):
+        """Return slew rate limited voltage ramp, apply every value and call
+        `wait` of the ramp. Parameter `hvsrc_ramp_step` overrides `step`.
+        Buffered sweeps are only used when ramping away from zero.
+
+        >>> ramp = self.hvsrc_ramp(hvsrc, voltage, 0, voltage_step)
+        >>> for voltage in ramp:
+        ...     self.hvsrc_set_voltage_level(hvsrc, voltage)
+        ...     ramp.wait()
+        """
+        hvsrc_ramp_step = self.get_parameter('hvsrc_ramp_step')
+        hvsrc_ramp_slew_rate = self.get_parameter('hvsrc_ramp_slew_rate')
+        hvsrc_ramp_current_slope = self.get_parameter('hvsrc_ramp_current_slope')
+        hvsrc_ramp_sweep_enable = self.get_parameter('hvsrc_ramp_sweep_enable')
+        sweep = None
+        # Sweeps stop early on compliance, ramps toward zero (e.g. ramp down
+        # before disabling the output) must always be applied step by step
+        if hvsrc_ramp_sweep_enable and abs(end) > abs(begin):
+            def sweep(voltages, delay):
+                return self.hvsrc_sweep_voltage(hvsrc, voltages, delay)
+        ramp = Ramp(
+            begin, end, hvsrc_ramp_step or step, QUICK_RAMP_DELAY,
+            slew_rate=hvsrc_ramp_slew_rate,
+            current_slope=hvsrc_ramp_current_slope,
+            read_current=hvsrc.read_current,
+            sweep=sweep
+        )
+        logging.info("HV Source ramp: from %E V to %E V with step %E V every %.3f s, estimated %.1f s", begin, end, ramp.step, ramp.period, ramp.estimate())
+        return ramp
+
+    def hvsrc_sweep_voltage(self, hvsrc, voltages, delay):
+        """Run buffered voltage sweep, returns list of current readings."""
+        self.wait_interlocks()
+        logging.info("HV Source buffered sweep: %d points from %E V to %E V with delay %E s", len(voltages), voltages[0], voltages[-1], delay)
+        # Sweep modifies source configuration
+        self.shadow_state("hvsrc").invalidate()
+        readings = hvsrc.sweep_voltage(voltages, delay)
+        self.hvsrc_check_error(hvsrc)
+        logging.info("HV Source buffered sweep: %d current readings", len(readings))
+        return readings
+
 class VSourceMixin(Mixin):
 
     def register_vsource(self):
@@ -206,6 +394,9 @@ class VSourceMixin(Mixin):
         self.register_parameter('vsrc_filter_type', 'repeat', values=('repeat', 'moving'))
         self.register_parameter('vsrc_source_voltage_autorange_enable', True, type=bool)
         self.register_parameter('vsrc_source_voltage_range', comet.ureg('20 V'), unit='V')
+        self.register_parameter('vsrc_ramp_step', comet.ureg('0 V'), unit='V')
+        self.register_parameter('vsrc_ramp_slew_rate', comet.ureg('0 V/s'), unit='V/s')
+        self.register_parameter('vsrc_ramp_current_slope', comet.ureg('0 A/s'), unit='A/s')
 
     def vsrc_update_meta(self):
         """Update meta data parameters."""
@@ -216,6 +407,9 @@ class VSourceMixin(Mixin):
         vsrc_filter_type = self.get_parameter('vsrc_filter_type')
         vsrc_source_voltage_autorange_enable = self.get_parameter('vsrc_source_voltage_autorange_enable')
         vsrc_source_voltage_range = self.get_parameter('vsrc_source_voltage_range')
+        vsrc_ramp_step = self.get_parameter('vsrc_ramp_step')
+        vsrc_ramp_slew_rate = self.get_parameter('vsrc_ramp_slew_rate')
+        vsrc_ramp_current_slope = self.get_parameter('vsrc_ramp_current_slope')
 
         self.set_meta("vsrc_sense_mode", vsrc_sense_mode)
         self.set_meta("vsrc_route_terminal", vsrc_route_terminal)
@@ -224,6 +418,9 @@ class VSourceMixin(Mixin):
         self.set_meta("vsrc_filter_type", vsrc_filter_type)
         self.set_meta("vsrc_source_voltage_autorange_enable", vsrc_source_voltage_autorange_enable)
         self.set_meta("vsrc_source_voltage_range", f"{vsrc_source_voltage_range:G} V")
+        self.set_meta("vsrc_ramp_step", f"{vsrc_ramp_step:G} V")
+        self.set_meta("vsrc_ramp_slew_rate", f"{vsrc_ramp_slew_rate:G} V/s")
+        self.set_meta("vsrc_ramp_current_slope", f"{vsrc_ramp_current_slope:G} A/s")
 
     def vsrc_create(self, resource):
         """Return V source instrument instance."""
@@ -243,16 +440,18 @@ class VSourceMixin(Mixin):
             raise ComplianceError("V Source in compliance!")
 
     def vsrc_reset(self, vsrc):
-        vsrc.reset()
+        self.shadow_reset("vsrc", vsrc.reset)
 
     def vsrc_clear(self, vsrc):
         vsrc.clear()
 
     def vsrc_set_function_voltage(self, vsrc):
+        self.shadow_state("vsrc").invalidate("source")
         vsrc.set_source_function(vsrc.SOURCE_FUNCTION_VOLTAGE)
         self.vsrc_check_error(vsrc)
 
     def vsrc_set_function_current(self, vsrc):
+        self.shadow_state("vsrc").invalidate("source")
         vsrc.set_source_function(vsrc.SOURCE_FUNCTION_CURRENT)
         self.vsrc_check_error(vsrc)
 
@@ -276,6 +475,21 @@ class VSourceMixin(Mixin):
             # This will overwrite autorange
             self.vsrc_set_source_voltage_range(vsrc, vsrc_source_voltage_range)
 
+    def vsrc_ramp(self, vsrc, begin, end, step):
+        """Return slew rate limited voltage ramp, see `hvsrc_ramp`."""
+        vsrc_ramp_step = self.get_parameter('vsrc_ramp_step')
+        vsrc_ramp_slew_rate = self.get_parameter('vsrc_ramp_slew_rate')
+        vsrc_ramp_current_slope = self.get_parameter('vsrc_ramp_current_slope')
+        ramp = Ramp(
+            begin, end, vsrc_ramp_step or step, QUICK_RAMP_DELAY,
+            slew_rate=vsrc_ramp_slew_rate,
+            current_slope=vsrc_ramp_current_slope,
+            read_current=vsrc.read_current
+        )
+        logging.info("V Source ramp: from %E V to %E V with step %E V every %.3f s, estimated %.1f s", begin, end, ramp.step, ramp.period, ramp.estimate())
+        return ramp
+
+    @shadowed("vsrc", "route.terminal")
     def vsrc_set_route_terminal(self, vsrc, route_terminals):
         logging.info("V Source set route terminals: '%s'", route_terminals)
         value = {"front": "FRONT", "rear": "REAR"}[route_terminals]
@@ -286,6 +500,8 @@ class VSourceMixin(Mixin):
         return vsrc.get_source_voltage()
 
     def vsrc_set_voltage_level(self, vsrc, voltage):
+        # Do not source while setup stages (e.g. matrix switching) are running
+        self.wait_interlocks()
         logging.info("V Source set voltage level: %s", format_metric(voltage, "V"))
         vsrc.set_source_voltage(voltage)
         self.vsrc_check_error(vsrc)
@@ -298,17 +514,20 @@ class VSourceMixin(Mixin):
         vsrc.set_source_current(current)
         self.vsrc_check_error(vsrc)
 
+    @shadowed("vsrc", "sense.mode")
     def vsrc_set_sense_mode(self, vsrc, sense_mode):
         logging.info("V Source set sense mode: '%s'", sense_mode)
         value = {"remote": vsrc.SENSE_MODE_REMOTE, "local": vsrc.SENSE_MODE_LOCAL}[sense_mode]
         vsrc.set_sense_mode(value)
         self.vsrc_check_error(vsrc)
 
+    @shadowed("vsrc", "compliance.current")
     def vsrc_set_current_compliance(self, vsrc, compliance):
         logging.info("V Source set current compliance: %s", format_metric(compliance, "A"))
         vsrc.set_compliance_current(compliance)
         self.vsrc_check_error(vsrc)
 
+    @shadowed("vsrc", "compliance.voltage")
     def vsrc_set_voltage_compliance(self, vsrc, compliance):
         logging.info("V Source set voltage compliance: %s", format_metric(compliance, "V"))
         vsrc.set_compliance_voltage(compliance)
@@ -317,16 +536,19 @@ class VSourceMixin(Mixin):
     def vsrc_compliance_tripped(self, vsrc):
         return vsrc.compliance_tripped()
 
+    @shadowed("vsrc", "filter.enable")
     def vsrc_set_filter_enable(self, vsrc, enabled):
         logging.info("V Source set filter enable: %s", enabled)
         vsrc.set_filter_enable(enabled)
         self.vsrc_check_error(vsrc)
 
+    @shadowed("vsrc", "filter.count")
     def vsrc_set_filter_count(self, vsrc, count):
         logging.info("V Source set filter count: %s", count)
         vsrc.set_filter_count(count)
         self.vsrc_check_error(vsrc)
 
+    @shadowed("vsrc", "filter.type")
     def vsrc_set_filter_type(self, vsrc, type):
         logging.info("V Source set filter type: %s", type)
         value = {"repeat": vsrc.FILTER_TYPE_REPEAT, "moving": vsrc.FILTER_TYPE_MOVING}[type]
@@ -338,6 +560,8 @@ class VSourceMixin(Mixin):
         return {vsrc.OUTPUT_ON: True, vsrc.OUTPUT_OFF: False}[value]
 
     def vsrc_set_output_state(self, vsrc, enabled):
+        if enabled == vsrc.OUTPUT_ON:
+            self.wait_interlocks()
         logging.info("V Source set output state: %s", enabled)
         vsrc.set_output(enabled)
         self.vsrc_check_error(vsrc)
@@ -349,11 +573,13 @@ class VSourceMixin(Mixin):
             vsrc.context.resource.write(f"display.smua.measure.func = display.MEASURE_{value}")
             self.vsrc_check_error(vsrc)
 
+    @shadowed("vsrc", "source.voltage.range.auto")
     def vsrc_set_source_voltage_autorange_enable(self, vsrc, enabled):
         logging.info("V Source set source voltage autorange enable: %s", enabled)
         vsrc.set_source_voltage_autorange(enabled)
         self.vsrc_check_error(vsrc)
 
+    @shadowed("vsrc", "source.voltage.range")
     def vsrc_set_source_voltage_range(self, vsrc, voltage):
         logging.info("V Source set source voltage range: %s", format_metric(voltage, "V"))
         vsrc.set_source_voltage_range(voltage)
@@ -371,11 +597,20 @@ class VSourceMixin(Mixin):
 
 class ElectrometerMixin(Mixin):
 
+    elm_line_frequency = 50.0
+    """Power line frequency in Hz used to estimate reading times."""
+
+    elm_read_overhead = 0.010
+    """Estimated fixed overhead in seconds of a single reading."""
+
     def register_elm(self):
         self.register_parameter('elm_read_timeout', comet.ureg('60 s'), unit='s')
+        self.register_parameter('elm_read_srq_enable', False, type=bool)
 
     def elm_update_meta(self):
         """Update meta data parameters."""
+        elm_read_srq_enable = self.get_parameter('elm_read_srq_enable')
+        self.set_meta("elm_read_srq_enable", elm_read_srq_enable)
 
     def elm_check_error(self, elm):
         try:
@@ -392,8 +627,54 @@ class ElectrometerMixin(Mixin):
             logging.error(f"Error {code}: {label}")
             raise RuntimeError(f"Error {code}: {label}")
 
+    @contextlib.contextmanager
+    def elm_transaction(self, elm):
+        """Context queuing calls to `elm_safe_write`, queued messages are
+        written as a batch on exit with a single operation complete and error
+        check. On error messages are replayed one by one to identify the
+        failing command.
+
+        >>> with self.elm_transaction(elm):
+        ...     self.elm_safe_write(elm, ":SENS:CURR:NPLC 5")
+        """
+        transaction = WriteTransaction(elm.resource)
+        self._elm_transaction = transaction
+        try:
+            yield transaction
+        finally:
+            self._elm_transaction = None
+        try:
+            errors = transaction.commit()
+        except Exception as exc:
+            self.shadow_state("elm").invalidate()
+            raise RuntimeError(f"Failed to write to ELM: {transaction.messages}, {exc}") from exc
+        if errors:
+            logging.warning("ELM transaction failed, replay messages: %s", errors)
+            self.shadow_state("elm").invalidate()
+            for message in transaction.messages:
+                self.elm_safe_write(elm, message)
+            code, label = errors[0]
+            logging.error(f"Error {code}: {label}")
+            raise RuntimeError(f"Error {code}: {label}")
+
+    def elm_reset(self, elm):
+        def reset():
+            self.elm_safe_write(elm, "*RST")
+        self.shadow_reset("elm", reset)
+
     def elm_safe_write(self, elm, message):
-        """Write, wait for operation complete, test for errors."""
+        """Write, wait for operation complete, test for errors. Settings
+        already written are skipped.
+        """
+        def write():
+            self.elm_write_message(elm, message)
+        self.shadow_state("elm").write_message(message, write, ELM_UNCACHED_SETTINGS)
+
+    def elm_write_message(self, elm, message):
+        transaction = getattr(self, '_elm_transaction', None)
+        if transaction is not None:
+            transaction.append(message)
+            return
         try:
             elm.resource.write(message)
         except Exception as exc:
@@ -404,27 +685,105 @@ class ElectrometerMixin(Mixin):
             raise RuntimeError(f"Failed to read operation complete from ELM for message: '{message}', {exc}") from exc
         self.elm_check_error(elm)
 
+    def elm_read_estimate(self):
+        """Return estimated time in seconds for a single electrometer reading
+        derived from integration rate and filter count parameters.
+        """
+        count = 1
+        nplc = 1.0
+        if 'elm_integration_rate' in self.registered_parameters:
+            nplc = self.get_parameter('elm_integration_rate') / 10.
+        if 'elm_filter_enable' in self.registered_parameters:
+            if self.get_parameter('elm_filter_enable'):
+                count = max(1, self.get_parameter('elm_filter_count'))
+        return nplc / self.elm_line_frequency * count + self.elm_read_overhead
+
+    @property
+    def elm_read_latencies(self):
+        """List of `(expected, actual)` reading times in seconds."""
+        if not hasattr(self, '_elm_read_latencies'):
+            self._elm_read_latencies = []
+        return self._elm_read_latencies
+
+    def elm_log_read_latencies(self):
+        """Log summary of expected and actual reading times."""
+        latencies = self.elm_read_latencies
+        if latencies:
+            expected = sum(value[0] for value in latencies) / len(latencies)
+            actual = sum(value[1] for value in latencies) / len(latencies)
+            logging.info("ELM reading latency: %d readings, mean expected %.3f s, mean actual %.3f s", len(latencies), expected, actual)
+
+    def elm_wait_srq(self, elm, timeout):
+        """Wait for service request on operation complete, returns `False`
+        if the resource does not support service requests or on timeout.
+        Unsupported service requests are not used again for this run.
+        """
+        try:
+            elm.resource.wait_for_srq(int(timeout * 1000))
+        except (AttributeError, NotImplementedError) as exc:
+            logging.warning("ELM service request not supported, polling operation complete: %s", exc)
+            self.unsupported_features().add('elm_srq')
+            return False
+        except pyvisa.errors.VisaIOError as exc:
+            logging.warning("ELM service request not received, polling operation complete: %s", exc)
+            return False
+        return True
+
     def elm_read(self, elm, timeout=60.0, interval=0.25):
-        """Perform electrometer reading with timeout."""
+        """Perform electrometer reading with timeout.
+
+        Operation complete is polled with an interval derived from the
+        estimated reading time, backing off exponentially up to `interval`.
+        If parameter `elm_read_srq_enable` is set a service request is
+        awaited instead of polling.
+        """
+        expected = self.elm_read_estimate()
+        use_srq = self.get_parameter('elm_read_srq_enable') and 'elm_srq' not in self.unsupported_features()
         # Request operation complete
         elm.resource.write('*CLS')
+        if use_srq:
+            # Service request on event summary bit, event on operation complete
+            elm.resource.write('*ESE 1')
+            elm.resource.write('*SRE 32')
+        try:
+            return self.elm_read_opc(elm, expected, timeout, interval, use_srq)
+        finally:
+            if use_srq:
+                # Disable service requests
+                elm.resource.write('*SRE 0')
+                elm.resource.write('*ESE 0')
+
+    def elm_read_opc(self, elm, expected, timeout, interval, use_srq):
         elm.resource.write('*OPC')
         # Initiate measurement
         logging.info("Initiate ELM measurement...")
+        t0 = time.time()
         elm.resource.write(":INIT")
-        threshold = time.time() + timeout
-        interval = min(timeout, interval)
+        threshold = t0 + timeout
+        if use_srq:
+            logging.info("Wait for ELM service request...")
+            use_srq = self.elm_wait_srq(elm, timeout)
+        # Reading is not ready before estimated time
+        poll_interval = min(interval, max(0.001, expected * 0.05))
+        if not use_srq:
+            time.sleep(max(0., min(threshold - time.time(), expected * 0.9)))
         logging.info("Poll ELM event status register...")
-        while time.time() < threshold:
-            # Read event status
+        while True:
+            # Read event status, at least once after a service request timeout
             if int(elm.resource.query('*ESR?')) & 0x1:
+                actual = time.time() - t0
+                self.elm_read_latencies.append((expected, actual))
+                logging.info("ELM reading latency: expected %.3f s, actual %.3f s", expected, actual)
                 logging.info("Fetch ELM reading...")
                 try:
                     result = elm.resource.query(":FETCH?")
                     return float(result.split(',')[0])
                 except Exception as exc:
                     raise RuntimeError(f"Failed to fetch ELM reading: {exc}") from exc
-            time.sleep(interval)
+            if time.time() >= threshold:
+                break
+            time.sleep(poll_interval)
+            poll_interval = min(interval, poll_interval * 2)
         raise RuntimeError(f"Electrometer reading timeout, exceeded {timeout:G} s")
 
     def elm_get_zero_check(self, elm):
@@ -444,6 +803,7 @@ class LCRMixin(Mixin):
 
     def register_lcr(self):
         self.register_parameter('lcr_soft_filter', True, type=bool)
+        self.register_parameter('lcr_soft_filter_batch_size', 0, type=int)
         self.register_parameter('lcr_amplitude', unit='V', required=True)
         self.register_parameter('lcr_frequency', unit='Hz', required=True)
         self.register_parameter('lcr_integration_time', 'medium', values=('short', 'medium', 'long'))
@@ -462,6 +822,7 @@ class LCRMixin(Mixin):
         lcr_open_correction_mode = self.get_parameter('lcr_open_correction_mode')
         lcr_open_correction_channel = self.get_parameter('lcr_open_correction_channel')
         lcr_soft_filter = self.get_parameter('lcr_soft_filter')
+        lcr_soft_filter_batch_size = self.get_parameter('lcr_soft_filter_batch_size')
 
         self.set_meta("lcr_amplitude", f"{lcr_amplitude:G} V")
         self.set_meta("lcr_frequency", f"{lcr_frequency:G} Hz")
@@ -471,6 +832,7 @@ class LCRMixin(Mixin):
         self.set_meta("lcr_open_correction_mode", lcr_open_correction_mode)
         self.set_meta("lcr_open_correction_channel", lcr_open_correction_channel)
         self.set_meta("lcr_soft_filter", lcr_soft_filter)
+        self.set_meta("lcr_soft_filter_batch_size", lcr_soft_filter_batch_size)
 
     def lcr_check_error(self, device):
         """Test for error."""
@@ -481,19 +843,60 @@ class LCRMixin(Mixin):
             logging.error(f"LCR error {code}: {message}")
             raise RuntimeError(f"LCR error {code}: {message}")
 
+    @contextlib.contextmanager
+    def lcr_transaction(self, device):
+        """Context queuing calls to `lcr_safe_write`, queued messages are
+        written as a batch on exit with a single operation complete and error
+        check. On error messages are replayed one by one to identify the
+        failing command.
+        """
+        transaction = WriteTransaction(device.resource)
+        self._lcr_transaction = transaction
+        try:
+            yield transaction
+        finally:
+            self._lcr_transaction = None
+        logging.info(f"safe write: {device.__class__.__name__}: {transaction.batches()}")
+        try:
+            errors = transaction.commit()
+        except Exception as exc:
+            self.shadow_state("lcr").invalidate()
+            raise RuntimeError(f"Failed to write to LCR: {transaction.messages}, {exc}") from exc
+        if errors:
+            logging.warning("LCR transaction failed, replay messages: %s", errors)
+            self.shadow_state("lcr").invalidate()
+            for message in transaction.messages:
+                self.lcr_safe_write(device, message)
+            code, message = errors[0]
+            logging.error(f"LCR error {code}: {message}")
+            raise RuntimeError(f"LCR error {code}: {message}")
+
     def lcr_safe_write(self, device, message):
-        """Write, wait for operation complete, test for error."""
+        """Write, wait for operation complete, test for error. Settings
+        already written are skipped.
+        """
+        def write():
+            self.lcr_write_message(device, message)
+        self.shadow_state("lcr").write_message(message, write)
+
+    def lcr_write_message(self, device, message):
+        transaction = getattr(self, '_lcr_transaction', None)
+        if transaction is not None:
+            transaction.append(message)
+            return
         logging.info(f"safe write: {device.__class__.__name__}: {message}")
         device.resource.write(message)
         device.resource.query("*OPC?")
         self.lcr_check_error(device)
 
     def lcr_reset(self, lcr):
-        lcr.reset()
-        lcr.clear()
-        self.lcr_check_error(lcr)
-        lcr.system.beeper.state = False
-        self.lcr_check_error(lcr)
+        def reset():
+            lcr.reset()
+            lcr.clear()
+            self.lcr_check_error(lcr)
+            lcr.system.beeper.state = False
+            self.lcr_check_error(lcr)
+        self.shadow_reset("lcr", reset)
 
     def lcr_setup(self, lcr):
         lcr_amplitude = self.get_parameter('lcr_amplitude')
@@ -504,18 +907,19 @@ class LCRMixin(Mixin):
         lcr_open_correction_mode = self.get_parameter('lcr_open_correction_mode')
         lcr_open_correction_channel = self.get_parameter('lcr_open_correction_channel')
 
-        self.lcr_safe_write(lcr, f":AMPL:ALC {lcr_auto_level_control:d}")
-        self.lcr_safe_write(lcr, f":VOLT {lcr_amplitude:E}V")
-        self.lcr_safe_write(lcr, f":FREQ {lcr_frequency:.0f}HZ")
-        self.lcr_safe_write(lcr, ":FUNC:IMP:RANG:AUTO ON")
-        self.lcr_safe_write(lcr, ":FUNC:IMP:TYPE CPRP")
-        integration = {"short": "SHOR", "medium": "MED", "long": "LONG"}[lcr_integration_time]
-        self.lcr_safe_write(lcr, f":APER {integration},{lcr_averaging_rate:d}")
-        self.lcr_safe_write(lcr, ":INIT:CONT OFF")
-        self.lcr_safe_write(lcr, ":TRIG:SOUR BUS")
-        method = {"single": "SING", "multi": "MULT"}[lcr_open_correction_mode]
-        self.lcr_safe_write(lcr, f":CORR:METH {method}")
-        self.lcr_safe_write(lcr, f":CORR:USE:CHAN {lcr_open_correction_channel:d}")
+        with self.lcr_transaction(lcr):
+            self.lcr_safe_write(lcr, f":AMPL:ALC {lcr_auto_level_control:d}")
+            self.lcr_safe_write(lcr, f":VOLT {lcr_amplitude:E}V")
+            self.lcr_safe_write(lcr, f":FREQ {lcr_frequency:.0f}HZ")
+            self.lcr_safe_write(lcr, ":FUNC:IMP:RANG:AUTO ON")
+            self.lcr_safe_write(lcr, ":FUNC:IMP:TYPE CPRP")
+            integration = {"short": "SHOR", "medium": "MED", "long": "LONG"}[lcr_integration_time]
+            self.lcr_safe_write(lcr, f":APER {integration},{lcr_averaging_rate:d}")
+            self.lcr_safe_write(lcr, ":INIT:CONT OFF")
+            self.lcr_safe_write(lcr, ":TRIG:SOUR BUS")
+            method = {"single": "SING", "multi": "MULT"}[lcr_open_correction_mode]
+            self.lcr_safe_write(lcr, f":CORR:METH {method}")
+            self.lcr_safe_write(lcr, f":CORR:USE:CHAN {lcr_open_correction_channel:d}")
 
     def lcr_acquire_reading(self, lcr):
         """Return primary and secondary LCR reading."""
@@ -524,15 +928,46 @@ class LCRMixin(Mixin):
         logging.info("lcr reading: %s-%s", prim, sec)
         return prim, sec
 
+    def lcr_acquire_batch_readings(self, lcr, count):
+        """Return list of primary and secondary LCR readings acquired in a
+        single batch.
+        """
+        readings = lcr.acquire_batch(count)
+        self.lcr_check_error(lcr)
+        logging.info("lcr batch readings: %d", len(readings))
+        return readings
+
     def lcr_acquire_filter_reading(self, lcr, maximum=64, threshold=0.005, size=2):
         """Aquire readings until standard deviation (sample) / mean < threshold.
 
         Size is the number of samples to be used for filter calculation.
+
+        If parameter `lcr_soft_filter_batch_size` is set, readings are first
+        acquired in a batch, single readings are only acquired if the batch
+        did not converge.
         """
         samples = []
         prim = 0.
         sec = 0.
-        for _ in range(maximum):
+        remaining = maximum
+        count = min(maximum, self.get_parameter('lcr_soft_filter_batch_size'))
+        if count >= size and 'lcr_batch' not in self.unsupported_features():
+            try:
+                readings = self.lcr_acquire_batch_readings(lcr, count)
+            except ValueError as exc:
+                logging.warning("lcr batch acquisition not supported, using single readings: %s", exc)
+                self.unsupported_features().add('lcr_batch')
+                readings = []
+            index = std_mean_filter_index([reading[0] for reading in readings], threshold, size)
+            if index is not None:
+                prim, sec = readings[index]
+                logging.info("lcr reading: %s-%s", prim, sec)
+                return prim, sec
+            samples = [reading[0] for reading in readings][-size:]
+            if readings:
+                prim, sec = readings[-1]
+            remaining -= len(readings)
+        for _ in range(remaining):
             prim, sec = self.lcr_acquire_reading(lcr)
             samples.append(prim)
             samples = samples[-size:]
@@ -546,6 +981,8 @@ class LCRMixin(Mixin):
         return lcr.bias.voltage.level
 
     def lcr_set_bias_voltage_level(self, lcr, voltage):
+        # Do not source while setup stages (e.g. matrix switching) are running
+        self.wait_interlocks()
         logging.info("LCR Meter set voltage level: %s", format_metric(voltage, "V"))
         lcr.bias.voltage.level = voltage
         self.lcr_check_error(lcr)
@@ -557,6 +994,8 @@ class LCRMixin(Mixin):
         return lcr.bias.state
 
     def lcr_set_bias_state(self, lcr, enabled):
+        if enabled:
+            self.wait_interlocks()
         logging.info("LCR Meter set voltage output state: %s", enabled)
         lcr.bias.state = enabled
         self.lcr_check_error(lcr)
@@ -574,41 +1013,71 @@ class EnvironmentMixin(Mixin):
         self.environment_temperature_chuck = float('nan')
         self.environment_humidity_box = float('nan')
 
-    def environment_update(self):
+    def environment_update(self, timestamp=None):
+        """Update environment readings from the sampled PC data, interpolated
+        to `timestamp` if given. Requests PC data if no recent sample is
+        available.
+        """
         self.environment_clear()
         if self.process.get("use_environ"):
-            with self.processes.get("environ") as environment:
-                pc_data = environment.pc_data()
-            self.environment_temperature_box = pc_data.box_temperature
-            logging.info("Box temperature: %.2f degC", self.environment_temperature_box)
-            self.environment_temperature_chuck = pc_data.chuck_temperature
-            logging.info("Chuck temperature: %.2f degC", self.environment_temperature_chuck)
-            self.environment_humidity_box = pc_data.box_humidity
-            logging.info("Box humidity: %.2f %%rH", self.environment_humidity_box)
+            environment = self.processes.get("environ")
+            max_age = 2 * (environment.sample_interval or 0)
+            if environment.latest_pc_data(max_age=max_age) is None:
+                with environment:
+                    pc_data = environment.pc_data()
+                self.environment_temperature_box = pc_data.box_temperature
+                self.environment_temperature_chuck = pc_data.chuck_temperature
+                self.environment_humidity_box = pc_data.box_humidity
+            else:
+                if timestamp is None:
+                    timestamp = time.time()
+                self.environment_temperature_box = environment.pc_data_value_at(timestamp, 'box_temperature')
+                self.environment_temperature_chuck = environment.pc_data_value_at(timestamp, 'chuck_temperature')
+                self.environment_humidity_box = environment.pc_data_value_at(timestamp, 'box_humidity')
+            logging.info(
+                "Box temperature: %.2f degC, chuck temperature: %.2f degC, box humidity: %.2f %%rH",
+                self.environment_temperature_box,
+                self.environment_temperature_chuck,
+                self.environment_humidity_box
+            )
 
 class AnalysisMixin(Mixin):
 
+    analysis_job = None
+
     def register_analysis(self):
-        self.register_parameter('analysis_functions', [], type=list)
-
-    def analysis_functions(self):
-        """Return analysis functions."""
-        functions = []
-        for analysis in self.get_parameter('analysis_functions'):
-            # String only argument to dictionary
-            if isinstance(analysis, str):
-                analysis = {'type': analysis}
-            if not isinstance(analysis, dict):
-                raise TypeError(f"Invalid analysis type: '{analysis}'")
-            def create_analyze_function(type, **kwargs):
-                f = analysis_pqc.__dict__.get(f'analyse_{type}')
-                if not callable(f):
-                    raise KeyError(f"No such analysis function: {type}")
-                def f_wrapper(*args, **kwargs):
-                    logging.info("Running analysis function '%s'...", type)
-                    r = f(*args, **kwargs)
-                    logging.info("Running analysis function '%s'... done.", type)
-                    return r
-                return partial(f_wrapper, **kwargs)
-            functions.append(create_analyze_function(**analysis))
-        return functions
+        self.register_parameter('analysis_functions', [], type=parse_analysis_tasks)
+
+    def analysis_tasks(self):
+        """Return validated analysis function names and keyword arguments."""
+        return self.get_parameter('analysis_functions')
+
+    def append_analysis(self, key, values):
+        """Store analysis result and show it with its fit points."""
+        logging.info("%s: %s", key, values)
+        self.set_analysis(key, values)
+        self.process.emit("append_analysis", key, values)
+        points = fit_points(values)
+        if points:
+            for x, y in points:
+                self.process.emit("reading", "xfit", x, y)
+            self.process.emit("update")
+
+    def analyze_series(self, **series):
+        """Run analysis functions on series arrays.
+
+        If process setting `concurrent_analysis` is enabled, the functions run
+        in analysis worker processes and the measurement continues
+        immediately. Results are emitted as `analysis_result` events and
+        collected by `analysis_job`.
+        """
+        tasks = self.analysis_tasks()
+        if self.process.get("concurrent_analysis", False):
+            measurement_item = self.measurement_item
+            def result(key, values):
+                logging.info("%s: %s", key, values)
+                self.process.emit("analysis_result", measurement_item, key, values)
+            self.analysis_job = self.process.analysis_executor.submit(tasks, series, result=result)
+        else:
+            for name, kwargs in tasks:
+                self.append_analysis(*run_analysis(name, kwargs, series))
@@ -1,11 +1,43 @@
-from .sample import *
-from .contact import *
-from .iv_ramp import *
-from .iv_ramp_elm import *
-from .iv_ramp_bias import *
-from .iv_ramp_bias_elm import *
-from .iv_ramp_4_wire import *
-from .cv_ramp import *
-from .cv_ramp_vsrc import *
-from .cv_ramp_alt import *
-from .frequency_scan import *
+"""Panels, modules are imported on first use."""
+
+import importlib
+
+__all__ = [
+    'PANEL_TYPES',
+    'panel_class'
+]
+
+PANEL_TYPES = {
+    'sample': ('.sample', 'SamplePanel'),
+    'contact': ('.contact', 'ContactPanel'),
+    'iv_ramp': ('.iv_ramp', 'IVRampPanel'),
+    'iv_ramp_elm': ('.iv_ramp_elm', 'IVRampElmPanel'),
+    'iv_ramp_bias': ('.iv_ramp_bias', 'IVRampBiasPanel'),
+    'iv_ramp_bias_elm': ('.iv_ramp_bias_elm', 'IVRampBiasElmPanel'),
+    'iv_ramp_4_wire': ('.iv_ramp_4_wire', 'IVRamp4WirePanel'),
+    'cv_ramp': ('.cv_ramp', 'CVRampPanel'),
+    'cv_ramp_vsrc': ('.cv_ramp_vsrc', 'CVRampHVPanel'),
+    'cv_ramp_alt': ('.cv_ramp_alt', 'CVRampAltPanel'),
+    'frequency_scan': ('.frequency_scan', 'FrequencyScanPanel')
+}
+"""Static registry of panel type names to module and class name."""
+
+def panel_class(key):
+    """Return panel class by type name, importing its module on first use.
+    Raises `KeyError` for unknown types.
+
+    >>> panel_class("iv_ramp")
+    <class 'comet_pqc.panels.iv_ramp.IVRampPanel'>
+    """
+    if key not in PANEL_TYPES:
+        raise KeyError(f"no such panel type: {key}")
+    module_name, class_name = PANEL_TYPES.get(key)
+    module = importlib.import_module(module_name, __name__)
+    return getattr(module, class_name)
+
+def __getattr__(name):
+    # Provide panel classes as package attributes on demand
+    for key, (module_name, class_name) in PANEL_TYPES.items():
+        if class_name == name:
+            return panel_class(key)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
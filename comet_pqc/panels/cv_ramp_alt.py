@@ -1,8 +1,8 @@
 import logging
 
-import comet
 from comet import ui
 
+from ..plotdata import ScaleTransform
 from ..utils import format_metric
 from .matrix import MatrixPanel
 from .mixins import LCRMixin
@@ -78,57 +78,4 @@ class CVRampAltPanel(MatrixPanel, LCRMixin, EnvironmentMixin):
             stretch=(1, 1, 1)
         )
 
-        fahrad = comet.ureg('F')
-        volt = comet.ureg('V')
-
-        self.series_transform['lcr'] = lambda x, y: ((x * volt).to('V').m, (y * fahrad).to('pF').m)
-
-    def mount(self, measurement):
-        super().mount(measurement)
-        for series in self.plot.series.values():
-            series.clear()
-        for series in self.plot2.series.values():
-            series.clear()
-        for name, points in measurement.series.items():
-            tr = self.series_transform.get(name, self.series_transform_default)
-            if name == "lcr":
-                for x, y in points:
-                    self.plot.series.get(name).append(*tr(x, y))
-            elif name == "lcr2":
-                for x, y in points:
-                    self.plot2.series.get(name).append(*tr(x, y))
-        self.plot.fit()
-        self.plot2.fit()
-
-    def append_reading(self, name, x, y):
-        if self.measurement:
-            tr = self.series_transform.get(name, self.series_transform_default)
-            if name == "lcr":
-                if name not in self.measurement.series:
-                    self.measurement.series[name] = []
-                self.measurement.series[name].append((x, y))
-                self.plot.series.get(name).append(*tr(x, y))
-                if self.plot.zoomed:
-                    self.plot.update("x")
-                else:
-                    self.plot.fit()
-            elif name == "lcr2":
-                if name not in self.measurement.series:
-                    self.measurement.series[name] = []
-                self.measurement.series[name].append((x, y))
-                self.plot2.series.get(name).append(*tr(x, y))
-                if self.plot2.zoomed:
-                    self.plot2.update("x")
-                else:
-                    self.plot2.fit()
-
-    def clear_readings(self):
-        super().clear_readings()
-        for series in self.plot.series.values():
-            series.clear()
-        for series in self.plot2.series.values():
-            series.clear()
-        if self.measurement:
-            for name, points in self.measurement.series.items():
-                self.measurement.series[name] = []
-        self.plot.fit()
+        self.series_transform['lcr'] = ScaleTransform('V', 'pF')
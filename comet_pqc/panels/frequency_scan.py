@@ -1,8 +1,8 @@
 import logging
 
-import comet
 from comet import ui
 
+from ..plotdata import ScaleTransform
 from ..utils import format_metric
 from .matrix import MatrixPanel
 from .mixins import HVSourceMixin
@@ -75,8 +75,5 @@ class FrequencyScanPanel(MatrixPanel, HVSourceMixin, LCRMixin, EnvironmentMixin)
             stretch=(1, 1, 1)
         )
 
-        fahrad = comet.ureg('F')
-        volt = comet.ureg('V')
-
-        self.series_transform['lcr'] = lambda x, y: ((x * volt).to('V').m, (y * fahrad).to('pF').m)
+        self.series_transform['lcr'] = ScaleTransform('V', 'pF')
         self.series_transform['xfit'] = self.series_transform.get('lcr')
@@ -1,6 +1,6 @@
-import comet
 from comet import ui
 
+from ..plotdata import ScaleTransform
 from ..utils import format_metric
 from .matrix import MatrixPanel
 from .mixins import HVSourceMixin
@@ -88,54 +88,28 @@ class IVRampBiasElmPanel(MatrixPanel, HVSourceMixin, VSourceMixin, ElectrometerM
             stretch=(1, 1, 1)
         )
 
-        ampere = comet.ureg('A')
-        volt = comet.ureg('V')
-
-        self.series_transform['elm'] = lambda x, y: ((x * volt).to('V').m, (y * ampere).to('uA').m)
+        self.series_transform['elm'] = ScaleTransform('V', 'uA')
         self.series_transform['xfit'] = self.series_transform.get('elm')
 
     def mount(self, measurement):
         super().mount(measurement)
         for name, points in measurement.series.items():
-            if name in self.plot.series:
-                if name in self.plot.series:
-                    self.plot.series.clear()
-                tr = self.series_transform.get(name, self.series_transform_default)
-                if points[0][0] > points[-1][0]:
+            if name in self.plot.series and len(points):
+                series = self.reading_series(name)
+                if series.x[0] > series.x[-1]:
                     self.plot.axes.get("x").qt.setReverse(True)
                 else:
                     self.plot.axes.get("x").qt.setReverse(False)
-                for x, y in points:
-                    self.plot.series.get(name).append(x, y)
-        self.update_readings()
 
-    def append_reading(self, name, x, y):
+    def append_readings(self, name, x_values, y_values):
         if self.measurement:
             if name in self.plot.series:
-                if name not in self.measurement.series:
-                    self.measurement.series[name] = []
-                self.measurement.series[name].append((x, y))
                 if self.voltage_start.value > self.voltage_stop.value:
                     self.plot.axes.get("x").qt.setReverse(True)
                 else:
                     self.plot.axes.get("x").qt.setReverse(False)
-                tr = self.series_transform.get(name, self.series_transform_default)
-                self.plot.series.get(name).append(*tr(x, y))
-                self.plot.series.get(name).qt.setVisible(True)
-
-    def update_readings(self):
-        if self.measurement:
-            if self.plot.zoomed:
-                self.plot.update("x")
-            else:
-                self.plot.fit()
+        super().append_readings(name, x_values, y_values)
 
     def clear_readings(self):
         super().clear_readings()
         self.plot.series.get("xfit").qt.setVisible(False)
-        for series in self.plot.series.values():
-            series.clear()
-        if self.measurement:
-            for name, points in self.measurement.series.items():
-                self.measurement.series[name] = []
-        self.plot.fit()
@@ -1,8 +1,8 @@
 import logging
 
-import comet
 from comet import ui
 
+from ..plotdata import ScaleTransform
 from ..utils import format_metric
 from .matrix import MatrixPanel
 from .mixins import HVSourceMixin
@@ -74,46 +74,10 @@ class IVRampElmPanel(MatrixPanel, HVSourceMixin, ElectrometerMixin, EnvironmentM
             stretch=(1, 1, 1)
         )
 
-        ampere = comet.ureg('A')
-        volt = comet.ureg('V')
-
-        self.series_transform['elm'] = lambda x, y: ((x * volt).to('V').m, (y * ampere).to('uA').m)
+        self.series_transform['elm'] = ScaleTransform('V', 'uA')
         self.series_transform['hvsrc'] = self.series_transform.get('elm')
         self.series_transform['xfit'] = self.series_transform.get('elm')
 
-    def mount(self, measurement):
-        super().mount(measurement)
-        for name, points in measurement.series.items():
-            if name in self.plot.series:
-                self.plot.series.clear()
-            tr = self.series_transform.get(name, self.series_transform_default)
-            for x, y in points:
-                self.plot.series.get(name).append(*tr(x, y))
-        self.update_readings()
-
-    def append_reading(self, name, x, y):
-        if self.measurement:
-            if name in self.plot.series:
-                if name not in self.measurement.series:
-                    self.measurement.series[name] = []
-                self.measurement.series[name].append((x, y))
-                tr = self.series_transform.get(name, self.series_transform_default)
-                self.plot.series.get(name).append(*tr(x, y))
-                self.plot.series.get(name).qt.setVisible(True)
-
-    def update_readings(self):
-        if self.measurement:
-            if self.plot.zoomed:
-                self.plot.update("x")
-            else:
-                self.plot.fit()
-
     def clear_readings(self):
         super().clear_readings()
         self.plot.series.get("xfit").qt.setVisible(False)
-        for series in self.plot.series.values():
-            series.clear()
-        if self.measurement:
-            for name, points in self.measurement.series.items():
-                self.measurement.series[name] = []
-        self.plot.fit()
@@ -5,6 +5,8 @@ from PyQt5 import QtCore
 import comet
 from comet import ui
 
+from ..plotdata import ReadingSeries
+from ..plotdata import ScaleTransform
 from ..utils import format_metric
 from ..utils import stitch_pixmaps
 
@@ -65,6 +67,12 @@ class Panel(BasicPanel):
 
     type = "measurement"
 
+    refresh_rate = 25.0
+    """Maximum plot refresh rate in frames per second."""
+
+    minimum_buckets = 512
+    """Minimum number of min/max decimation buckets per plot series."""
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._bindings = {}
@@ -97,7 +105,12 @@ class Panel(BasicPanel):
 
         # Plots
         self.series_transform = {}
-        self.series_transform_default = lambda x, y: (x, y)
+        self.series_transform_default = ScaleTransform()
+        self._dirty_plots = []
+        self._refresh_timer = QtCore.QTimer()
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(int(1000 / self.refresh_rate))
+        self._refresh_timer.timeout.connect(self.refresh_plots)
 
     def bind(self, key, element, default=None, unit=None):
         """Bind measurement parameter to UI element for syncronization on mount
@@ -138,6 +151,8 @@ class Panel(BasicPanel):
             else:
                 setattr(element, "value", value)
         self.load_analysis()
+        for plot in self.plots():
+            self.refresh_plot(plot)
         # Show first tab on mount
         self.data_tabs.qt.setCurrentIndex(0)
 
@@ -198,16 +213,79 @@ class Panel(BasicPanel):
         for handler in self.state_handlers:
             handler(state)
 
+    def plots(self):
+        """Return list of plots of data tabs."""
+        return [tab.layout for tab in self.data_tabs if isinstance(tab.layout, ui.Plot)]
+
+    def reading_series(self, name):
+        """Return array backed reading series `name` of mounted measurement."""
+        series = self.measurement.series.get(name)
+        if not isinstance(series, ReadingSeries):
+            series = ReadingSeries(series or ())
+            self.measurement.series[name] = series
+        return series
+
     def append_reading(self, name, x, y):
-        pass
+        self.append_readings(name, [x], [y])
+
+    def append_readings(self, name, x_values, y_values):
+        """Append batch of readings to every plot providing series `name`,
+        plots are refreshed with the next frame.
+        """
+        if self.measurement:
+            for plot in self.plots():
+                if name in plot.series:
+                    self.reading_series(name).extend(x_values, y_values)
+                    self.schedule_refresh(plot)
 
     def update_readings(self):
-        pass
+        """Plot updates are batched, see `schedule_refresh`."""
+
+    def schedule_refresh(self, plot):
+        """Refresh plot with the next frame, limited to `refresh_rate`."""
+        if plot not in self._dirty_plots:
+            self._dirty_plots.append(plot)
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
+    def refresh_plots(self):
+        plots, self._dirty_plots = self._dirty_plots, []
+        for plot in plots:
+            self.refresh_plot(plot)
+
+    def refresh_plot(self, plot):
+        """Replace plot series by transformed readings, decimated to the plot
+        width unless zoomed.
+        """
+        if not self.measurement:
+            return
+        # Plot widget might not be laid out yet (e.g. on mount)
+        buckets = None if plot.zoomed else max(self.minimum_buckets, plot.qt.width())
+        for name, series in plot.series.items():
+            readings = self.measurement.series.get(name)
+            if readings:
+                tr = self.series_transform.get(name, self.series_transform_default)
+                series.replace(self.reading_series(name).points(tr, buckets))
+                series.qt.setVisible(True)
+            else:
+                series.clear()
+        if plot.zoomed:
+            plot.update("x")
+        else:
+            plot.fit()
 
     def clear_readings(self):
         self.analysis_tree.clear()
+        self._refresh_timer.stop()
+        self._dirty_plots.clear()
+        for plot in self.plots():
+            for series in plot.series.values():
+                series.clear()
         if self.measurement:
             self.measurement.analysis.clear()
+            self.measurement.series.clear()
+        for plot in self.plots():
+            plot.fit()
 
     def append_analysis(self, key, values):
         if self.measurement:
@@ -0,0 +1,113 @@
+"""Plot data layer for live measurement readings."""
+
+import math
+
+import numpy as np
+
+from .series import SeriesColumn
+from .units import unit_factor
+
+__all__ = [
+    'unit_factor',
+    'ScaleTransform',
+    'ReadingSeries',
+    'minmax_decimate'
+]
+
+class ScaleTransform:
+    """Series transform scaling readings to plot units using precomputed
+    factors, applicable to single points or arrays.
+
+    >>> tr = ScaleTransform('V', 'uA')
+    >>> tr(10.0, 2.5e-6)
+    (10.0, 2.5)
+    """
+
+    def __init__(self, x_unit=None, y_unit=None):
+        self.x_factor = unit_factor(x_unit) if x_unit else 1.0
+        self.y_factor = unit_factor(y_unit) if y_unit else 1.0
+
+    def __call__(self, x, y):
+        return x * self.x_factor, y * self.y_factor
+
+    def apply(self, x, y):
+        """Return scaled copies of arrays `x` and `y`."""
+        return np.multiply(x, self.x_factor), np.multiply(y, self.y_factor)
+
+def minmax_decimate(x, y, buckets):
+    """Return decimated arrays `x` and `y` keeping the minimum and maximum
+    of `y` of `buckets` consecutive chunks in their original order, the
+    first and last points are always kept. Arrays of up to `2 * buckets`
+    points are returned unchanged.
+
+    >>> minmax_decimate([0, 1, 2, 3, 4, 5], [0, 5, 1, 4, 2, 3], 2)
+    (array([0, 1, 3, 4, 5]), array([0, 5, 4, 2, 3]))
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    size = len(y)
+    buckets = max(1, int(buckets))
+    if size <= 2 * buckets:
+        return x, y
+    chunk = int(math.ceil(size / buckets))
+    count = int(math.ceil(size / chunk))
+    offsets = np.arange(count) * chunk
+    padded = np.full(count * chunk, np.inf)
+    padded[:size] = y
+    minimum = np.argmin(padded.reshape(count, chunk), axis=1) + offsets
+    padded[size:] = -np.inf
+    maximum = np.argmax(padded.reshape(count, chunk), axis=1) + offsets
+    indices = np.unique(np.concatenate((minimum, maximum, [0, size - 1])))
+    return x[indices], y[indices]
+
+class ReadingSeries:
+    """Array backed series of raw `(x, y)` readings.
+
+    >>> series = ReadingSeries()
+    >>> series.append(1.0, 4.2e-9)
+    >>> series.x
+    array([1.])
+    """
+
+    def __init__(self, points=()):
+        self.__x = SeriesColumn()
+        self.__y = SeriesColumn()
+        for x, y in points:
+            self.append(x, y)
+
+    def __len__(self):
+        return len(self.__x)
+
+    def __iter__(self):
+        return zip(self.__x.tolist(), self.__y.tolist())
+
+    @property
+    def x(self):
+        return self.__x.values
+
+    @property
+    def y(self):
+        return self.__y.values
+
+    def append(self, x, y):
+        self.__x.append(x)
+        self.__y.append(y)
+
+    def extend(self, x_values, y_values):
+        for x, y in zip(x_values, y_values):
+            self.append(x, y)
+
+    def clear(self):
+        self.__x.clear()
+        self.__y.clear()
+
+    def points(self, transform=None, buckets=None):
+        """Return list of `(x, y)` points, decimated to `buckets` and
+        scaled by `transform` if provided.
+        """
+        x, y = self.x, self.y
+        if buckets:
+            x, y = minmax_decimate(x, y, buckets)
+        if transform is not None:
+            x, y = transform.apply(x, y)
+        return list(zip(np.asarray(x).tolist(), np.asarray(y).tolist()))
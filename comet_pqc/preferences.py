@@ -226,23 +226,67 @@ class OptionsTab(PreferencesTab):
     def __init__(self):
         super().__init__(title="Options")
         self.png_plots_checkbox = ui.CheckBox("Save plots as PNG")
+        self.event_rate_number = ui.Number(
+            value=25.0,
+            minimum=0.0,
+            maximum=100.0,
+            decimals=0,
+            suffix="Hz",
+            tool_tip="Maximum rate of measurement updates, readings in between are batched (0 to disable)."
+        )
         self.export_json_checkbox = ui.CheckBox("Write JSON data (*.json)")
         self.export_txt_checkbox = ui.CheckBox("Write plain text data (*.txt)")
+        self.export_npz_checkbox = ui.CheckBox("Write NumPy binary data (*.npz)")
+        self.flush_interval_number = ui.Number(
+            value=1.0,
+            minimum=0.0,
+            maximum=60.0,
+            decimals=1,
+            suffix="s",
+            tool_tip="Interval for flushing streamed data to disk."
+        )
         self.write_logfiles_checkbox = ui.CheckBox("Write measurement log files (*.log)")
+        self.optimize_route_checkbox = ui.CheckBox(
+            text="Optimize contact order",
+            tool_tip="Visit contacts of a sample in shortest table travel order, pinned contacts keep their place."
+        )
+        self.pipeline_setup_checkbox = ui.CheckBox(
+            text="Switch matrix during instrument setup",
+            tool_tip="Close matrix channels concurrently to instrument reset and setup, sources are enabled after channels are verified."
+        )
+        self.skip_identical_reset_checkbox = ui.CheckBox(
+            text="Skip instrument reset between identical measurements",
+            tool_tip="Keep instrument configuration if the previous measurement was of the same type and finished without error, only changed settings are written."
+        )
+        self.concurrent_analysis_checkbox = ui.CheckBox(
+            text="Run analysis in background processes",
+            tool_tip="Continue with the next measurement while analysis functions run, result files are updated when analysis finished."
+        )
         self._vsrc_instrument_combobox = ui.ComboBox(["K2410", "K2657A"])
         self._hvsrc_instrument_combobox = ui.ComboBox(["K2410", "K2657A"])
         self.layout = ui.Column(
             ui.GroupBox(
                 title="Plots",
                 layout=ui.Row(
-                    self.png_plots_checkbox
+                    self.png_plots_checkbox,
+                    ui.Label("Update rate"),
+                    self.event_rate_number,
+                    ui.Spacer(vertical=False),
+                    stretch=(0, 0, 0, 1)
                 )
             ),
             ui.GroupBox(
                 title="Formats",
                 layout=ui.Column(
                     self.export_json_checkbox,
-                    self.export_txt_checkbox
+                    self.export_txt_checkbox,
+                    self.export_npz_checkbox,
+                    ui.Row(
+                        ui.Label("Flush interval"),
+                        self.flush_interval_number,
+                        ui.Spacer(vertical=False),
+                        stretch=(0, 0, 1)
+                    )
                 )
             ),
             ui.GroupBox(
@@ -251,6 +295,15 @@ class OptionsTab(PreferencesTab):
                     self.write_logfiles_checkbox
                 )
             ),
+            ui.GroupBox(
+                title="Sequence",
+                layout=ui.Column(
+                    self.optimize_route_checkbox,
+                    self.pipeline_setup_checkbox,
+                    self.skip_identical_reset_checkbox,
+                    self.concurrent_analysis_checkbox
+                )
+            ),
             ui.GroupBox(
                 title="Instruments",
                 layout=ui.Row(
@@ -272,12 +325,26 @@ class OptionsTab(PreferencesTab):
     def load(self):
         png_plots = self.settings.get("png_plots", False)
         self.png_plots_checkbox.checked = png_plots
+        event_rate = self.settings.get("event_rate", 25.0)
+        self.event_rate_number.value = event_rate
         export_json = self.settings.get("export_json", False)
         self.export_json_checkbox.checked = export_json
         export_txt = self.settings.get("export_txt", True)
         self.export_txt_checkbox.checked = export_txt
+        export_npz = self.settings.get("export_npz", False)
+        self.export_npz_checkbox.checked = export_npz
+        flush_interval = self.settings.get("flush_interval", 1.0)
+        self.flush_interval_number.value = flush_interval
         write_logfiles = self.settings.get("write_logfiles", True)
         self.write_logfiles_checkbox.checked = write_logfiles
+        optimize_route = self.settings.get("optimize_route", False)
+        self.optimize_route_checkbox.checked = optimize_route
+        pipeline_setup = self.settings.get("pipeline_setup", False)
+        self.pipeline_setup_checkbox.checked = pipeline_setup
+        skip_identical_reset = self.settings.get("skip_identical_reset", False)
+        self.skip_identical_reset_checkbox.checked = skip_identical_reset
+        concurrent_analysis = self.settings.get("concurrent_analysis", False)
+        self.concurrent_analysis_checkbox.checked = concurrent_analysis
         vsrc_instrument = self.settings.get("vsrc_instrument") or "K2657A"
         if vsrc_instrument in self._vsrc_instrument_combobox:
             self._vsrc_instrument_combobox.current = vsrc_instrument
@@ -288,12 +355,26 @@ class OptionsTab(PreferencesTab):
     def store(self):
         png_plots = self.png_plots_checkbox.checked
         self.settings["png_plots"] = png_plots
+        event_rate = self.event_rate_number.value
+        self.settings["event_rate"] = event_rate
         export_json = self.export_json_checkbox.checked
         self.settings["export_json"] = export_json
         export_txt = self.export_txt_checkbox.checked
         self.settings["export_txt"] = export_txt
+        export_npz = self.export_npz_checkbox.checked
+        self.settings["export_npz"] = export_npz
+        flush_interval = self.flush_interval_number.value
+        self.settings["flush_interval"] = flush_interval
         write_logfiles = self.write_logfiles_checkbox.checked
         self.settings["write_logfiles"] = write_logfiles
+        optimize_route = self.optimize_route_checkbox.checked
+        self.settings["optimize_route"] = optimize_route
+        pipeline_setup = self.pipeline_setup_checkbox.checked
+        self.settings["pipeline_setup"] = pipeline_setup
+        skip_identical_reset = self.skip_identical_reset_checkbox.checked
+        self.settings["skip_identical_reset"] = skip_identical_reset
+        concurrent_analysis = self.concurrent_analysis_checkbox.checked
+        self.settings["concurrent_analysis"] = concurrent_analysis
         vsrc_instrument = self._vsrc_instrument_combobox.current or "K2657A"
         self.settings["vsrc_instrument"] = vsrc_instrument
         hvsrc_instrument = self._hvsrc_instrument_combobox.current or "K2410"
@@ -2,26 +2,66 @@ import logging
 import time
 
 from comet.driver.hephy import EnvironmentBox
+
+from ..snapshots import SnapshotBuffer
 from .resource import ResourceProcess, async_request
 
 class EnvironmentProcess(ResourceProcess):
+    """Environment box process, samples PC data in the background at
+    `sample_interval` seconds (disabled if `None`).
+    """
 
     Driver = EnvironmentBox
 
-    def __init__(self, *args, pc_data_updated=None, **kwargs):
+    sample_interval = 1.0
+
+    def __init__(self, *args, pc_data_updated=None, sample_interval=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.pc_data_updated = pc_data_updated
+        if sample_interval is not None:
+            self.sample_interval = sample_interval
+        self.snapshots = SnapshotBuffer()
+        self.__sample_time = 0.
+
+    def poll(self, context):
+        if self.sample_interval is not None:
+            if time.monotonic() - self.__sample_time >= self.sample_interval:
+                self.__sample_time = time.monotonic()
+                # Fail only this sample, keep serving requests
+                try:
+                    pc_data = context.pc_data
+                except Exception as exc:
+                    logging.error("%s: failed to sample PC data: %s", type(self).__name__, exc)
+                    return
+                self.snapshots.append(pc_data)
+                self.emit('pc_data_updated', pc_data)
 
     @async_request
     def request_pc_data(self, context):
         pc_data = context.pc_data
+        self.snapshots.append(pc_data)
         self.emit('pc_data_updated', pc_data)
 
     def pc_data(self):
         def request(context):
-            return context.pc_data
+            pc_data = context.pc_data
+            self.snapshots.append(pc_data)
+            return pc_data
         return self.request(request)
 
+    def latest_pc_data(self, max_age=None):
+        """Return latest sampled PC data without a request, `None` if no
+        sample is available or latest is older than `max_age` seconds.
+        """
+        result = self.snapshots.latest(max_age)
+        if result is None:
+            return None
+        return result[1]
+
+    def pc_data_value_at(self, timestamp, key):
+        """Return sampled PC data value interpolated to `timestamp`."""
+        return self.snapshots.value_at(timestamp, key)
+
     def has_lights(self):
         """Return True if any light source is enabled."""
         def request(context):
@@ -1,5 +1,7 @@
+import concurrent.futures
 import datetime
 import logging
+import math
 import random
 import time
 import threading
@@ -15,10 +17,19 @@ from comet.driver.corvus import Venus1
 from comet.driver.hephy import EnvironmentBox
 from comet.driver.keithley import K707B
 
+from ..analysis import AnalysisExecutor
+from ..eventbus import EventBus
 from ..utils import format_metric
 from ..measurements.measurement import ComplianceError
 from ..measurements import measurement_factory
+from ..ramp import Ramp
+from ..resourcepool import ResourcePool
+from ..route import RouteReport
+from ..route import plan_route
 from ..settings import settings
+from ..writer import JSONWriter
+from ..writer import NPZWriter
+from ..writer import TextWriter
 
 from ..sequence import MeasurementTreeItem
 from ..sequence import ContactTreeItem
@@ -64,6 +75,12 @@ class LogFileHandler:
 
 class BaseProcess(comet.Process, ResourceMixin, ProcessMixin):
 
+    safe_ramp_step = 25.0
+    """Maximum voltage step in volts ramping down sources in safe state."""
+
+    safe_ramp_slew_rate = 250.0
+    """Slew rate in volts per second ramping down sources in safe state."""
+
     def create_filename(self, measurement, suffix=''):
         filename = comet.safe_filename(f"{measurement.basename}{suffix}")
         return os.path.join(self.get('output_dir'), measurement.sample_name, filename)
@@ -74,9 +91,10 @@ class BaseProcess(comet.Process, ResourceMixin, ProcessMixin):
             self.emit("message", "Ramping down HV Source...")
             start_voltage = context.get_source_voltage()
             stop_voltage = 0.0
-            step_voltage = min(25.0, max(5.0, start_voltage / 100.))
-            for voltage in comet.Range(start_voltage, stop_voltage, step_voltage):
+            ramp = Ramp(start_voltage, stop_voltage, self.safe_ramp_step, slew_rate=self.safe_ramp_slew_rate)
+            for voltage in ramp:
                 context.set_source_voltage(voltage)
+                ramp.wait()
             self.emit("message", "Disable output HV Source...")
             context.set_output(context.OUTPUT_OFF)
         self.emit("message", "Initialized HVSource.")
@@ -87,9 +105,10 @@ class BaseProcess(comet.Process, ResourceMixin, ProcessMixin):
             self.emit("message", "Ramping down V Source...")
             start_voltage = context.get_source_voltage()
             stop_voltage = 0.0
-            step_voltage = min(25.0, max(5.0, start_voltage / 100.))
-            for voltage in comet.Range(start_voltage, stop_voltage, step_voltage):
+            ramp = Ramp(start_voltage, stop_voltage, self.safe_ramp_step, slew_rate=self.safe_ramp_slew_rate)
+            for voltage in ramp:
                 context.set_source_voltage(voltage)
+                ramp.wait()
             self.emit("message", "Disable output V Source...")
             context.set_output(context.OUTPUT_OFF)
         self.emit("message", "Initialized VSource.")
@@ -166,24 +185,131 @@ class MeasureProcess(BaseProcess):
 
     context = None
 
-    def __init__(self, message, progress, measurement_state=None, reading=None, save_to_image=None, push_summary=None, **kwargs):
+    route_velocity = 10.0
+    """Estimated XY table velocity in millimeters per second."""
+
+    route_move_overhead = 4.0
+    """Estimated duration in seconds of Z retreat and Z up per contact move."""
+
+    pooled_resources = "matrix", "hvsrc", "vsrc", "lcr", "elm"
+    """Resources kept connected for the whole run."""
+
+    event_rate = 25.0
+    """Default maximum rate of coalesced event deliveries per second."""
+
+    analysis_timeout = 300.0
+    """Maximum time in seconds to wait for pending analysis after a run."""
+
+    def __init__(self, message, progress, measurement_state=None, reading=None, readings=None, analysis_result=None, save_to_image=None, push_summary=None, **kwargs):
         super().__init__(**kwargs)
         self.message = message
         self.progress = progress
         self.measurement_state = measurement_state
         self.reading = reading
+        self.readings = readings
+        self.analysis_result = analysis_result
         self.save_to_image = save_to_image
         self.push_summary = push_summary
         self.stop_requested = False
+        self.__resource_pool = None
+        self.__event_bus = None
+        self.analysis_executor = AnalysisExecutor()
+
+    def emit(self, event, *args, **kwargs):
+        """Emit event, coalesced by the event bus while running."""
+        event_bus = self.__event_bus
+        if event_bus is None or kwargs:
+            super().emit(event, *args, **kwargs)
+        else:
+            event_bus.emit(event, *args)
+
+    def open_event_bus(self):
+        event_rate = self.get("event_rate", self.event_rate)
+        self.__event_bus = EventBus(super().emit, rate=event_rate)
+        self.__event_bus.start()
+
+    def close_event_bus(self):
+        event_bus = self.__event_bus
+        self.__event_bus = None
+        if event_bus is not None:
+            event_bus.close()
+            logging.info("event bus: %s", event_bus.metrics)
+
+    @property
+    def resources(self):
+        """Return persistent resource pool while running, else the resource
+        registry.
+        """
+        if self.__resource_pool is not None:
+            return self.__resource_pool
+        return super().resources
+
+    @property
+    def resource_pool(self):
+        return self.__resource_pool
+
+    def open_resource_pool(self):
+        self.__resource_pool = ResourcePool(
+            super().resources,
+            self.pooled_resources,
+            connection_errors=(pyvisa.errors.VisaIOError, ConnectionError, BrokenPipeError)
+        )
+
+    def invalidate_shadow_states(self):
+        if self.__resource_pool is not None:
+            self.__resource_pool.invalidate_shadow_states()
+
+    def close_resource_pool(self):
+        resource_pool = self.__resource_pool
+        self.__resource_pool = None
+        if resource_pool is not None:
+            for name in resource_pool.names:
+                state = resource_pool.shadow_state(name)
+                logging.info("shadow state %s: written %d, skipped %d", name, state.written, state.skipped)
+            resource_pool.close()
+            logging.info("resource pool: %s", resource_pool.metrics)
+
+    def wait_analysis(self):
+        """Wait for concurrent analysis of all measurements, gives up after
+        `analysis_timeout` seconds or if stop was requested.
+        """
+        if self.analysis_executor.pending:
+            self.emit("message", "Waiting for analysis...")
+            deadline = time.monotonic() + self.analysis_timeout
+            while not self.analysis_executor.wait(timeout=.25):
+                if self.stop_requested or time.monotonic() > deadline:
+                    logging.warning("abandoned waiting for %d pending analysis jobs", self.analysis_executor.pending)
+                    break
+            self.emit("message", "Waiting for analysis... done.")
 
     def stop(self):
         """Stop running measurements."""
         self.stop_requested = True
         super().stop()
 
+    def verify_sources_off(self):
+        """Safety interlock before table moves, ramps down and disables HV
+        Source and V Source outputs if enabled. Both sources are verified
+        concurrently.
+        """
+        def verify_hvsrc():
+            with self.resources.get("hvsrc") as hvsrc:
+                self.safe_initialize_hvsrc(hvsrc)
+        def verify_vsrc():
+            try:
+                with self.resources.get("vsrc") as vsrc:
+                    self.safe_initialize_vsrc(vsrc)
+            except Exception:
+                logging.error("unable to connect with VSource")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(verify_hvsrc), executor.submit(verify_vsrc)]
+        for future in futures:
+            future.result()
+
     def safe_move_table(self, position):
         table_process = self.processes.get("table")
         if table_process.running and table_process.enabled:
+            self.verify_sources_off()
             logging.info("safe move table to %s", position)
             self.emit("message", "Moving table...")
             self.set("movement_finished", False)
@@ -198,6 +324,18 @@ class MeasureProcess(BaseProcess):
                 time.sleep(.25)
             logging.info("safe move table to %s... done.", position)
 
+    def create_writers(self, measurement):
+        """Return list of streaming data writers for measurement."""
+        flush_interval = self.get("flush_interval", 1.0)
+        writers = []
+        if self.get("serialize_json"):
+            writers.append(JSONWriter(self.create_filename(measurement, suffix='.json'), flush_interval))
+        if self.get("serialize_txt"):
+            writers.append(TextWriter(self.create_filename(measurement, suffix='.txt'), flush_interval))
+        if self.get("serialize_npz"):
+            writers.append(NPZWriter(self.create_filename(measurement, suffix='.npz')))
+        return writers
+
     def initialize(self):
         self.emit("message", "Initialize...")
         self.stop_requested = False
@@ -230,6 +368,8 @@ class MeasureProcess(BaseProcess):
             operator=operator
         )
         measurement.measurement_item = measurement_item
+        for writer in self.create_writers(measurement):
+            measurement.add_writer(writer)
         log_filename = self.create_filename(measurement, suffix='.log') if write_logfiles else None
         plot_filename = self.create_filename(measurement, suffix='.png')
         state = measurement_item.ActiveState
@@ -262,16 +402,31 @@ class MeasureProcess(BaseProcess):
                 else:
                     state = measurement_item.SuccessState
             finally:
+                if state not in (measurement_item.SuccessState, measurement_item.StoppedState):
+                    # Instrument configuration is unknown after errors
+                    self.invalidate_shadow_states()
                 self.emit("measurement_state", measurement_item, state, measurement.quality)
                 self.emit("save_to_image", measurement_item, plot_filename)
                 self.emit('push_summary', measurement.timestamp, sample_name, sample_type, measurement_item.contact.name, measurement_item.name, state)
-                if self.get("serialize_json"):
-                    with open(self.create_filename(measurement, suffix='.json'), 'w') as fp:
-                        measurement.serialize_json(fp)
-                if self.get("serialize_txt"):
-                    # See https://docs.python.org/3/library/csv.html#csv.DictWriter
-                    with open(self.create_filename(measurement, suffix='.txt'), 'w', newline='') as fp:
-                        measurement.serialize_txt(fp)
+                for writer in measurement.writers:
+                    # Close every writer even if another one failed
+                    try:
+                        writer.close(measurement.data)
+                    except Exception as exc:
+                        logging.error("failed to close %s: %s", writer.filename, exc)
+                analysis_job = getattr(measurement, 'analysis_job', None)
+                if analysis_job is not None:
+                    analysis_job.add_done_callback(lambda job: self.patch_analysis(measurement, job))
+
+    def patch_analysis(self, measurement, job):
+        """Store results of concurrent analysis job and patch result files."""
+        for key, values in job.results:
+            measurement.set_analysis(key, values)
+        for writer in measurement.writers:
+            try:
+                writer.patch(measurement.data)
+            except Exception as exc:
+                logging.error("failed to patch %s: %s", writer.filename, exc)
 
     def process_contact(self, contact_item):
         self.emit("message", "Process contact...")
@@ -304,6 +459,37 @@ class MeasureProcess(BaseProcess):
         if prev_measurement_item:
             self.emit('hide_measurement', prev_measurement_item)
 
+    def route_report(self, sample_item, start=None):
+        """Return enabled contacts of sample and a report of their optimized
+        visit order starting from table position `start` (dry run, the table
+        is not moved). Pinned contacts keep their place.
+        """
+        enabled_items = [item for item in sample_item.children if item.enabled]
+        if start is not None and any(math.isnan(value) for value in start):
+            start = None
+        positions = [item.position for item in enabled_items]
+        pinned = [index for index, item in enumerate(enabled_items) if item.pinned]
+        order = plan_route(positions, pinned, start)
+        report = RouteReport(positions, order, start, self.route_velocity, self.route_move_overhead)
+        return enabled_items, report
+
+    def ordered_contacts(self, sample_item):
+        """Return contacts of sample in visit order.
+
+        If setting `optimize_route` is enabled, enabled contacts are visited in
+        an optimized order starting from the current table position, pinned
+        contacts keep their place. A report comparing travel distance and
+        time against config order is logged whenever contacts are moved to.
+        """
+        contact_items = list(sample_item.children)
+        if not self.get("move_to_contact"):
+            return contact_items
+        enabled_items, report = self.route_report(sample_item, self.get("table_position"))
+        logging.info("contact route %s: %s", sample_item.name, report)
+        if self.get("optimize_route"):
+            return [enabled_items[index] for index in report.order]
+        return contact_items
+
     def process_sample(self, sample_item):
         self.emit("message", "Process sample...")
         self.emit("measurement_state", sample_item, sample_item.ProcessingState)
@@ -312,7 +498,7 @@ class MeasureProcess(BaseProcess):
             if contact_item.enabled:
                 if not contact_item.has_position:
                     raise RuntimeError(f"No contact position assigned for {contact_item.sample.name} -> {contact_item.name}")
-        for contact_item in sample_item.children:
+        for contact_item in self.ordered_contacts(sample_item):
             if not self.running:
                 break
             if not contact_item.enabled:
@@ -374,14 +560,23 @@ class MeasureProcess(BaseProcess):
             self.stop_requested = False
 
     def run(self):
+        self.open_event_bus()
         try:
+            self.open_resource_pool()
             try:
-                self.initialize()
-                self.process()
-            finally:
-                self.finalize()
-        except Exception:
-            self.emit("message", "Measurement failed.")
-            raise
-        else:
-            self.emit("message", "Measurement done.")
+                try:
+                    self.initialize()
+                    self.process()
+                finally:
+                    try:
+                        self.finalize()
+                    finally:
+                        self.close_resource_pool()
+                        self.wait_analysis()
+            except Exception:
+                self.emit("message", "Measurement failed.")
+                raise
+            else:
+                self.emit("message", "Measurement done.")
+        finally:
+            self.close_event_bus()
@@ -22,30 +22,82 @@ class ResourceRequest:
         self.result = None
         self.error = None
         self.ready = threading.Event()
+        self.created = time.monotonic()
+        self.started = None
+        self.finished = None
+
+    @property
+    def queue_time(self):
+        """Returns seconds the request was waiting to be served."""
+        if self.started is None:
+            return None
+        return self.started - self.created
+
+    @property
+    def latency(self):
+        """Returns seconds from creation to completion of the request."""
+        if self.finished is None:
+            return None
+        return self.finished - self.created
 
     def get(self, timeout=10.0):
-        t = time.time() + timeout
-        while not self.ready.is_set():
-            if t < time.time():
-                raise RuntimeError(f"Request timeout: {self.command}")
+        if not self.ready.wait(timeout):
+            raise RuntimeError(f"Request timeout: {self.command}")
         if self.error is not None:
             raise self.error
         return self.result
 
     def dispatch(self, context):
+        self.started = time.monotonic()
         try:
             self.result = self.command(context)
         except Exception as exc:
             self.error = exc
             raise
         finally:
+            self.finished = time.monotonic()
             self.ready.set()
 
+class RequestMetrics:
+    """Request latency metrics of a resource process."""
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+        self.total_latency = 0.
+        self.max_latency = 0.
+        self.total_queue_time = 0.
+
+    def add(self, request):
+        with self.__lock:
+            self.count += 1
+            if request.error is not None:
+                self.errors += 1
+            self.total_latency += request.latency
+            self.max_latency = max(self.max_latency, request.latency)
+            self.total_queue_time += request.queue_time
+
+    @property
+    def mean_latency(self):
+        with self.__lock:
+            return self.total_latency / self.count if self.count else 0.
+
+    @property
+    def mean_queue_time(self):
+        with self.__lock:
+            return self.total_queue_time / self.count if self.count else 0.
+
+    def __str__(self):
+        return f"{self.count} requests, {self.errors} errors, mean latency {self.mean_latency * 1e3:.3f} ms, " \
+               f"max latency {self.max_latency * 1e3:.3f} ms, mean queue time {self.mean_queue_time * 1e3:.3f} ms"
+
 class ResourceProcess(Process, ResourceMixin):
 
     Driver = DefaultDriver
 
-    throttle_time = 0.001
+    serve_timeout = 0.050
+    """Timeout for waiting on requests, running state is checked in between."""
 
     def __init__(self, name, enabled=True, **kwargs):
         super().__init__(**kwargs)
@@ -53,6 +105,7 @@ class ResourceProcess(Process, ResourceMixin):
         self.enabled = enabled
         self.__failed_retries = 0
         self.__queue = queue.Queue()
+        self.__metrics = RequestMetrics()
         self.__lock = threading.RLock()
         self.__context_lock = threading.RLock()
 
@@ -64,6 +117,11 @@ class ResourceProcess(Process, ResourceMixin):
         self.__context_lock.release()
         return False
 
+    @property
+    def metrics(self):
+        """Returns request latency metrics."""
+        return self.__metrics
+
     @property
     def enabled(self):
         return self.__enabled
@@ -87,6 +145,11 @@ class ResourceProcess(Process, ResourceMixin):
             self.__queue.put(r)
             return r.get()
 
+    def poll(self, context):
+        """Called periodically while serving, overwrite to sample data in
+        the background.
+        """
+
     def serve(self):
         logging.info("start serving %s", self.name)
         try:
@@ -97,12 +160,17 @@ class ResourceProcess(Process, ResourceMixin):
                         break
                     if not self.enabled:
                         break
-                    if not self.__queue.empty():
-                        r = self.__queue.get()
+                    self.poll(driver)
+                    try:
+                        r = self.__queue.get(timeout=self.serve_timeout)
+                    except queue.Empty:
+                        continue
+                    try:
                         r.dispatch(driver)
-                    time.sleep(self.throttle_time)
+                    finally:
+                        self.__metrics.add(r)
         finally:
-            logging.info("stopped serving %s", self.name)
+            logging.info("stopped serving %s: %s", self.name, self.__metrics)
 
     def run(self):
         while self.running:
@@ -113,4 +181,4 @@ class ResourceProcess(Process, ResourceMixin):
                     logging.error("%s: %s", type(self).__name__, exc)
                     #tb = traceback.format_exc()
                     #self.emit('failed', exc, tb)
-            time.sleep(self.throttle_time)
+            time.sleep(self.serve_timeout)
@@ -1,3 +1,8 @@
+import concurrent.futures
+import logging
+import threading
+import time
+
 import comet
 from comet.resource import ResourceMixin, ResourceError
 from comet.process import ProcessMixin
@@ -6,122 +11,189 @@ from comet.driver.hephy import EnvironmentBox
 from comet.driver.keithley import K707B
 
 class StatusProcess(comet.Process, ResourceMixin, ProcessMixin):
-    """Reload instruments status."""
-
-    def __init__(self, message=None, progress=None, **kwargs):
+    """Reload instruments status.
+
+    Instruments are read concurrently, results are stored and an `updated`
+    event is emitted as soon as every single read finished. Reads not
+    finished within `deadline` are reported as unavailable and keep running
+    in the background, an instrument is skipped by the next refresh until
+    its previous read finished. Identifications are cached for
+    `cache_timeout` seconds.
+    """
+
+    deadline = 10.0
+    """Global timeout in seconds for all reads of a refresh, measured from
+    submitting the reads. Every read runs in its own worker thread, so all
+    reads start together and share the same deadline.
+    """
+
+    cache_timeout = 30.0
+    """Time in seconds to keep instrument identifications cached."""
+
+    def __init__(self, message=None, progress=None, updated=None, **kwargs):
         super().__init__(**kwargs)
         self.message = message
         self.progress = progress
+        self.updated = updated
+        self.__cache = {}
+        self.__cache_lock = threading.Lock()
+        self.__in_flight = {}
+
+    def cached_identification(self, name, query):
+        """Return cached identification of resource or call `query` if cache
+        expired."""
+        with self.__cache_lock:
+            timestamp, model = self.__cache.get(name, (0., None))
+        if model and time.monotonic() - timestamp < self.cache_timeout:
+            return model
+        model = query()
+        with self.__cache_lock:
+            self.__cache[name] = time.monotonic(), model
+        return model
+
+    def clear_cache(self):
+        with self.__cache_lock:
+            self.__cache.clear()
 
     def read_matrix(self):
-        self.set("matrix_model", "")
-        self.set("matrix_channels", "")
+        result = {"matrix_model": "", "matrix_channels": ""}
         try:
             with self.resources.get("matrix") as matrix_res:
                 matrix = K707B(matrix_res)
-                model = matrix.identification
-                self.set("matrix_model", model)
+                model = self.cached_identification("matrix", lambda: matrix.identification)
+                result["matrix_model"] = model
                 channels = matrix.channel.getclose()
-                self.set("matrix_channels", ','.join(channels))
+                result["matrix_channels"] = ','.join(channels)
         except (ResourceError, OSError):
             pass
+        return result
 
     def read_hvsrc(self):
-        self.set("hvsrc_model", "")
+        result = {"hvsrc_model": ""}
         try:
             with self.resources.get("hvsrc") as hvsrc_res:
-                model = hvsrc_res.query("*IDN?")
-                self.set("hvsrc_model", model)
+                model = self.cached_identification("hvsrc", lambda: hvsrc_res.query("*IDN?"))
+                result["hvsrc_model"] = model
         except (ResourceError, OSError):
             pass
+        return result
 
     def read_vsrc(self):
-        self.set("vsrc_model", "")
+        result = {"vsrc_model": ""}
         try:
             with self.resources.get("vsrc") as vsrc_res:
-                model = vsrc_res.query("*IDN?")
-                self.set("vsrc_model", model)
+                model = self.cached_identification("vsrc", lambda: vsrc_res.query("*IDN?"))
+                result["vsrc_model"] = model
         except (ResourceError, OSError):
             pass
+        return result
 
     def read_lcr(self):
-        self.set("lcr_model", "")
+        result = {"lcr_model": ""}
         try:
             with self.resources.get("lcr") as lcr_res:
-                model = lcr_res.query("*IDN?")
-                self.set("lcr_model", model)
+                model = self.cached_identification("lcr", lambda: lcr_res.query("*IDN?"))
+                result["lcr_model"] = model
         except (ResourceError, OSError):
             pass
+        return result
 
     def read_elm(self):
-        self.set("elm_model", "")
+        result = {"elm_model": ""}
         try:
             with self.resources.get("elm") as elm_res:
-                model = elm_res.query("*IDN?")
-                self.set("elm_model", model)
+                model = self.cached_identification("elm", lambda: elm_res.query("*IDN?"))
+                result["elm_model"] = model
         except (ResourceError, OSError):
             pass
+        return result
 
     def read_table(self):
-        self.set("table_model", "")
-        self.set("table_state", "")
+        result = {"table_model": "", "table_state": ""}
         if not self.get("use_table", False):
-            return
+            return result
         try:
             table_process = self.processes.get("table")
             model = table_process.get_identification().get(timeout=5.0)
             caldone = table_process.get_caldone().get(timeout=5.0)
-            self.set("table_model", model)
+            result["table_model"] = model
             if caldone == (3, 3, 3):
                 state = f"CALIBRATED"
             else:
                 state = f"NOT CALIBRATED"
-            self.set("table_state", state)
+            result["table_state"] = state
         except (ResourceError, OSError):
             pass
+        return result
 
     def read_environ(self):
-        self.set("env_model", "")
-        self.set("env_pc_data", None)
+        result = {"env_model": "", "env_pc_data": None}
         if not self.get("use_environ", False):
-            return
+            return result
         try:
             with self.processes.get("environ") as environment:
-                model = environment.identification()
-                self.set("env_model", model)
+                model = self.cached_identification("environ", environment.identification)
+                result["env_model"] = model
                 pc_data = environment.pc_data()
-                self.set("env_pc_data", pc_data)
+                result["env_pc_data"] = pc_data
         except (ResourceError, OSError):
             pass
+        return result
 
     def run(self):
-        self.emit("message", "Reading Matrix...")
-        self.emit("progress", 0, 7)
-        self.read_matrix()
-
-        self.emit("message", "Reading HVSource...")
-        self.emit("progress", 1, 7)
-        self.read_hvsrc()
-
-        self.emit("message", "Read VSource...")
-        self.emit("progress", 2, 7)
-        self.read_vsrc()
-
-        self.emit("message", "Read LCRMeter...")
-        self.emit("progress", 3, 7)
-        self.read_lcr()
-
-        self.emit("message", "Read Electrometer...")
-        self.emit("progress", 4, 7)
-        self.read_elm()
-
-        self.emit("message", "Read Table...")
-        self.emit("progress", 5, 7)
-        self.read_table()
+        readers = {
+            "Matrix": self.read_matrix,
+            "HVSource": self.read_hvsrc,
+            "VSource": self.read_vsrc,
+            "LCRMeter": self.read_lcr,
+            "Electrometer": self.read_elm,
+            "Table": self.read_table,
+            "Environment Box": self.read_environ
+        }
+        # Reset all values
+        for key in ("matrix_model", "matrix_channels", "hvsrc_model",
+                    "vsrc_model", "lcr_model", "elm_model", "table_model",
+                    "table_state", "env_model"):
+            self.set(key, "")
+        self.set("env_pc_data", None)
 
-        self.emit("message", "Read Environment Box...")
-        self.emit("progress", 6, 7)
-        self.read_environ()
+        self.emit("message", "Reading instruments...")
+        self.emit("progress", 0, len(readers))
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(readers), thread_name_prefix="status")
+        futures = {}
+        completed = 0
+        for name, reader in readers.items():
+            # Do not overlap a previous read still using the instrument
+            previous = self.__in_flight.get(name)
+            if previous is not None and not previous.done():
+                logging.warning("skip read %s status, previous read still running", name)
+                completed += 1
+                continue
+            futures[executor.submit(reader)] = name
+        try:
+            for future in concurrent.futures.as_completed(futures, timeout=self.deadline):
+                name = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    logging.error("failed to read %s status: %s", name, exc)
+                else:
+                    for key, value in result.items():
+                        self.set(key, value)
+                completed += 1
+                self.emit("message", f"Read {name}.")
+                self.emit("progress", completed, len(readers))
+                self.emit("updated")
+        except concurrent.futures.TimeoutError:
+            for future, name in futures.items():
+                if not future.done():
+                    logging.warning("read %s status exceeded refresh deadline of %.1f s", name, self.deadline)
+        finally:
+            for future, name in futures.items():
+                self.__in_flight[name] = future
+            # Do not wait for reads exceeding the deadline
+            executor.shutdown(wait=False)
 
         self.emit("message", "")
-        self.emit("progress", 7, 7)
+        self.emit("progress", len(readers), len(readers))
@@ -1,6 +1,8 @@
 """Table control process."""
 
+import itertools
 import logging
+import queue
 import time
 import threading
 import traceback
@@ -23,6 +25,24 @@ AXIS_NAMES = {
 
 RETRIES = 180
 
+PRIORITY_HIGH = 0
+PRIORITY_STATUS = 1
+
+def estimate_move_time(distance, velocity, acceleration):
+    """Return estimated duration in seconds of a move over `distance` with
+    trapezoidal velocity profile.
+
+    >>> estimate_move_time(10000, 10000, 20000)
+    1.5
+    """
+    distance = abs(distance)
+    if velocity <= 0 or acceleration <= 0:
+        return 0.
+    # Distance too short to reach full velocity
+    if distance < velocity ** 2 / acceleration:
+        return 2 * (distance / acceleration) ** 0.5
+    return distance / velocity + velocity / acceleration
+
 class TableError(Exception): pass
 
 class TableMachineError(Exception): pass
@@ -91,6 +111,16 @@ def async_request(method):
         return r
     return async_request
 
+def status_request(method):
+    """Low priority request, a pending request of the same method is returned
+    instead of queueing a duplicate.
+    """
+    def status_request(self, *args, **kwargs):
+        def wrapper(context):
+            return method(self, context, *args, **kwargs)
+        return self.append_status_request(method.__name__, wrapper)
+    return status_request
+
 class ResourceRequest:
 
     def __init__(self, callback):
@@ -152,23 +182,50 @@ class TableProcess(comet.Process, ResourceMixin):
         """Overwrite with custom table control sequence."""
 
 class AlternateTableProcess(TableProcess):
-    """Table control process."""
+    """Table control process.
+
+    Requests are executed by priority, moves and commands rank above status
+    requests. Pending status requests are coalesced. Stopping the current
+    action does not queue but interrupts the running request.
+    """
 
     update_interval = 1.0
-    throttle_interval = .025
 
     maximum_z = 23.800
 
+    motion_poll_interval = .050
+    """Poll interval in seconds after the estimated move duration elapsed."""
+
+    motion_estimate_ratio = .8
+    """Fraction of the estimated move duration to wait before polling."""
+
+    motion_timeout = RETRIES * 1.0
+    """Timeout in seconds for a single move phase."""
+
+    motion_settle_time = .500
+    """Time in seconds to poll the position after axes report idle."""
+
+    default_velocity = 1000.
+    """Fallback velocity in table units per second."""
+
+    default_acceleration = 1000.
+    """Fallback acceleration in table units per square second."""
+
     def __init__(self, message_changed=None, progress_changed=None,
                  position_changed=None, caldone_changed=None, joystick_changed=None,
                  relative_move_finished=None, absolute_move_finished=None,
                  calibration_finished=None, stopped=None, **kwargs):
         super().__init__(**kwargs)
-        self.__lock = threading.RLock()
-        self.__queue = []
+        self.__queue = queue.PriorityQueue()
+        self.__sequence = itertools.count()
+        self.__pending = {}
+        self.__pending_lock = threading.Lock()
+        self.__idle = threading.Event()
+        self.__idle.set()
         self.__cached_position = float('nan'), float('nan'), float('nan')
         self.__cached_caldone = float('nan'), float('nan'), float('nan')
         self.__stop_event = threading.Event()
+        self.motion_timings = []
         self.enabled = False
         self.message_changed = message_changed
         self.progress_changed = progress_changed
@@ -198,11 +255,92 @@ class AlternateTableProcess(TableProcess):
         return self.__cached_caldone
 
     def wait(self):
-        with self.__lock:
-            return True
+        """Wait until current request finished."""
+        self.__idle.wait()
+        return True
+
+    def append_request(self, request, priority=PRIORITY_HIGH):
+        # Sequence number keeps order of requests with same priority
+        self.__queue.put((priority, next(self.__sequence), request))
+
+    def append_status_request(self, key, callback):
+        """Queue status request or return pending request of same `key`."""
+        with self.__pending_lock:
+            request = self.__pending.get(key)
+            if request is None:
+                request = ResourceRequest(callback)
+                self.__pending[key] = request
+                self.append_request(request, PRIORITY_STATUS)
+            return request
+
+    def _discard_pending(self, request):
+        with self.__pending_lock:
+            for key, pending in list(self.__pending.items()):
+                if pending is request:
+                    del self.__pending[key]
+
+    def _clear_requests(self):
+        while True:
+            try:
+                _, _, request = self.__queue.get_nowait()
+            except queue.Empty:
+                break
+            self._discard_pending(request)
 
-    def append_request(self, request):
-        self.__queue.append(request)
+    def _get_motion_profile(self, table):
+        """Return velocity and acceleration in table units.
+
+        The controller reports velocity (`getvel`) and acceleration
+        (`getaccel`) in the configured axis unit (micron, the table unit) per
+        second and per square second, matching the distances in table units
+        passed to `estimate_move_time`. Invalid values fall back to defaults.
+        The estimate only delays polling, it never fails a move.
+        """
+        try:
+            velocity = float(table.resource.query("getvel"))
+            acceleration = float(table.resource.query("getaccel"))
+        except Exception as exc:
+            logging.warning("failed to read table velocity: %s", exc)
+            velocity, acceleration = self.default_velocity, self.default_acceleration
+        if not velocity > 0 or not acceleration > 0:
+            logging.warning("invalid table velocity %s or acceleration %s", velocity, acceleration)
+            velocity, acceleration = self.default_velocity, self.default_acceleration
+        return velocity, acceleration
+
+    def _wait_motion(self, table, phase, estimate, done, handle_abort, update_status):
+        """Wait for move to finish, sleeping for most of the estimated
+        duration before polling position and status at a fine interval.
+
+        Returns current position on success, or once the axes stopped moving
+        and the position did not reach the target within
+        `motion_settle_time` seconds.
+        """
+        t0 = time.monotonic()
+        # Abortable sleep for most of the estimated duration
+        self.__stop_event.wait(min(self.motion_timeout, estimate * self.motion_estimate_ratio))
+        threshold = t0 + self.motion_timeout
+        settle_threshold = None
+        while True:
+            handle_abort()
+            current_pos = table.pos
+            update_status(*current_pos)
+            if done(current_pos):
+                break
+            now = time.monotonic()
+            if now > threshold:
+                break
+            if settle_threshold is None:
+                # Bit 0 is set while executing a command
+                if not int(table.status) & 0x1:
+                    # Position might settle after the axes report idle
+                    settle_threshold = now + self.motion_settle_time
+            elif now > settle_threshold:
+                break
+            time.sleep(self.motion_poll_interval)
+        elapsed = time.monotonic() - t0
+        self.motion_timings.append((phase, estimate, elapsed))
+        logging.info("table %s: estimated %.3f s, elapsed %.3f s", phase, estimate, elapsed)
+        return current_pos
 
     def _get_position(self, table):
         self.__cached_position = float('nan'), float('nan'), float('nan')
@@ -216,7 +354,7 @@ class AlternateTableProcess(TableProcess):
         self.__cached_caldone = x, y, z
         return x, y, z
 
-    @async_request
+    @status_request
     def status(self, table):
         x, y, z = self._get_position(table)
         self.emit('position_changed', x, y, z)
@@ -224,17 +362,17 @@ class AlternateTableProcess(TableProcess):
         self.emit('caldone_changed', x, y, z)
         self.emit('joystick_changed', table.joystick)
 
-    @async_request
+    @status_request
     def position(self, table):
         x, y, z = self._get_position(table)
         self.emit('position_changed', x, y, z)
 
-    @async_request
+    @status_request
     def caldone(self, table):
         x, y, z = self._get_caldone(table)
         self.emit('caldone_changed', x, y, z)
 
-    @async_request
+    @status_request
     def joystick(self, table):
         self.emit('joystick_changed', table.joystick)
 
@@ -289,8 +427,8 @@ class AlternateTableProcess(TableProcess):
         y = to_table_unit(y)
         z = to_table_unit(z)
 
-        retries = RETRIES
-        delay = 1.0
+        self.motion_timings.clear()
+        velocity, acceleration = self._get_motion_profile(table)
 
         error_handler = TableErrorHandler(table)
 
@@ -319,15 +457,10 @@ class AlternateTableProcess(TableProcess):
         self.emit("message_changed", "Retreating Z axis...")
 
         # Moving into limit switch generates error 1004
-        table.rmove(0, 0, -AXIS_OFFSET)
-        for i in range(retries):
-            handle_abort()
-            current_pos = table.pos
-            update_status(*current_pos)
-            if current_pos[2] == 0:
-                break
-            time.sleep(delay)
         current_pos = table.pos
+        estimate = estimate_move_time(current_pos[2], velocity, acceleration)
+        table.rmove(0, 0, -AXIS_OFFSET)
+        current_pos = self._wait_motion(table, "retreat Z", estimate, lambda pos: pos[2] == 0, handle_abort, update_status)
         if current_pos[2] != 0:
             raise RuntimeError(f"failed to relative move, current pos: {current_pos}")
         # Clear error 1004
@@ -341,29 +474,18 @@ class AlternateTableProcess(TableProcess):
 
         self.emit("progress_changed", 2, 4)
         self.emit("message_changed", "Move X Y axes...")
+        distance = max(abs(x - current_pos[0]), abs(y - current_pos[1]))
+        estimate = estimate_move_time(distance, velocity, acceleration)
         table.move(x, y, 0)
-        for i in range(retries):
-            handle_abort()
-            current_pos = table.pos
-            update_status(*current_pos)
-            if current_pos[:2] == (x, y):
-                break
-            time.sleep(delay)
-        current_pos = table.pos
+        current_pos = self._wait_motion(table, "move XY", estimate, lambda pos: pos[:2] == (x, y), handle_abort, update_status)
         if current_pos[:2] != (x, y):
             raise RuntimeError(f"failed to absolute move, current pos: {current_pos}")
 
         self.emit("progress_changed", 3, 4)
         self.emit("message_changed", "Move up Z axis...")
+        estimate = estimate_move_time(z, velocity, acceleration)
         table.rmove(0, 0, z)
-        for i in range(retries):
-            handle_abort()
-            current_pos = table.pos
-            update_status(*current_pos)
-            if current_pos[2] >= z:
-                break
-            time.sleep(delay)
-        current_pos = table.pos
+        current_pos = self._wait_motion(table, "move up Z", estimate, lambda pos: pos[2] >= z, handle_abort, update_status)
         if current_pos != (x, y, z):
             raise RuntimeError(f"failed to relative move, current pos: {current_pos}")
 
@@ -599,29 +721,34 @@ class AlternateTableProcess(TableProcess):
         self.emit("calibration_finished")
 
     def event_loop(self, context):
-        t = time.time()
+        t = time.monotonic()
         while self.running:
-            with self.__lock:
+            # Block until next request or periodic status update
+            timeout = max(0., t + self.update_interval - time.monotonic())
+            try:
+                _, _, request = self.__queue.get(timeout=timeout)
+            except queue.Empty:
                 if self.enabled:
-                    if self.__queue:
-                        request = self.__queue.pop(0)
-                        try:
-                            request(context)
-                        except comet.StopRequest:
-                            self.emit('message_changed', "Stopped.")
-                            self.emit('stopped')
-                        except Exception as exc:
-                            self.emit('message_changed', exc)
-                            tb = traceback.format_exc()
-                            self.emit('failed', exc, tb)
-                            self.emit('stopped')
-                            raise
-                    else:
-                        if time.time() > t + self.update_interval:
-                            self.position()
-                            self.caldone()
-                            self.joystick()
-                            t = time.time()
-                else:
-                    self.__queue.clear()
-            time.sleep(self.throttle_interval)
+                    self.position()
+                    self.caldone()
+                    self.joystick()
+                t = time.monotonic()
+                continue
+            self._discard_pending(request)
+            if not self.enabled:
+                self._clear_requests()
+                continue
+            self.__idle.clear()
+            try:
+                request(context)
+            except comet.StopRequest:
+                self.emit('message_changed', "Stopped.")
+                self.emit('stopped')
+            except Exception as exc:
+                self.emit('message_changed', exc)
+                tb = traceback.format_exc()
+                self.emit('failed', exc, tb)
+                self.emit('stopped')
+                raise
+            finally:
+                self.__idle.set()
@@ -0,0 +1,151 @@
+"""Slew rate limited source ramps."""
+
+import math
+import time
+
+__all__ = ['Ramp']
+
+class Ramp:
+    """Iterable source ramp from `begin` to `end` (both inclusive) limited by
+    maximum `step` and optional `slew_rate` (units per second).
+
+    Without slew rate every step lasts `delay` seconds (legacy ramp). With
+    slew rate the step size is reduced to `slew_rate * delay` if smaller, and
+    every step lasts `step / slew_rate` seconds, but at least `delay`.
+
+    Call `wait` after applying a value, it sleeps for the remainder of the
+    step period, time spent by the caller is subtracted.
+
+    If `current_slope` (A/s) and `read_current` are provided, the current is
+    read on every step. Exceeding the slope halves the step size (reducing the
+    effective slew rate), otherwise it recovers step by step.
+
+    If `sweep` is provided, up to `sweep_size` steps are offloaded to the
+    instrument by calling `sweep(values, period)` which must return the list
+    of current readings, stopping early on compliance. Only the last sourced
+    value of every chunk is yielded.
+
+    >>> ramp = Ramp(0, 100, 10, delay=.1, slew_rate=50)
+    >>> for voltage in ramp:
+    ...     hvsrc.set_source_voltage(voltage)
+    ...     ramp.wait()
+    """
+
+    minimum_factor = 1 / 16
+    """Minimum step size factor applied by the current slope guard."""
+
+    def __init__(self, begin, end, step, delay=0.0, slew_rate=None,
+                 current_slope=None, read_current=None, sweep=None,
+                 sweep_size=25, clock=time.monotonic, sleep=time.sleep):
+        self.begin = float(begin)
+        self.end = float(end)
+        self.maximum_step = abs(float(step))
+        self.delay = max(0., float(delay))
+        self.slew_rate = abs(float(slew_rate)) if slew_rate else None
+        self.current_slope = abs(float(current_slope)) if current_slope else None
+        self.read_current = read_current
+        self.sweep = sweep
+        self.sweep_size = max(1, int(sweep_size))
+        self.clock = clock
+        self.sleep = sleep
+        self.factor = 1.0
+        self.throttled = 0
+        self.__timestamp = None
+        self.__sweeping = False
+        self.__last_current = None
+
+    @property
+    def step(self):
+        """Step size, excluding current slope guard reduction."""
+        if self.slew_rate:
+            return min(self.maximum_step, self.slew_rate * self.delay) or self.maximum_step
+        return self.maximum_step
+
+    @property
+    def period(self):
+        """Duration of a single step in seconds."""
+        if self.slew_rate:
+            return max(self.delay, self.step / self.slew_rate)
+        return self.delay
+
+    @property
+    def count(self):
+        """Number of values without current slope guard reduction."""
+        if not self.step:
+            return 1
+        return int(math.ceil(abs(self.end - self.begin) / self.step - 1e-9)) + 1
+
+    def estimate(self):
+        """Return estimated ramp duration in seconds without current slope
+        guard reduction.
+        """
+        return self.count * self.period
+
+    def __next_value(self, value, direction):
+        value += self.step * self.factor * direction
+        if (self.end - value) * direction < 1e-12 * max(1., abs(self.end)):
+            value = self.end
+        return value
+
+    def __done(self, value):
+        return value == self.end or not self.maximum_step
+
+    def update_slope(self, slope):
+        """Apply current slope guard to measured slope in A/s."""
+        if self.current_slope is None:
+            return
+        if slope > self.current_slope:
+            self.factor = max(self.minimum_factor, self.factor / 2)
+            self.throttled += 1
+        else:
+            self.factor = min(1.0, self.factor * 2)
+
+    def update_current(self, timestamp, current):
+        """Apply current slope guard to a new reading."""
+        if self.__last_current is not None:
+            previous_timestamp, previous_current = self.__last_current
+            dt = timestamp - previous_timestamp
+            if dt > 0:
+                self.update_slope(abs(current - previous_current) / dt)
+        self.__last_current = timestamp, current
+
+    def wait(self):
+        """Wait for the remainder of the current step period."""
+        if self.__sweeping:
+            return
+        if self.current_slope is not None and self.read_current is not None:
+            self.update_current(self.clock(), self.read_current())
+        if self.__timestamp is not None:
+            remaining = self.period - (self.clock() - self.__timestamp)
+            if remaining > 0:
+                self.sleep(remaining)
+
+    def __iter__(self):
+        direction = 1. if self.end >= self.begin else -1.
+        value = self.begin
+        self.__sweeping = False
+        self.__timestamp = self.clock()
+        yield value
+        while not self.__done(value):
+            if self.sweep is not None:
+                values = []
+                next_value = value
+                while len(values) < self.sweep_size and not self.__done(next_value):
+                    next_value = self.__next_value(next_value, direction)
+                    values.append(next_value)
+                period = self.period
+                readings = list(self.sweep(values, period))
+                if len(readings) > 1 and period > 0:
+                    slopes = [abs(b - a) / period for a, b in zip(readings[:-1], readings[1:])]
+                    self.update_slope(max(slopes))
+                self.__sweeping = True
+                if len(readings) < len(values):
+                    # Stopped early, yield last sourced value and finish
+                    yield values[len(readings) - 1] if readings else value
+                    return
+                value = values[-1]
+            else:
+                self.__sweeping = False
+                value = self.__next_value(value, direction)
+            self.__timestamp = self.clock()
+            yield value
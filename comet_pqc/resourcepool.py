@@ -0,0 +1,179 @@
+"""Persistent instrument connection pool."""
+
+import logging
+import threading
+import time
+
+from .shadowstate import ShadowState
+
+__all__ = ['ResourcePool', 'PoolMetrics']
+
+class PoolMetrics:
+    """Connection pool counters."""
+
+    def __init__(self):
+        self.opened = 0
+        self.reused = 0
+        self.reconnected = 0
+        self.health_checks = 0
+        self.failures = 0
+
+    def __str__(self):
+        return (
+            f"opened: {self.opened}, reused: {self.reused}, "
+            f"reconnected: {self.reconnected}, health checks: {self.health_checks}, "
+            f"failures: {self.failures}"
+        )
+
+class PooledResource:
+    """Context manager returning a persistent connection of a pooled
+    resource. Leaving the context keeps the connection open, unless a
+    connection error occurred.
+    """
+
+    def __init__(self, pool, name):
+        self.pool = pool
+        self.name = name
+
+    def __enter__(self):
+        return self.pool.acquire(self.name)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.pool.release(self.name, exc_value)
+        return False
+
+class ResourcePool:
+    """Keeps instrument connections open across measurements.
+
+    Resources listed in `names` are opened on first use and kept open until
+    `close` is called, all other resources are passed through to the
+    underlying registry. Connections idle for longer than `health_interval`
+    seconds are verified by `health_query` before reuse and transparently
+    reopened if the query raises one of `connection_errors`. A connection
+    error raised inside a context closes the connection, the next request
+    reconnects. Every resource has a shadow state of its configuration,
+    invalidated whenever the connection is opened or closed. Instrument
+    features found unsupported are kept in `unsupported_features` for the
+    lifetime of the pool.
+
+    >>> pool = ResourcePool(resources, ["hvsrc"], connection_errors=(OSError,))
+    >>> with pool.get("hvsrc") as hvsrc:
+    ...     hvsrc.query("*IDN?")
+    >>> pool.close()
+    """
+
+    health_query = "*OPC?"
+
+    health_interval = 5.0
+
+    def __init__(self, resources, names, connection_errors=(OSError,)):
+        self.resources = resources
+        self.names = tuple(names)
+        self.connection_errors = tuple(connection_errors)
+        self.metrics = PoolMetrics()
+        self.__connections = {}
+        self.__released = {}
+        self.__locks = {name: threading.RLock() for name in self.names}
+        self.__depth = {}
+        self.__states = {name: ShadowState() for name in self.names}
+        self.unsupported_features = set()
+
+    def is_connection_error(self, exc):
+        """Return `True` if exception (or wrapped exception `exc.exc` of a
+        resource error) is a connection error.
+        """
+        if exc is None:
+            return False
+        return isinstance(exc, self.connection_errors) or \
+            isinstance(getattr(exc, 'exc', None), self.connection_errors)
+
+    def shadow_state(self, name):
+        """Return shadow state of resource `name`."""
+        return self.__states[name]
+
+    def invalidate_shadow_states(self):
+        for state in self.__states.values():
+            state.invalidate()
+
+    def get(self, name):
+        """Return context manager for resource `name`."""
+        if name not in self.names:
+            return self.resources.get(name)
+        return PooledResource(self, name)
+
+    def __open(self, name):
+        resource = self.resources.get(name)
+        context = resource.__enter__()
+        self.__connections[name] = resource, context
+        self.__states[name].invalidate()
+        self.metrics.opened += 1
+        logging.info("resource pool: opened %s", name)
+        return context
+
+    def __close(self, name):
+        resource, context = self.__connections.pop(name, (None, None))
+        self.__states[name].invalidate()
+        if resource is not None:
+            try:
+                resource.__exit__(None, None, None)
+            except Exception as exc:
+                logging.warning("resource pool: failed to close %s: %s", name, exc)
+            logging.info("resource pool: closed %s", name)
+
+    def __health_check(self, name, context):
+        released = self.__released.get(name, 0.)
+        if time.monotonic() - released < self.health_interval:
+            return True
+        self.metrics.health_checks += 1
+        try:
+            context.query(self.health_query)
+        except Exception as exc:
+            if not self.is_connection_error(exc):
+                raise
+            logging.warning("resource pool: health check failed for %s: %s", name, exc)
+            return False
+        return True
+
+    def acquire(self, name):
+        """Return open connection for resource `name`, blocks while resource
+        is used by another thread.
+        """
+        lock = self.__locks[name]
+        lock.acquire()
+        try:
+            depth = self.__depth.get(name, 0)
+            if name in self.__connections:
+                resource, context = self.__connections[name]
+                if depth or self.__health_check(name, context):
+                    self.metrics.reused += 1
+                else:
+                    self.__close(name)
+                    self.metrics.reconnected += 1
+                    context = self.__open(name)
+            else:
+                context = self.__open(name)
+            self.__depth[name] = depth + 1
+            return context
+        except Exception:
+            lock.release()
+            raise
+
+    def release(self, name, exc=None):
+        """Release resource `name`, closes connection on connection error."""
+        lock = self.__locks[name]
+        try:
+            self.__depth[name] = max(0, self.__depth.get(name, 0) - 1)
+            if self.is_connection_error(exc):
+                self.metrics.failures += 1
+                logging.warning("resource pool: connection error on %s: %s", name, exc)
+                self.__close(name)
+            self.__released[name] = time.monotonic()
+        finally:
+            lock.release()
+
+    def close(self):
+        """Close all pooled connections."""
+        for name in self.names:
+            with self.__locks[name]:
+                self.__close(name)
+                self.__depth.pop(name, None)
@@ -0,0 +1,135 @@
+"""Contact visit order optimization."""
+
+import math
+
+__all__ = [
+    'travel_distance',
+    'travel_time',
+    'nearest_neighbour',
+    'two_opt',
+    'plan_route',
+    'RouteReport'
+]
+
+def travel_distance(a, b):
+    """Return euclidean XY distance between two positions."""
+    return math.hypot(b[0] - a[0], b[1] - a[1])
+
+def travel_time(a, b, velocity=10.0):
+    """Return XY move duration, X and Y axes are moving simultaneously."""
+    return max(abs(b[0] - a[0]), abs(b[1] - a[1])) / velocity
+
+def path_cost(positions, order, start=None, cost=travel_time):
+    """Return total cost of visiting positions in order, starting from
+    optional start position.
+    """
+    points = [positions[index] for index in order]
+    if start is not None:
+        points.insert(0, start)
+    return sum(cost(a, b) for a, b in zip(points[:-1], points[1:]))
+
+def nearest_neighbour(positions, start=None, cost=travel_time):
+    """Return visit order using the nearest neighbour heuristic.
+
+    >>> nearest_neighbour([(0, 0), (9, 0), (1, 0)])
+    [0, 2, 1]
+    """
+    remaining = list(range(len(positions)))
+    order = []
+    if start is None and remaining:
+        order.append(remaining.pop(0))
+    current = start if start is not None else (positions[order[0]] if order else None)
+    while remaining:
+        index = min(remaining, key=lambda index: cost(current, positions[index]))
+        remaining.remove(index)
+        order.append(index)
+        current = positions[index]
+    return order
+
+def two_opt(positions, order, start=None, cost=travel_time, max_iterations=100):
+    """Improve open path visit order by reversing segments (2-opt)."""
+    order = list(order)
+    best = path_cost(positions, order, start, cost)
+    # Without start position the first position is fixed
+    first = 0 if start is not None else 1
+    for _ in range(max_iterations):
+        improved = False
+        for i in range(first, len(order) - 1):
+            for j in range(i + 1, len(order)):
+                candidate = order[:i] + order[i:j + 1][::-1] + order[j + 1:]
+                candidate_cost = path_cost(positions, candidate, start, cost)
+                if candidate_cost < best - 1e-9:
+                    order, best = candidate, candidate_cost
+                    improved = True
+        if not improved:
+            break
+    return order
+
+def plan_route(positions, pinned=(), start=None, cost=travel_time):
+    """Return optimized visit order of positions.
+
+    Pinned indices keep their place in the sequence, positions in between are
+    reordered starting from the previous pinned position (or `start`).
+
+    >>> plan_route([(0, 0), (9, 0), (1, 0), (2, 0)], pinned=[0])
+    [0, 2, 3, 1]
+    """
+    pinned = set(pinned)
+    order = []
+    segment = []
+    current = start
+
+    def flush(segment, current):
+        points = [positions[index] for index in segment]
+        local = nearest_neighbour(points, current, cost)
+        local = two_opt(points, local, current, cost)
+        return [segment[index] for index in local]
+
+    for index in range(len(positions)):
+        if index in pinned:
+            if segment:
+                segment = flush(segment, current)
+                order.extend(segment)
+                current = positions[segment[-1]]
+                segment = []
+            order.append(index)
+            current = positions[index]
+        else:
+            segment.append(index)
+    if segment:
+        order.extend(flush(segment, current))
+    return order
+
+class RouteReport:
+    """Compare travel distance and time of configured and optimized order.
+
+    `move_overhead` is the constant duration in seconds of a single contact
+    move (Z retreat and Z up).
+    """
+
+    def __init__(self, positions, order, start=None, velocity=10.0, move_overhead=0.0):
+        self.positions = positions
+        self.order = order
+        self.start = start
+        self.velocity = velocity
+        self.move_overhead = move_overhead
+
+    def distance(self, order):
+        return path_cost(self.positions, order, self.start, travel_distance)
+
+    def time(self, order):
+        def cost(a, b):
+            return travel_time(a, b, self.velocity)
+        moves = len(order) - (0 if self.start is not None else 1)
+        return path_cost(self.positions, order, self.start, cost) + max(0, moves) * self.move_overhead
+
+    @property
+    def config_order(self):
+        return list(range(len(self.positions)))
+
+    def __str__(self):
+        config_order = self.config_order
+        return (
+            f"config order: {self.distance(config_order):.3f} mm, {self.time(config_order):.1f} s; "
+            f"optimized order: {self.distance(self.order):.3f} mm, {self.time(self.order):.1f} s"
+        )
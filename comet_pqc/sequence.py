@@ -6,11 +6,9 @@ import logging
 from comet import ui
 from comet.settings import SettingsMixin
 from qutie.qutie import QtCore, QtGui
-import yaml
 
-from analysis_pqc import STATUS_PASSED
-
-from .config import load_sequence, list_configs, SEQUENCE_DIR
+from .analysis import analysis_status_passed
+from .config import load_config, load_sequence, list_configs, SEQUENCE_DIR
 
 from .components import PositionsComboBox
 from .components import OperatorWidget
@@ -207,17 +205,12 @@ class SequenceManager(ui.Dialog, SettingsMixin):
         def load_all_sequences():
             configs = []
             for name, filename in list_configs(SEQUENCE_DIR):
-                configs.append((name, filename, True))
+                configs.append((filename, True))
             for filename in list(set(self.settings.get('custom_sequences') or [])):
                 if os.path.exists(filename):
-                    try:
-                        sequence = load_sequence(filename)
-                    except:
-                        pass
-                    else:
-                        configs.append((sequence.name, filename, False))
+                    configs.append((filename, False))
             return configs
-        for name, filename, builtin in load_all_sequences():
+        for filename, builtin in load_all_sequences():
             try:
                 sequence = load_sequence(filename)
                 item = self._sequence_tree.append([sequence.name, '(built-in)' if builtin else filename])
@@ -256,29 +249,28 @@ class SequenceManager(ui.Dialog, SettingsMixin):
         if item is not None:
             self._remove_button.enabled = not item.sequence.builtin
             if os.path.exists(item.sequence.filename):
-                with open(item.sequence.filename) as f:
-                    data = yaml.safe_load(f)
-                    def append(item, key, value):
-                        """Recursively append items."""
-                        if isinstance(value, dict):
-                            child = item.append([key])
-                            for key, value in value.items():
-                                append(child, key, value)
-                        elif isinstance(value, list):
-                            child = item.append([key])
-                            for i, obj in enumerate(value):
-                                if isinstance(obj, dict):
-                                    for key, value in obj.items():
-                                        append(child, key, value)
-                                else:
-                                    append(child, f"[{i}]", obj)
-                            child.expanded = True
-                        else:
-                            item.append([key, value])
-                            item.expanded = True
-                    for key, value in data.items():
-                        append(self._preview_tree, key, value)
-                    self._preview_tree.fit()
+                data = load_config(item.sequence.filename)
+                def append(item, key, value):
+                    """Recursively append items."""
+                    if isinstance(value, dict):
+                        child = item.append([key])
+                        for key, value in value.items():
+                            append(child, key, value)
+                    elif isinstance(value, list):
+                        child = item.append([key])
+                        for i, obj in enumerate(value):
+                            if isinstance(obj, dict):
+                                for key, value in obj.items():
+                                    append(child, key, value)
+                            else:
+                                append(child, f"[{i}]", obj)
+                        child.expanded = True
+                    else:
+                        item.append([key, value])
+                        item.expanded = True
+                for key, value in data.items():
+                    append(self._preview_tree, key, value)
+                self._preview_tree.fit()
 
     def on_add_sequence(self):
         filename = ui.filename_open(filter="YAML files (*.yml, *.yaml);;All files (*)")
@@ -418,7 +410,7 @@ class SequenceTreeItem(ui.TreeItem):
     def quality(self, value):
         # Oh dear...
         value = value or ""
-        if value.lower() == STATUS_PASSED.lower():
+        if value and value.lower() == analysis_status_passed().lower():
             self[3].color = "green"
         else:
             self[3].color = "red"
@@ -602,6 +594,7 @@ class ContactTreeItem(SequenceTreeItem):
         self.id = contact.id
         self.name = contact.name
         self.enabled = contact.enabled
+        self.pinned = contact.pinned
         self.contact_id = contact.contact_id
         self.description = contact.description
         self.reset_position()
@@ -0,0 +1,116 @@
+"""Columnar measurement series storage."""
+
+import numpy as np
+
+__all__ = ['SeriesColumn', 'SeriesTable']
+
+class SeriesColumn:
+    """Growable column of floating point values backed by a NumPy array.
+
+    Appending is amortized O(1), the buffer capacity is doubled on demand.
+
+    >>> column = SeriesColumn()
+    >>> column.append(4.2)
+    >>> column.values
+    array([4.2])
+    """
+
+    initial_capacity = 256
+
+    def __init__(self, capacity=None, dtype=np.float64):
+        self.__buffer = np.empty(max(1, capacity or self.initial_capacity), dtype=dtype)
+        self.__size = 0
+
+    def __len__(self):
+        return self.__size
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def __array__(self, dtype=None, copy=None):
+        # Returns a read-only view unless a copy or another dtype is requested
+        if copy:
+            return np.array(self.values, dtype=dtype)
+        return np.asarray(self.values, dtype=dtype)
+
+    @property
+    def capacity(self):
+        return len(self.__buffer)
+
+    @property
+    def values(self):
+        """Returns a read only array view of the stored values (no copy)."""
+        view = self.__buffer[:self.__size]
+        view.flags.writeable = False
+        return view
+
+    def append(self, value):
+        if self.__size >= len(self.__buffer):
+            self.reserve(2 * len(self.__buffer))
+        self.__buffer[self.__size] = value
+        self.__size += 1
+
+    def reserve(self, capacity):
+        """Grow buffer to hold at least `capacity` values."""
+        if capacity > len(self.__buffer):
+            buffer = np.empty(capacity, dtype=self.__buffer.dtype)
+            buffer[:self.__size] = self.__buffer[:self.__size]
+            self.__buffer = buffer
+
+    def clear(self):
+        self.__size = 0
+
+    def tolist(self):
+        return self.values.tolist()
+
+class SeriesTable(dict):
+    """Dictionary of equally sized series columns with a fixed schema.
+
+    Columns must be registered before the first row is appended.
+
+    >>> table = SeriesTable()
+    >>> table.register('voltage')
+    >>> table.register('current')
+    >>> table.append(voltage=1.0, current=4.2e-9)
+    >>> table.get('current').values
+    array([4.2e-09])
+    """
+
+    Column = SeriesColumn
+
+    def __init__(self):
+        super().__init__()
+        self.__size = 0
+
+    @property
+    def size(self):
+        """Returns number of rows."""
+        return self.__size
+
+    @property
+    def columns(self):
+        return list(self.keys())
+
+    def register(self, key, capacity=None):
+        if key in self:
+            raise KeyError(f"Series already exists: {key}")
+        if self.__size:
+            raise KeyError(f"Unable to register series after appending rows: {key}")
+        self[key] = type(self).Column(capacity)
+
+    def append(self, **kwargs):
+        if kwargs.keys() != self.keys():
+            raise KeyError("Inconsistent series keys")
+        for key, value in kwargs.items():
+            dict.__getitem__(self, key).append(value)
+        self.__size += 1
+
+    def values_of(self, key):
+        """Returns array view of series values, empty array if not registered."""
+        column = self.get(key)
+        if column is None:
+            return np.empty(0, dtype=np.float64)
+        return column.values
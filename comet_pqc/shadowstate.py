@@ -0,0 +1,150 @@
+"""Write-through shadow state of instrument configuration."""
+
+import threading
+
+__all__ = [
+    'scpi_short_form',
+    'scpi_setting',
+    'ShadowState'
+]
+
+RESET_COMMANDS = ('*RST', '*RCL', 'SYST:PRES')
+"""Commands restoring instrument default configuration."""
+
+def scpi_short_form(mnemonic):
+    """Return SCPI short form of a long form mnemonic.
+
+    >>> scpi_short_form('CURRENT')
+    'CURR'
+    >>> scpi_short_form('zcheck')
+    'ZCH'
+    """
+    mnemonic = mnemonic.upper()
+    if len(mnemonic) <= 4:
+        return mnemonic
+    if mnemonic[3] in 'AEIOU':
+        return mnemonic[:3]
+    return mnemonic[:4]
+
+def scpi_setting(message):
+    """Return tuple of normalized header and argument of a SCPI setting
+    command or `None` for queries, common and argumentless commands.
+
+    >>> scpi_setting(':SENSe:CURRent:NPLCycles 5')
+    ('SENS:CURR:NPLC', '5')
+    >>> scpi_setting(':INIT')
+    """
+    message = message.strip()
+    header, _, argument = message.partition(' ')
+    argument = argument.strip()
+    if not argument or header.startswith('*') or header.endswith('?'):
+        return None
+    header = ':'.join(scpi_short_form(node) for node in header.strip(':').split(':'))
+    return header, argument
+
+class ShadowState:
+    """Tracks last written configuration values of an instrument.
+
+    Keys are hierarchical (`.` or `:` separated), writing a key invalidates
+    all keys it is a prefix of or which are a prefix of it (e.g. writing a
+    range disables autorange). `owner` is set by the user to the measurement
+    type which configured the instrument.
+
+    >>> state = ShadowState()
+    >>> state.write('filter.count', 10, lambda: hvsrc.set_filter_count(10))
+    True
+    >>> state.write('filter.count', 10, lambda: hvsrc.set_filter_count(10))
+    False
+    """
+
+    def __init__(self):
+        self.__values = {}
+        self.__lock = threading.RLock()
+        self.owner = None
+        self.written = 0
+        self.skipped = 0
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__values)
+
+    def __contains__(self, key):
+        with self.__lock:
+            return key in self.__values
+
+    def get(self, key, default=None):
+        with self.__lock:
+            return self.__values.get(key, default)
+
+    def changed(self, key, value):
+        """Return `True` if `value` differs from last written value of `key`."""
+        with self.__lock:
+            return key not in self.__values or self.__values[key] != value
+
+    def update(self, key, value, invalidates=()):
+        """Store written value, invalidates related keys."""
+        with self.__lock:
+            for other in list(self.__values):
+                if self.related(key, other) or any(self.related(prefix, other) for prefix in invalidates):
+                    del self.__values[other]
+            self.__values[key] = value
+
+    def invalidate(self, key=None):
+        """Invalidate value of `key` and related keys, or all values if
+        `key` is `None`.
+        """
+        with self.__lock:
+            if key is None:
+                self.__values.clear()
+                self.owner = None
+            else:
+                for other in list(self.__values):
+                    if self.related(key, other):
+                        del self.__values[other]
+
+    def write(self, key, value, write, invalidates=()):
+        """Call `write` if `value` differs from last written value of `key`.
+        Any exception invalidates the whole state. Returns `True` if `write`
+        was called.
+        """
+        with self.__lock:
+            if not self.changed(key, value):
+                self.skipped += 1
+                return False
+            try:
+                write()
+            except Exception:
+                self.invalidate()
+                raise
+            self.update(key, value, invalidates)
+            self.written += 1
+            return True
+
+    def write_message(self, message, write, uncached=()):
+        """Call `write` for SCPI `message` unless it is a setting already
+        written. Reset commands invalidate the whole state. Returns `True`
+        if `write` was called.
+        """
+        header = message.strip().split(' ')[0].strip(':').upper()
+        if header in RESET_COMMANDS:
+            self.invalidate()
+            write()
+            return True
+        setting = scpi_setting(message)
+        if setting is None or setting[0] in uncached:
+            try:
+                write()
+            except Exception:
+                self.invalidate()
+                raise
+            return True
+        return self.write(*setting, write)
+
+    @staticmethod
+    def related(key, other):
+        """Return `True` if one key is a prefix of the other."""
+        def split(key):
+            return tuple(key.replace(':', '.').split('.'))
+        key, other = split(key), split(other)
+        size = min(len(key), len(other))
+        return key[:size] == other[:size]
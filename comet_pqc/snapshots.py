@@ -0,0 +1,77 @@
+"""Timestamped snapshot ring buffer."""
+
+import bisect
+import collections
+import threading
+import time
+
+__all__ = ['SnapshotBuffer']
+
+class SnapshotBuffer:
+    """Thread safe ring buffer of timestamped snapshots.
+
+    >>> buffer = SnapshotBuffer(maxlen=3600)
+    >>> buffer.append(pc_data)
+    >>> buffer.latest()
+    (1612345678.9, pc_data)
+    >>> buffer.value_at(1612345678.0, 'box_temperature')
+    22.4
+    """
+
+    def __init__(self, maxlen=3600):
+        self.__snapshots = collections.deque(maxlen=maxlen)
+        # Parallel timestamps for bisecting without copying snapshots
+        self.__timestamps = collections.deque(maxlen=maxlen)
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__snapshots)
+
+    def append(self, snapshot, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        with self.__lock:
+            self.__snapshots.append((timestamp, snapshot))
+            self.__timestamps.append(timestamp)
+
+    def clear(self):
+        with self.__lock:
+            self.__snapshots.clear()
+            self.__timestamps.clear()
+
+    def latest(self, max_age=None):
+        """Return tuple of timestamp and latest snapshot or `None` if buffer
+        is empty or latest snapshot is older than `max_age` seconds.
+        """
+        with self.__lock:
+            if not self.__snapshots:
+                return None
+            timestamp, snapshot = self.__snapshots[-1]
+        if max_age is not None and time.time() - timestamp > max_age:
+            return None
+        return timestamp, snapshot
+
+    def snapshots(self):
+        """Return list of timestamp and snapshot tuples."""
+        with self.__lock:
+            return list(self.__snapshots)
+
+    def value_at(self, timestamp, key):
+        """Return snapshot attribute `key` linear interpolated to `timestamp`.
+
+        Timestamps outside the buffered range return the first or last value,
+        an empty buffer returns NaN. Current timestamps resolve to the latest
+        snapshot without searching the buffer.
+        """
+        with self.__lock:
+            if not self.__snapshots:
+                return float('nan')
+            if timestamp >= self.__timestamps[-1]:
+                return float(getattr(self.__snapshots[-1][1], key))
+            index = bisect.bisect_right(self.__timestamps, timestamp)
+            if index == 0:
+                return float(getattr(self.__snapshots[0][1], key))
+            (t0, snapshot0), (t1, snapshot1) = self.__snapshots[index - 1], self.__snapshots[index]
+        v0, v1 = float(getattr(snapshot0, key)), float(getattr(snapshot1, key))
+        return v0 + (v1 - v0) * (timestamp - t0) / (t1 - t0)
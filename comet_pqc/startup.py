@@ -0,0 +1,126 @@
+"""Startup import time profiling."""
+
+import builtins
+import importlib.util
+import sys
+import time
+
+__all__ = ['ImportRecord', 'ImportProfiler']
+
+class ImportRecord:
+    """Import time of a single module, `cumulative` includes imports of
+    nested modules, `self_time` excludes them.
+    """
+
+    def __init__(self, name, cumulative, self_time, depth):
+        self.name = name
+        self.cumulative = cumulative
+        self.self_time = self_time
+        self.depth = depth
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r}, cumulative={self.cumulative:.6f}, self_time={self.self_time:.6f})"
+
+class ImportProfiler:
+    """Records import times of modules loaded while active and time stamps of
+    named startup phases.
+
+    >>> profiler = ImportProfiler()
+    >>> profiler.start()
+    >>> import comet
+    >>> profiler.mark("window")
+    >>> profiler.stop()
+    >>> print(profiler.report())
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.records = []
+        self.marks = []
+        self.__origin = None
+        self.__import = None
+        self.__stack = []
+
+    @property
+    def active(self):
+        return self.__import is not None
+
+    def start(self):
+        """Start recording imports."""
+        if self.active:
+            return
+        self.__origin = self.clock()
+        self.__import = builtins.__import__
+        builtins.__import__ = self.__profile_import
+
+    def stop(self):
+        """Stop recording imports."""
+        if not self.active:
+            return
+        builtins.__import__, self.__import = self.__import, None
+
+    def mark(self, name):
+        """Record time of startup phase `name` relative to start."""
+        if self.__origin is not None:
+            self.marks.append((name, self.clock() - self.__origin))
+
+    def __profile_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        module_name = self.__pending_module(self.__resolve_name(name, globals, level), fromlist)
+        if module_name is None:
+            return self.__import(name, globals, locals, fromlist, level)
+        self.__stack.append(0.0)
+        t0 = self.clock()
+        try:
+            return self.__import(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = self.clock() - t0
+            nested = self.__stack.pop()
+            if self.__stack:
+                self.__stack[-1] += cumulative
+            self.records.append(ImportRecord(
+                name=module_name,
+                cumulative=cumulative,
+                self_time=max(0.0, cumulative - nested),
+                depth=len(self.__stack)
+            ))
+
+    @staticmethod
+    def __pending_module(name, fromlist):
+        # Return name of module to be loaded by an import or None
+        module = sys.modules.get(name)
+        if module is None:
+            return name
+        for item in fromlist or ():
+            if item != '*' and not hasattr(module, item):
+                return f"{name}.{item}"
+        return None
+
+    @staticmethod
+    def __resolve_name(name, globals, level):
+        if not level:
+            return name
+        package = (globals or {}).get('__package__') or ''
+        try:
+            return importlib.util.resolve_name('.' * level + name, package)
+        except (ImportError, ValueError):
+            return name
+
+    @property
+    def total(self):
+        """Total time spent in top level imports."""
+        return sum(record.cumulative for record in self.records if not record.depth)
+
+    def slowest(self, limit=20):
+        """Return list of `limit` records with highest self time."""
+        records = sorted(self.records, key=lambda record: record.self_time, reverse=True)
+        return records[:limit]
+
+    def report(self, limit=20):
+        """Return startup profiling report."""
+        lines = [f"imported {len(self.records)} modules in {self.total:.3f}s"]
+        for name, timestamp in self.marks:
+            lines.append(f"{name}: {timestamp:.3f}s")
+        lines.append(f"{'self [s]':>10} {'cumulative [s]':>15}  module")
+        for record in self.slowest(limit):
+            lines.append(f"{record.self_time:10.3f} {record.cumulative:15.3f}  {record.name}")
+        return "\n".join(lines)
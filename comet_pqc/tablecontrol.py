@@ -2,17 +2,18 @@
 
 import math
 
-import comet
 import comet.ui as ui
 from comet.settings import SettingsMixin
 
 from comet_pqc.utils import format_table_unit
 from comet_pqc.utils import from_table_unit, to_table_unit
 from comet_pqc.utils import format_metric
+from comet_pqc.utils import TABLE_UNIT
 
 from .components import PositionLabel
 from .components import ToggleButton
 from .settings import settings, TablePosition
+from .units import convert
 from .utils import format_switch
 
 from qutie.qutie import Qt
@@ -557,9 +558,9 @@ class TableControlDialog(ui.Dialog, SettingsMixin):
         # Create movement radio buttons
         self.step_width_buttons = ui.Column()
         for item in self.load_table_step_sizes():
-            step_size = item.get('step_size') * comet.ureg('um')
+            step_size = item.get('step_size')
             step_color = item.get('step_color')
-            step_size_label = format_metric(step_size.to('m').m, 'm', decimals=1)
+            step_size_label = format_metric(convert(step_size, TABLE_UNIT, 'm'), 'm', decimals=1)
             button = ui.RadioButton(
                 text=step_size_label,
                 tool_tip=f"Move in {step_size_label} steps.",
@@ -567,7 +568,7 @@ class TableControlDialog(ui.Dialog, SettingsMixin):
                 checked=len(self.step_width_buttons) == 0,
                 toggled=self.on_step_toggled
             )
-            button.movement_width = step_size.to('mm').m
+            button.movement_width = convert(step_size, TABLE_UNIT, 'mm')
             button.movement_color = step_color
             self.step_width_buttons.append(button)
         self.control_layout = ui.Column(
@@ -1,16 +1,6 @@
 from comet import ui
 
-from ..panels import SamplePanel
-from ..panels import ContactPanel
-from ..panels import IVRampPanel
-from ..panels import IVRampElmPanel
-from ..panels import IVRampBiasPanel
-from ..panels import IVRampBiasElmPanel
-from ..panels import IVRamp4WirePanel
-from ..panels import CVRampPanel
-from ..panels import CVRampHVPanel
-from ..panels import CVRampAltPanel
-from ..panels import FrequencyScanPanel
+from ..panels import panel_class
 
 __all__ = ['MeasurementTab']
 
@@ -48,24 +38,29 @@ class MeasurementTab(ui.Tab):
         self.emit('restore')
 
 class PanelStack(ui.Row):
-    """Stack of measurement panels."""
+    """Stack of measurement panels, panels are created on first use."""
 
     sample_changed = None
 
     def __init__(self, sample_changed=None):
         super().__init__()
         self.sample_changed = sample_changed
-        self.append(SamplePanel(visible=False, sample_changed=lambda item: self.sample_changed(item)))
-        self.append(ContactPanel(visible=False))
-        self.append(IVRampPanel(visible=False))
-        self.append(IVRampElmPanel(visible=False))
-        self.append(IVRampBiasPanel(visible=False))
-        self.append(IVRampBiasElmPanel(visible=False))
-        self.append(CVRampPanel(visible=False))
-        self.append(CVRampHVPanel(visible=False))
-        self.append(CVRampAltPanel(visible=False))
-        self.append(IVRamp4WirePanel(visible=False))
-        self.append(FrequencyScanPanel(visible=False))
+        self.__locked = False
+
+    def create(self, type):
+        """Create panel by type, returns `None` for unknown types."""
+        try:
+            cls = panel_class(type)
+        except KeyError:
+            return None
+        if type == "sample":
+            panel = cls(visible=False, sample_changed=lambda item: self.sample_changed(item))
+        else:
+            panel = cls(visible=False)
+        if self.__locked:
+            panel.lock()
+        self.append(panel)
+        return panel
 
     def store(self):
         for child in self:
@@ -84,16 +79,18 @@ class PanelStack(ui.Row):
             child.visible = False
 
     def lock(self):
+        self.__locked = True
         for child in self:
             child.lock()
 
     def unlock(self):
+        self.__locked = False
         for child in self:
             child.unlock()
 
     def get(self, type):
-        """Get panel by type."""
+        """Get panel by type, created on first request."""
         for child in self:
             if child.type == type:
                 return child
-        return None
+        return self.create(type)
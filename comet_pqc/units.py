@@ -0,0 +1,95 @@
+"""Fast unit conversion with constant scale factors.
+
+Conversions are limited to SI prefixed units of a fixed set of base units
+used for readings, plots and table positions. Physical quantities read
+from configuration files are handled by pint.
+"""
+
+import functools
+
+import numpy as np
+
+__all__ = [
+    'UNIT_PREFIXES',
+    'BASE_UNITS',
+    'parse_unit',
+    'conversion_factor',
+    'unit_factor',
+    'convert',
+    'convert_array'
+]
+
+UNIT_PREFIXES = {
+    'p': -12,
+    'n': -9,
+    'u': -6,
+    'm': -3,
+    'k': 3,
+    'M': 6,
+    'G': 9
+}
+"""SI prefix exponents."""
+
+BASE_UNITS = ('V', 'A', 'F', 'Hz', 'Ohm', 's', 'm')
+"""Supported base units."""
+
+@functools.lru_cache(maxsize=None)
+def parse_unit(unit):
+    """Return tuple of prefix exponent and base unit, raises `ValueError`
+    for unsupported units.
+
+    >>> parse_unit('uA')
+    (-6, 'A')
+    >>> parse_unit('mm')
+    (-3, 'm')
+    """
+    if unit in BASE_UNITS:
+        return 0, unit
+    prefix, base = unit[:1], unit[1:]
+    if prefix in UNIT_PREFIXES and base in BASE_UNITS:
+        return UNIT_PREFIXES[prefix], base
+    raise ValueError(f"Invalid unit: {unit!r}")
+
+@functools.lru_cache(maxsize=None)
+def conversion_factor(from_unit, to_unit):
+    """Return factor converting values of `from_unit` to `to_unit`, raises
+    `ValueError` for unsupported or incompatible units.
+
+    >>> conversion_factor('um', 'mm')
+    0.001
+    """
+    from_exponent, from_base = parse_unit(from_unit)
+    to_exponent, to_base = parse_unit(to_unit)
+    if from_base != to_base:
+        raise ValueError(f"Incompatible units: {from_unit!r} and {to_unit!r}")
+    # Powers of ten are exact for positive exponents
+    exponent = from_exponent - to_exponent
+    if exponent < 0:
+        return 1.0 / 10.0 ** -exponent
+    return 10.0 ** exponent
+
+def unit_factor(unit):
+    """Return factor converting values of base unit to (prefixed) `unit`.
+
+    >>> unit_factor('uA')
+    1000000.0
+    >>> unit_factor('V')
+    1.0
+    """
+    return conversion_factor(parse_unit(unit)[1], unit)
+
+def convert(value, from_unit, to_unit):
+    """Convert scalar `value` from `from_unit` to `to_unit`.
+
+    >>> convert(2500, 'um', 'mm')
+    2.5
+    """
+    return value * conversion_factor(from_unit, to_unit)
+
+def convert_array(values, from_unit, to_unit):
+    """Return array of `values` converted from `from_unit` to `to_unit`.
+
+    >>> convert_array([1e-6, 2e-6], 'A', 'uA')
+    array([1., 2.])
+    """
+    return np.multiply(values, conversion_factor(from_unit, to_unit))
@@ -7,9 +7,11 @@ import numpy as np
 
 from qutie.qutie import QtCore, QtGui
 from comet import ui
-from comet import ureg
+
+from .units import conversion_factor
 
 __all__ = [
+    'TABLE_UNIT',
     'PACKAGE_PATH',
     'make_path',
     'format_metric',
@@ -23,6 +25,13 @@ __all__ = [
     'to_table_unit'
 ]
 
+TABLE_UNIT = 'um'
+"""Unit of table positions."""
+
+TABLE_UNIT_TO_MM = conversion_factor(TABLE_UNIT, 'mm')
+
+MM_TO_TABLE_UNIT = conversion_factor('mm', TABLE_UNIT)
+
 PACKAGE_PATH = os.path.abspath(os.path.dirname(__file__))
 """Absolute path to package directory."""
 
@@ -79,12 +88,20 @@ def format_table_unit(value):
     return f"{value:.3f} mm"
 
 def from_table_unit(value):
-    """Convert table unit (micron) to millimeters."""
-    return round((value * ureg("um")).to("mm").m, 3)
+    """Convert table unit (micron) to millimeters.
+
+    >>> from_table_unit(2500)
+    2.5
+    """
+    return round(value * TABLE_UNIT_TO_MM, 3)
 
 def to_table_unit(value):
-    """Convert millimeters to table unit (micron)."""
-    return round((value * ureg("mm")).to("um").m, 0)
+    """Convert millimeters to table unit (micron).
+
+    >>> to_table_unit(2.5)
+    2500.0
+    """
+    return round(value * MM_TO_TABLE_UNIT, 0)
 
 def std_mean_filter(values, threshold):
     """Return True if standard deviation (sample) / mean < threshold.
@@ -100,6 +117,30 @@ def std_mean_filter(values, threshold):
     ratio = sample_std_dev / mean
     return ratio < threshold
 
+def std_mean_filter_index(values, threshold, size=2):
+    """Return index of first value completing a window of `size` values with
+    standard deviation (sample) / mean < threshold, or `None` if no window
+    satisfies the condition. Vectorized version of `std_mean_filter`.
+
+    >>> std_mean_filter_index([0.2, 0.250, 0.249, 0.251], threshold=0.005)
+    2
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if size < 2 or len(values) < size:
+        return None
+    # Read only window view, compatible with NumPy < 1.20
+    windows = np.lib.stride_tricks.as_strided(
+        values,
+        shape=(len(values) - size + 1, size),
+        strides=(values.strides[0], values.strides[0]),
+        writeable=False
+    )
+    ratios = np.std(windows, axis=1, ddof=1) / np.mean(windows, axis=1)
+    matches = np.flatnonzero(ratios < threshold)
+    if not len(matches):
+        return None
+    return int(matches[0]) + size - 1
+
 def stitch_pixmaps(pixmaps, vertical=True):
     """Stitch together multiple QPixmaps to a single QPixmap."""
     # Calculate size of stitched image
@@ -0,0 +1,286 @@
+"""Streaming measurement data writers."""
+
+import json
+import os
+import struct
+import time
+import zipfile
+
+import numpy as np
+
+from .formatter import PQCFormatter
+from .series import SeriesColumn
+
+__all__ = [
+    'NumpyEncoder',
+    'Writer',
+    'TextWriter',
+    'JSONWriter',
+    'NPZWriter',
+    'save_npz',
+    'load_npz'
+]
+
+class NumpyEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, (np.ndarray, SeriesColumn)):
+            return obj.tolist()
+        return super().default(obj)
+
+NPZ_SERIES_PREFIX = 'series/'
+NPZ_ATTRIBUTES = 'meta', 'series_units', 'analysis'
+
+def save_npz(file, data):
+    """Save measurement data to an uncompressed NumPy `.npz` container.
+
+    Series are stored as typed float64 arrays `series/<name>`, meta data,
+    series units and analysis results as JSON encoded string attributes.
+
+    >>> save_npz('data.npz', measurement.data)
+    """
+    arrays = {}
+    for key in NPZ_ATTRIBUTES:
+        arrays[key] = np.array(json.dumps(data.get(key, {}), cls=NumpyEncoder))
+    for key, values in data.get('series', {}).items():
+        arrays[f'{NPZ_SERIES_PREFIX}{key}'] = np.asarray(values, dtype=np.float64)
+    np.savez(file, **arrays)
+
+def _memmap_npz_member(filename, info, mode):
+    """Return memory mapped array of an uncompressed `.npz` member."""
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"unable to memory map compressed member: {info.filename}")
+    with open(filename, 'rb') as f:
+        # Skip zip local file header
+        f.seek(info.header_offset)
+        header = f.read(30)
+        name_size, extra_size = struct.unpack('<HH', header[26:30])
+        f.seek(info.header_offset + 30 + name_size + extra_size)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        elif version == (2, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        else:
+            # Format 3.0 (UTF-8 field names) is never written by `save_npz`
+            raise ValueError(f"unsupported .npy format version {version[0]}.{version[1]}: {info.filename}")
+        offset = f.tell()
+    order = 'F' if fortran_order else 'C'
+    return np.memmap(filename, dtype=dtype, mode=mode, offset=offset, shape=shape, order=order)
+
+def load_npz(filename, mmap_mode=None):
+    """Load measurement data from a `.npz` container written by `save_npz`.
+
+    Returns a dictionary with the same structure as the JSON format. If
+    `mmap_mode` is set (e.g. 'r') series are memory mapped instead of read.
+
+    >>> data = load_npz('data.npz', mmap_mode='r')
+    >>> data['series']['voltage']
+    memmap([...])
+    """
+    data = {'meta': {}, 'series_units': {}, 'series': {}, 'analysis': {}}
+    with np.load(filename) as npz:
+        for name in npz.files:
+            if name.startswith(NPZ_SERIES_PREFIX):
+                if mmap_mode is None:
+                    data['series'][name[len(NPZ_SERIES_PREFIX):]] = npz[name]
+            elif name in NPZ_ATTRIBUTES:
+                data[name] = json.loads(str(npz[name]))
+    if mmap_mode is not None:
+        with zipfile.ZipFile(filename) as zf:
+            for info in zf.infolist():
+                name = os.path.splitext(info.filename)[0]
+                if name.startswith(NPZ_SERIES_PREFIX):
+                    data['series'][name[len(NPZ_SERIES_PREFIX):]] = _memmap_npz_member(filename, info, mmap_mode)
+    return data
+
+class Writer:
+    """Base class for incremental measurement data writers.
+
+    Call `open` once meta data and series are registered, `append` for every
+    series row and `close` after analysis. If `open` was never called `close`
+    writes all available data at once.
+
+    >>> writer = TextWriter('data.txt')
+    >>> writer.open(data)
+    >>> writer.append(dict(voltage=1.0, current=4.2e-9))
+    >>> writer.close(data)
+    """
+
+    flush_interval = 1.0
+
+    def __init__(self, filename, flush_interval=None):
+        self.filename = filename
+        if flush_interval is not None:
+            self.flush_interval = flush_interval
+        self.__fp = None
+        self.__flush_time = 0.
+        self.__closed = False
+
+    @property
+    def fp(self):
+        return self.__fp
+
+    @property
+    def is_open(self):
+        return self.__fp is not None
+
+    def create_file(self, filename):
+        return open(filename, 'w')
+
+    def open(self, data):
+        """Open file and write data header."""
+        if self.__closed:
+            raise RuntimeError(f"writer already closed: {self.filename}")
+        if self.__fp is None:
+            self.__fp = self.create_file(self.filename)
+            self.__flush_time = time.monotonic()
+            self.write_header(data)
+            self.flush()
+
+    def append(self, row):
+        """Write series row, flush at configured interval."""
+        if self.__fp is not None:
+            self.write_row(row)
+            if time.monotonic() - self.__flush_time >= self.flush_interval:
+                self.flush()
+
+    def close(self, data):
+        """Write pending rows and footer, close file."""
+        if self.__closed:
+            return
+        if self.__fp is None:
+            self.open(data)
+            self.write_series(data.get('series', {}))
+        try:
+            self.write_footer(data)
+            self.flush()
+        finally:
+            self.__fp.close()
+            self.__fp = None
+            self.__closed = True
+        self.finalize(data)
+
+    def flush(self):
+        self.__fp.flush()
+        self.__flush_time = time.monotonic()
+
+    def patch(self, data):
+        """Update closed file with results available after close (e.g.
+        analysis of the analysis stage).
+        """
+
+    def write_header(self, data):
+        pass
+
+    def write_row(self, row):
+        pass
+
+    def write_series(self, series):
+        """Write all rows of a series dictionary."""
+        columns = list(series.keys())
+        for values in zip(*[series.get(key) for key in columns]):
+            self.write_row(dict(zip(columns, values)))
+
+    def write_footer(self, data):
+        pass
+
+    def finalize(self, data):
+        """Called after the file was closed."""
+
+class TextWriter(Writer):
+    """Incremental plain text writer using the PQC formatter.
+
+    Appended rows are buffered and formatted in bulk on flush.
+    """
+
+    def __init__(self, filename, flush_interval=None):
+        super().__init__(filename, flush_interval)
+        self.__rows = []
+
+    def create_file(self, filename):
+        # See https://docs.python.org/3/library/csv.html#csv.DictWriter
+        return open(filename, 'w', newline='')
+
+    def write_header(self, data):
+        meta = data.get('meta', {})
+        series_units = data.get('series_units', {})
+        series = data.get('series', {})
+        self.formatter = PQCFormatter(self.fp)
+        for key, value in meta.items():
+            self.formatter.write_meta(key, value)
+        for key in series.keys():
+            self.formatter.add_column(key, "E", unit=series_units.get(key))
+        self.formatter.write_header()
+
+    def write_row(self, row):
+        self.__rows.append(dict(row))
+
+    def write_series(self, series):
+        self.formatter.write_columns(series)
+
+    def flush(self):
+        if self.__rows:
+            rows, self.__rows = self.__rows, []
+            self.formatter.write_rows(rows)
+        super().flush()
+
+class JSONWriter(Writer):
+    """Incremental JSON writer.
+
+    Rows are streamed to a line delimited JSON sidecar file (`*.jsonl`)
+    serving as a recovery journal. On close the complete JSON document is
+    written and the sidecar file is removed.
+    """
+
+    def __init__(self, filename, flush_interval=None):
+        super().__init__(filename, flush_interval)
+        self.sidecar_filename = f"{os.path.splitext(filename)[0]}.jsonl"
+
+    def create_file(self, filename):
+        return open(self.sidecar_filename, 'w')
+
+    def write_line(self, data):
+        self.fp.write(json.dumps(data, cls=NumpyEncoder))
+        self.fp.write('\n')
+
+    def write_header(self, data):
+        self.write_line({
+            'meta': data.get('meta', {}),
+            'series_units': data.get('series_units', {})
+        })
+
+    def write_row(self, row):
+        self.write_line({'series': row})
+
+    def write_footer(self, data):
+        self.write_line({'analysis': data.get('analysis', {})})
+
+    def finalize(self, data):
+        self.patch(data)
+        os.remove(self.sidecar_filename)
+
+    def patch(self, data):
+        with open(self.filename, 'w') as fp:
+            json.dump(data, fp, indent=2, cls=NumpyEncoder)
+
+class NPZWriter(Writer):
+    """NumPy `.npz` writer, the binary container is written on close."""
+
+    def __init__(self, filename, flush_interval=None):
+        super().__init__(filename, flush_interval)
+        self.__closed = False
+
+    def open(self, data):
+        pass
+
+    def append(self, row):
+        pass
+
+    def close(self, data):
+        if self.__closed:
+            return
+        save_npz(self.filename, data)
+        self.__closed = True
+
+    def patch(self, data):
+        save_npz(self.filename, data)
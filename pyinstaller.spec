@@ -2,6 +2,8 @@ import os
 import comet
 import comet_pqc
 
+from PyInstaller.utils.hooks import collect_submodules
+
 # Application name
 name = 'comet-pqc'
 
@@ -89,7 +91,10 @@ a = Analysis(['entry_point.pyw'],
         'pyvisa',
         'pyvisa-py',
         'pyvisa-sim',
-        'PyQt5.sip'
+        'PyQt5.sip',
+        # Measurements and panels are imported by type name on first use
+        *collect_submodules('comet_pqc.measurements'),
+        *collect_submodules('comet_pqc.panels')
     ],
     hookspath=[],
     runtime_hooks=[],
@@ -0,0 +1,72 @@
+import concurrent.futures
+import unittest
+
+from comet_pqc.analysis import fit_points
+from comet_pqc.analysis import parse_analysis_tasks
+from comet_pqc.analysis import AnalysisJob
+from comet_pqc.analysis import AnalysisExecutor
+
+class AnalysisTest(unittest.TestCase):
+
+    def test_fit_points(self):
+        self.assertEqual([], fit_points({'a': 1.0}))
+        self.assertEqual([(0, 1.0), (2, 5.0)], fit_points({'a': 2.0, 'b': 1.0, 'x_fit': [0, 2]}))
+
+    def test_parse_analysis_tasks(self):
+        self.assertEqual((), parse_analysis_tasks([]))
+        with self.assertRaises(TypeError):
+            parse_analysis_tasks([42])
+
+    def test_job(self):
+        futures = [concurrent.futures.Future(), concurrent.futures.Future()]
+        results = []
+        done = []
+        job = AnalysisJob(futures, result=lambda key, values: results.append(key))
+        job.add_done_callback(lambda job: done.append(list(job.results)))
+        futures[1].set_result(('IV', {'a': 1}))
+        self.assertEqual(['IV'], results)
+        self.assertFalse(job.done())
+        with self.assertLogs(level='ERROR'):
+            futures[0].set_exception(ValueError("fit failed"))
+        self.assertTrue(job.wait(0))
+        self.assertEqual([[('IV', {'a': 1})]], done)
+        job.add_done_callback(lambda job: done.append(None))
+        self.assertEqual(None, done[-1])
+
+    def test_empty_job(self):
+        job = AnalysisJob([])
+        self.assertTrue(job.done())
+
+    def test_executor(self):
+        executor = AnalysisExecutor(executor_factory=lambda: concurrent.futures.ThreadPoolExecutor(1))
+        job = executor.submit([], {'v': [1, 2]})
+        self.assertTrue(job.done())
+        self.assertEqual(0, executor.pending)
+        executor.wait()
+        executor.shutdown()
+
+    def test_process_pool(self):
+        executor = AnalysisExecutor(max_workers=1)
+        try:
+            future = executor.executor.submit(fit_points, {'a': 2.0, 'b': 1.0, 'x_fit': [0, 2]})
+            self.assertEqual([(0, 1.0), (2, 5.0)], future.result(timeout=60))
+        finally:
+            executor.shutdown()
+
+    def test_executor_wait_timeout(self):
+        pending = concurrent.futures.Future()
+        class PendingExecutor:
+            def submit(self, *args):
+                return pending
+            def shutdown(self, wait=True):
+                pass
+        executor = AnalysisExecutor(executor_factory=PendingExecutor)
+        executor.submit([('iv', {})], {'v': [1, 2], 'i': [3, 4]})
+        self.assertEqual(1, executor.pending)
+        self.assertFalse(executor.wait(timeout=0))
+        pending.set_result(('IV', {}))
+        self.assertTrue(executor.wait(timeout=0))
+        self.assertEqual(0, executor.pending)
+
+if __name__ == '__main__':
+    unittest.main()
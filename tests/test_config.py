@@ -1,4 +1,5 @@
 import os
+import tempfile
 import unittest
 
 from comet_pqc import config
@@ -35,5 +36,23 @@ class ConfigTest(unittest.TestCase):
         for name, filename in results:
             sequence = config.load_sequence(filename)
 
+    def test_config_cache(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            filename = os.path.join(tempdir, 'sample.yaml')
+            with open(filename, 'w') as f:
+                f.write("id: default\nname: Default\ncontacts: []\n")
+            data = config.load_config(filename, schema='sample')
+            data['name'] = "Modified"
+            self.assertEqual("Default", config.load_config(filename)['name'])
+            self.assertEqual("Default", config.config_name(filename))
+            with open(filename, 'w') as f:
+                f.write("id: default\nname: Changed Sample\ncontacts: []\n")
+            self.assertEqual("Changed Sample", config.load_config(filename)['name'])
+            self.assertEqual("Changed Sample", config.config_name(filename))
+            self.assertEqual([("Changed Sample", filename)], config.list_configs(tempdir))
+
+    def test_schema_validator(self):
+        self.assertIs(config.schema_validator('sample'), config.schema_validator('sample'))
+
 if __name__ == '__main__':
     unittest.main()
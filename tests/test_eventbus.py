@@ -0,0 +1,79 @@
+import unittest
+
+from comet_pqc.eventbus import EventBus
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.
+
+    def __call__(self):
+        return self.now
+
+class EventBusTest(unittest.TestCase):
+
+    def create_bus(self, rate=10.0):
+        events = []
+        clock = FakeClock()
+        bus = EventBus(lambda *args: events.append(args), rate=rate, clock=clock)
+        return bus, events, clock
+
+    def test_coalesce(self):
+        bus, events, clock = self.create_bus()
+        for index in range(3):
+            bus.emit("message", f"step {index}")
+            bus.emit("progress", index, 3)
+            bus.emit("state", dict(hvsrc_voltage=index))
+            bus.emit("state", dict(hvsrc_current=index * 1e-9))
+            bus.emit("reading", "hvsrc", index, index * 1e-9)
+            bus.emit("update")
+        self.assertEqual([], events)
+        self.assertEqual(18, bus.depth)
+        bus.flush()
+        self.assertEqual([
+            ("message", "step 2"),
+            ("progress", 2, 3),
+            ("state", {'hvsrc_voltage': 2, 'hvsrc_current': 2e-9}),
+            ("readings", "hvsrc", [0, 1, 2], [0., 1e-9, 2e-9]),
+            ("update",),
+        ], events)
+        self.assertEqual(0, bus.depth)
+        self.assertEqual(18, bus.metrics.total_received)
+        self.assertEqual(5, bus.metrics.delivered)
+        self.assertEqual(18, bus.metrics.max_depth)
+
+    def test_order(self):
+        bus, events, clock = self.create_bus()
+        bus.emit("reading", "lcr", 1, 2)
+        bus.emit("show_measurement", "item")
+        bus.emit("reading", "lcr", 3, 4)
+        self.assertEqual([("readings", "lcr", [1], [2]), ("show_measurement", "item")], events)
+        bus.close()
+        self.assertEqual(("readings", "lcr", [3], [4]), events[-1])
+
+    def test_rate(self):
+        bus, events, clock = self.create_bus()
+        bus.emit("progress", 1, 10)
+        clock.now = .05
+        bus.emit("progress", 2, 10)
+        self.assertEqual([], events)
+        clock.now = .1
+        bus.emit("progress", 3, 10)
+        self.assertEqual([("progress", 3, 10)], events)
+
+    def test_disabled(self):
+        bus, events, clock = self.create_bus(rate=0)
+        bus.emit("progress", 1, 10)
+        bus.emit("reading", "lcr", 1, 2)
+        self.assertEqual([("progress", 1, 10), ("reading", "lcr", 1, 2)], events)
+
+    def test_thread(self):
+        events = []
+        bus = EventBus(lambda *args: events.append(args), rate=100.0)
+        bus.start()
+        bus.emit("message", "ramping...")
+        bus.close()
+        self.assertEqual([("message", "ramping...")], events)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import io
+import unittest
+
+from comet_pqc.formatter import PQCFormatter, printf_format, format_column
+
+class FormatterTest(unittest.TestCase):
+
+    def test_printf_format(self):
+        self.assertEqual('%E', printf_format('E'))
+        self.assertEqual('%+.3f', printf_format('+.3f'))
+        self.assertEqual('%12.4G', printf_format('12.4G'))
+        self.assertEqual(None, printf_format(''))
+        self.assertEqual(None, printf_format(',.2f'))
+
+    def test_format_column(self):
+        values = [0.0, -4.2e-9, float('nan'), 1e3]
+        for spec in ('E', '+E', '.3f', 'G'):
+            self.assertEqual([format(value, spec) for value in values], format_column(values, spec))
+        self.assertEqual(['spam', 'eggs'], format_column(['spam', 'eggs'], ''))
+
+    def test_write_columns(self):
+        columns = {'voltage': [1.0, 2.0], 'current': [4.2e-9, float('nan')]}
+        f_rows = io.StringIO()
+        fmt = PQCFormatter(f_rows)
+        fmt.add_column('voltage', 'E', unit='V')
+        fmt.add_column('current', 'E', unit='A')
+        fmt.write_header()
+        for voltage, current in zip(columns['voltage'], columns['current']):
+            fmt.write_row(dict(voltage=voltage, current=current))
+        f_columns = io.StringIO()
+        fmt = PQCFormatter(f_columns)
+        fmt.add_column('voltage', 'E', unit='V')
+        fmt.add_column('current', 'E', unit='A')
+        fmt.write_header()
+        fmt.chunk_size = 1
+        fmt.write_columns(columns)
+        self.assertEqual(f_rows.getvalue(), f_columns.getvalue())
+        with self.assertRaises(ValueError):
+            fmt.write_columns({'spam': [1.0]})
+
+    def test_write_columns_mixed(self):
+        f = io.StringIO()
+        fmt = PQCFormatter(f)
+        fmt.add_column('key')
+        fmt.add_column('value', '+.1f')
+        fmt.write_header()
+        fmt.write_columns({'key': ['spam', 'ham\teggs'], 'value': [4.2, -2.4]})
+        lines = f.getvalue().splitlines()
+        self.assertEqual(['key\tvalue', 'spam\t+4.2', '"ham\teggs"\t-2.4'], lines)
+
+if __name__ == '__main__':
+    unittest.main()
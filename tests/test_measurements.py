@@ -0,0 +1,79 @@
+import unittest
+
+from comet import ureg
+
+from comet_pqc.measurements import measurement_factory
+
+class FakeItem:
+
+    def __init__(self, parameters):
+        self.parameters = parameters
+
+class FakeVSource:
+
+    def __init__(self):
+        self.terminals = []
+
+    def get_error(self):
+        return 0, "No error"
+
+    def read_current(self):
+        return 0.0
+
+    def set_terminal(self, value):
+        self.terminals.append(value)
+
+def create_measurement(type, **parameters):
+    measurement = measurement_factory(type, None, "sample", "type", None, "operator")
+    measurement.measurement_item = FakeItem(parameters)
+    return measurement
+
+class FakeHVSource(FakeVSource):
+
+    SWEEP_SIZE_MAXIMUM = 100
+
+    def __init__(self):
+        super().__init__()
+        self.sweeps = []
+
+    def sweep_voltage(self, voltages, delay):
+        self.sweeps.append(list(voltages))
+        return [0.0] * len(voltages)
+
+class HVSourceMixinTest(unittest.TestCase):
+
+    def test_hvsrc_ramp_sweep(self):
+        measurement = create_measurement('iv_ramp', hvsrc_ramp_sweep_enable=True)
+        hvsrc = FakeHVSource()
+        self.assertEqual([0, 10], list(measurement.hvsrc_ramp(hvsrc, 0, 10, 2.5)))
+        self.assertEqual([[2.5, 5, 7.5, 10]], hvsrc.sweeps)
+
+    def test_hvsrc_ramp_down_stepwise(self):
+        measurement = create_measurement('iv_ramp', hvsrc_ramp_sweep_enable=True)
+        hvsrc = FakeHVSource()
+        self.assertEqual([10, 7.5, 5, 2.5, 0], list(measurement.hvsrc_ramp(hvsrc, 10, 0, 2.5)))
+        self.assertEqual([], hvsrc.sweeps)
+
+class VSourceMixinTest(unittest.TestCase):
+
+    def test_vsrc_ramp(self):
+        for type in ('iv_ramp_bias', 'iv_ramp_bias_elm', 'cv_ramp_vsrc'):
+            measurement = create_measurement(type)
+            ramp = measurement.vsrc_ramp(FakeVSource(), 0, 10, 2.5)
+            self.assertEqual([0, 2.5, 5, 7.5, 10], list(ramp))
+
+    def test_vsrc_ramp_step(self):
+        measurement = create_measurement('iv_ramp_bias', vsrc_ramp_step=ureg('5 V'))
+        ramp = measurement.vsrc_ramp(FakeVSource(), 0, 10, 2.5)
+        self.assertEqual([0, 5, 10], list(ramp))
+
+    def test_vsrc_set_route_terminal(self):
+        measurement = create_measurement('iv_ramp_bias')
+        vsrc = FakeVSource()
+        measurement.vsrc_set_route_terminal(vsrc, 'front')
+        measurement.vsrc_set_route_terminal(vsrc, 'front')
+        measurement.vsrc_set_route_terminal(vsrc, 'rear')
+        self.assertEqual(['FRONT', 'REAR'], vsrc.terminals)
+
+if __name__ == '__main__':
+    unittest.main()
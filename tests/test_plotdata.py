@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+
+from comet_pqc.plotdata import unit_factor
+from comet_pqc.plotdata import ScaleTransform
+from comet_pqc.plotdata import ReadingSeries
+from comet_pqc.plotdata import minmax_decimate
+
+class PlotDataTest(unittest.TestCase):
+
+    def test_unit_factor(self):
+        self.assertEqual(1.0, unit_factor('V'))
+        self.assertAlmostEqual(1e6, unit_factor('uA'))
+        self.assertAlmostEqual(1e12, unit_factor('pF'))
+        self.assertAlmostEqual(1e-3, unit_factor('kHz'))
+        with self.assertRaises(ValueError):
+            unit_factor('uX')
+
+    def test_scale_transform(self):
+        tr = ScaleTransform('V', 'pF')
+        x, y = tr(2.0, 4.2e-12)
+        self.assertEqual(2.0, x)
+        self.assertAlmostEqual(4.2, y)
+        x, y = tr.apply(np.array([1.0, 2.0]), np.array([1e-12, 2e-12]))
+        self.assertEqual([1.0, 2.0], x.tolist())
+        np.testing.assert_allclose([1.0, 2.0], y)
+        self.assertEqual((3, 4), ScaleTransform()(3, 4))
+
+    def test_minmax_decimate(self):
+        x = np.arange(6)
+        y = np.array([0, 5, 1, 4, 2, 3])
+        dx, dy = minmax_decimate(x, y, 2)
+        self.assertEqual([0, 1, 3, 4, 5], dx.tolist())
+        self.assertEqual([0, 5, 4, 2, 3], dy.tolist())
+        dx, dy = minmax_decimate(x, y, 3)
+        self.assertEqual(x.tolist(), dx.tolist())
+
+    def test_minmax_decimate_peaks(self):
+        x = np.arange(10000, dtype=float)
+        y = np.zeros(10000)
+        y[1234] = 1.0
+        y[8765] = -1.0
+        dx, dy = minmax_decimate(x, y, 100)
+        self.assertLessEqual(len(dx), 202)
+        self.assertIn(1234.0, dx.tolist())
+        self.assertIn(8765.0, dx.tolist())
+        self.assertEqual(1.0, dy.max())
+        self.assertEqual(-1.0, dy.min())
+
+    def test_reading_series(self):
+        series = ReadingSeries([(0, 1e-6), (1, 2e-6)])
+        series.append(2, 3e-6)
+        self.assertEqual(3, len(series))
+        self.assertEqual([0., 1., 2.], series.x.tolist())
+        self.assertEqual([(0., 1e-6), (1., 2e-6), (2., 3e-6)], list(series))
+        points = series.points(ScaleTransform('V', 'uA'))
+        self.assertEqual(3, len(points))
+        self.assertAlmostEqual(3.0, points[-1][1])
+        series.clear()
+        self.assertEqual([], series.points())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+from comet_pqc.ramp import Ramp
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+class RampTest(unittest.TestCase):
+
+    def test_legacy(self):
+        ramp = Ramp(0, 10, 2.5, delay=.1)
+        self.assertEqual([0, 2.5, 5, 7.5, 10], list(ramp))
+        self.assertEqual(5, ramp.count)
+        self.assertAlmostEqual(.1, ramp.period)
+
+    def test_down(self):
+        self.assertEqual([10, 6, 2, 0], list(Ramp(10, 0, 4)))
+        self.assertEqual([-5, -3, -1, 0], list(Ramp(-5, 0, 2)))
+        self.assertEqual([1.0], list(Ramp(1, 1, 1)))
+
+    def test_slew_rate(self):
+        ramp = Ramp(0, 100, 25, delay=.1, slew_rate=50)
+        self.assertEqual(5, ramp.step)
+        self.assertAlmostEqual(.1, ramp.period)
+        ramp = Ramp(0, 100, 25, slew_rate=250)
+        self.assertEqual(25, ramp.step)
+        self.assertAlmostEqual(.1, ramp.period)
+        self.assertAlmostEqual(.5, ramp.estimate())
+
+    def test_wait(self):
+        clock = FakeClock()
+        ramp = Ramp(0, 4, 1, delay=.1, clock=clock, sleep=clock.sleep)
+        for voltage in ramp:
+            clock.now += .03 # time spent applying value
+            ramp.wait()
+        self.assertAlmostEqual(.5, clock.now)
+
+    def test_current_slope(self):
+        clock = FakeClock()
+        currents = iter([0, 1e-6, 2e-6, 2e-6, 2e-6, 2e-6, 2e-6, 2e-6])
+        ramp = Ramp(0, 10, 4, delay=.1, current_slope=1e-6, read_current=lambda: next(currents), clock=clock, sleep=clock.sleep)
+        values = []
+        for voltage in ramp:
+            values.append(voltage)
+            ramp.wait()
+        self.assertEqual([0, 4, 6, 7, 9, 10], values)
+        self.assertEqual(2, ramp.throttled)
+
+    def test_sweep(self):
+        sweeps = []
+        def sweep(values, delay):
+            sweeps.append(list(values))
+            return [0.] * len(values)
+        ramp = Ramp(0, 10, 1, delay=.1, sweep=sweep, sweep_size=4)
+        self.assertEqual([0, 4, 8, 10], list(ramp))
+        self.assertEqual([[1, 2, 3, 4], [5, 6, 7, 8], [9, 10]], sweeps)
+
+    def test_sweep_compliance(self):
+        def sweep(values, delay):
+            return [0.] * 2
+        ramp = Ramp(0, 10, 1, sweep=sweep, sweep_size=4)
+        self.assertEqual([0, 2], list(ramp))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+from comet_pqc.resourcepool import ResourcePool
+
+class FakeResource:
+
+    def __init__(self):
+        self.opened = 0
+        self.closed = 0
+        self.fail_query = False
+
+    def __enter__(self):
+        self.opened += 1
+        return self
+
+    def __exit__(self, *exc):
+        self.closed += 1
+        return False
+
+    def query(self, message):
+        if self.fail_query:
+            self.fail_query = False
+            raise ConnectionError("connection lost")
+        return "1"
+
+class ResourcePoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.resources = {"hvsrc": FakeResource(), "table": FakeResource()}
+        self.pool = ResourcePool(self.resources, ["hvsrc"], connection_errors=(ConnectionError,))
+
+    def test_reuse(self):
+        for _ in range(3):
+            with self.pool.get("hvsrc") as hvsrc:
+                self.assertIs(self.resources["hvsrc"], hvsrc)
+        self.assertEqual(1, self.resources["hvsrc"].opened)
+        self.assertEqual(0, self.resources["hvsrc"].closed)
+        self.assertEqual(1, self.pool.metrics.opened)
+        self.assertEqual(2, self.pool.metrics.reused)
+        self.pool.close()
+        self.assertEqual(1, self.resources["hvsrc"].closed)
+
+    def test_passthrough(self):
+        self.assertIs(self.resources["table"], self.pool.get("table"))
+
+    def test_nested(self):
+        with self.pool.get("hvsrc"):
+            with self.pool.get("hvsrc"):
+                pass
+        self.assertEqual(1, self.resources["hvsrc"].opened)
+        self.assertEqual(0, self.pool.metrics.health_checks)
+
+    def test_health_check(self):
+        self.pool.health_interval = 0.
+        with self.pool.get("hvsrc"):
+            pass
+        self.resources["hvsrc"].fail_query = True
+        with self.pool.get("hvsrc"):
+            pass
+        self.assertEqual(1, self.pool.metrics.health_checks)
+        self.assertEqual(1, self.pool.metrics.reconnected)
+        self.assertEqual(2, self.resources["hvsrc"].opened)
+        self.assertEqual(1, self.resources["hvsrc"].closed)
+
+    def test_connection_error(self):
+        with self.assertRaises(ConnectionError):
+            with self.pool.get("hvsrc"):
+                raise ConnectionError("connection lost")
+        self.assertEqual(1, self.pool.metrics.failures)
+        self.assertEqual(1, self.resources["hvsrc"].closed)
+        with self.pool.get("hvsrc"):
+            pass
+        self.assertEqual(2, self.resources["hvsrc"].opened)
+
+    def test_other_error(self):
+        with self.assertRaises(ValueError):
+            with self.pool.get("hvsrc"):
+                raise ValueError()
+        self.assertEqual(0, self.pool.metrics.failures)
+        self.assertEqual(0, self.resources["hvsrc"].closed)
+
+if __name__ == '__main__':
+    unittest.main()
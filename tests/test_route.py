@@ -0,0 +1,39 @@
+import unittest
+
+from comet_pqc import route
+
+class RouteTest(unittest.TestCase):
+
+    def test_travel_distance(self):
+        self.assertEqual(5.0, route.travel_distance((0, 0, 0), (3, 4, 1)))
+
+    def test_travel_time(self):
+        self.assertEqual(0.4, route.travel_time((0, 0), (3, 4), velocity=10.0))
+
+    def test_nearest_neighbour(self):
+        self.assertEqual([], route.nearest_neighbour([]))
+        self.assertEqual([0, 2, 1], route.nearest_neighbour([(0, 0), (9, 0), (1, 0)]))
+        self.assertEqual([1, 2, 0], route.nearest_neighbour([(0, 0), (9, 0), (5, 0)], start=(10, 0)))
+
+    def test_two_opt(self):
+        positions = [(0, 0), (2, 0), (1, 0), (3, 0)]
+        self.assertEqual([0, 2, 1, 3], route.two_opt(positions, [0, 1, 2, 3]))
+
+    def test_plan_route(self):
+        positions = [(0, 0), (9, 0), (1, 0), (2, 0)]
+        self.assertEqual([0, 2, 3, 1], route.plan_route(positions))
+        self.assertEqual([0, 1, 2, 3], route.plan_route(positions, pinned=[0, 1, 2, 3]))
+        self.assertEqual([3, 2, 0, 1], route.plan_route(positions, start=(2.5, 0)))
+        self.assertEqual([0, 1, 3, 2], route.plan_route(positions, pinned=[1]))
+
+    def test_route_report(self):
+        positions = [(0, 0), (9, 0), (1, 0), (2, 0)]
+        order = route.plan_route(positions)
+        report = route.RouteReport(positions, order, velocity=1.0, move_overhead=1.0)
+        self.assertEqual(18.0, report.distance(report.config_order))
+        self.assertEqual(9.0, report.distance(order))
+        self.assertEqual(12.0, report.time(order))
+        self.assertIn("optimized order: 9.000 mm", str(report))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import json
+import unittest
+
+import numpy as np
+
+from comet_pqc.series import SeriesColumn, SeriesTable
+
+class SeriesColumnTest(unittest.TestCase):
+
+    def test_append(self):
+        column = SeriesColumn(capacity=2)
+        for value in range(5):
+            column.append(value)
+        self.assertEqual(5, len(column))
+        self.assertEqual(8, column.capacity)
+        self.assertEqual([0., 1., 2., 3., 4.], column.tolist())
+        self.assertEqual(4., column[-1])
+
+    def test_values(self):
+        column = SeriesColumn()
+        column.append(4.2)
+        values = column.values
+        self.assertIsInstance(values, np.ndarray)
+        self.assertEqual(np.float64, values.dtype)
+        self.assertFalse(values.flags.writeable)
+
+    def test_array(self):
+        column = SeriesColumn()
+        column.append(1.)
+        column.append(2.)
+        self.assertEqual([1., 2.], np.asarray(column).tolist())
+        self.assertEqual(np.float32, np.asarray(column, dtype=np.float32).dtype)
+        self.assertEqual(3., np.sum(column))
+        values = np.array(column)
+        values[0] = 42.
+        self.assertEqual([1., 2.], column.tolist())
+
+class SeriesTableTest(unittest.TestCase):
+
+    def test_register(self):
+        table = SeriesTable()
+        table.register('voltage')
+        with self.assertRaises(KeyError):
+            table.register('voltage')
+        table.append(voltage=1.)
+        with self.assertRaises(KeyError):
+            table.register('current')
+
+    def test_append(self):
+        table = SeriesTable()
+        table.register('voltage')
+        table.register('current')
+        table.append(current=4.2e-9, voltage=1.)
+        table.append(voltage=2., current=8.4e-9)
+        self.assertEqual(2, table.size)
+        self.assertEqual(['voltage', 'current'], table.columns)
+        self.assertEqual([1., 2.], table.values_of('voltage').tolist())
+        self.assertEqual(0, len(table.values_of('missing')))
+        with self.assertRaises(KeyError):
+            table.append(voltage=3.)
+
+    def test_json(self):
+        table = SeriesTable()
+        table.register('voltage')
+        table.append(voltage=1.)
+        data = json.dumps(table, default=lambda obj: obj.tolist())
+        self.assertEqual({'voltage': [1.]}, json.loads(data))
+
+if __name__ == '__main__':
+    unittest.main()
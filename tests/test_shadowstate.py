@@ -0,0 +1,67 @@
+import unittest
+
+from comet_pqc.shadowstate import scpi_short_form
+from comet_pqc.shadowstate import scpi_setting
+from comet_pqc.shadowstate import ShadowState
+
+class ShadowStateTest(unittest.TestCase):
+
+    def test_scpi_short_form(self):
+        self.assertEqual('CURR', scpi_short_form('CURRent'))
+        self.assertEqual('ZCH', scpi_short_form('ZCHeck'))
+        self.assertEqual('IMM', scpi_short_form('IMMediate'))
+        self.assertEqual('RANG', scpi_short_form('RANGE'))
+        self.assertEqual('AUTO', scpi_short_form('AUTO'))
+
+    def test_scpi_setting(self):
+        self.assertEqual(('SENS:CURR:NPLC', '5'), scpi_setting(':SENSe:CURRent:NPLCycles 5'))
+        self.assertEqual(('SENS:CURR:AVER:STAT', 'ON'), scpi_setting(':SENS:CURR:AVER:STATE ON'))
+        self.assertIsNone(scpi_setting(':INIT'))
+        self.assertIsNone(scpi_setting('*RST'))
+        self.assertIsNone(scpi_setting(':SYST:ERR?'))
+
+    def test_write(self):
+        writes = []
+        state = ShadowState()
+        self.assertTrue(state.write('filter.count', 10, lambda: writes.append(10)))
+        self.assertFalse(state.write('filter.count', 10, lambda: writes.append(10)))
+        self.assertTrue(state.write('filter.count', 20, lambda: writes.append(20)))
+        self.assertEqual([10, 20], writes)
+        self.assertEqual(2, state.written)
+        self.assertEqual(1, state.skipped)
+
+    def test_related(self):
+        state = ShadowState()
+        state.write('source.voltage.range.auto', True, lambda: None)
+        state.write('filter.count', 10, lambda: None)
+        state.write('source.voltage.range', 20.0, lambda: None)
+        self.assertNotIn('source.voltage.range.auto', state)
+        self.assertIn('filter.count', state)
+        state.write('source.voltage.range.auto', True, lambda: None)
+        self.assertNotIn('source.voltage.range', state)
+
+    def test_error(self):
+        def fail():
+            raise RuntimeError()
+        state = ShadowState()
+        state.owner = 'iv_ramp'
+        state.write('filter.count', 10, lambda: None)
+        with self.assertRaises(RuntimeError):
+            state.write('filter.type', 'repeat', fail)
+        self.assertEqual(0, len(state))
+        self.assertIsNone(state.owner)
+
+    def test_write_message(self):
+        writes = []
+        state = ShadowState()
+        for message in (":SENS:CURR:NPLC 5", ":SENSE:CURRENT:NPLC 5", ":INIT", ":INIT"):
+            state.write_message(message, lambda: writes.append(message))
+        self.assertEqual([":SENS:CURR:NPLC 5", ":INIT", ":INIT"], writes)
+        state.write_message("*RST", lambda: writes.append("*RST"))
+        self.assertEqual(0, len(state))
+        state.write_message(":SYST:ZCOR ON", lambda: writes.append("ZCOR"), uncached=('SYST:ZCOR',))
+        state.write_message(":SYST:ZCOR ON", lambda: writes.append("ZCOR"), uncached=('SYST:ZCOR',))
+        self.assertEqual(2, writes.count("ZCOR"))
+
+if __name__ == '__main__':
+    unittest.main()
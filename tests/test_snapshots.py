@@ -0,0 +1,57 @@
+import math
+import time
+import unittest
+
+from types import SimpleNamespace
+
+from comet_pqc.snapshots import SnapshotBuffer
+
+class SnapshotBufferTest(unittest.TestCase):
+
+    def test_empty(self):
+        buffer = SnapshotBuffer()
+        self.assertEqual(0, len(buffer))
+        self.assertIsNone(buffer.latest())
+        self.assertTrue(math.isnan(buffer.value_at(time.time(), 'box_temperature')))
+
+    def test_maxlen(self):
+        buffer = SnapshotBuffer(maxlen=2)
+        for i in range(4):
+            buffer.append(SimpleNamespace(value=i), timestamp=i)
+        self.assertEqual(2, len(buffer))
+        self.assertEqual([2, 3], [item[0] for item in buffer.snapshots()])
+
+    def test_latest(self):
+        buffer = SnapshotBuffer()
+        snapshot = SimpleNamespace(value=42)
+        buffer.append(snapshot)
+        timestamp, latest = buffer.latest(max_age=10.0)
+        self.assertIs(snapshot, latest)
+        buffer.append(snapshot, timestamp=time.time() - 60.0)
+        self.assertIsNone(buffer.latest(max_age=10.0))
+        self.assertIsNotNone(buffer.latest())
+
+    def test_value_at(self):
+        buffer = SnapshotBuffer()
+        buffer.append(SimpleNamespace(value=20.0), timestamp=10.0)
+        buffer.append(SimpleNamespace(value=22.0), timestamp=12.0)
+        self.assertEqual(21.0, buffer.value_at(11.0, 'value'))
+        self.assertEqual(20.0, buffer.value_at(0.0, 'value'))
+        self.assertEqual(22.0, buffer.value_at(20.0, 'value'))
+        self.assertEqual(22.0, buffer.value_at(12.0, 'value'))
+        self.assertEqual(20.0, buffer.value_at(10.0, 'value'))
+
+    def test_value_at_history(self):
+        buffer = SnapshotBuffer(maxlen=4)
+        for i in range(8):
+            buffer.append(SimpleNamespace(value=i * 2.0), timestamp=float(i))
+        self.assertEqual(8.0, buffer.value_at(4.0, 'value'))
+        self.assertEqual(9.0, buffer.value_at(4.5, 'value'))
+        self.assertEqual(13.0, buffer.value_at(6.5, 'value'))
+        self.assertEqual(8.0, buffer.value_at(1.0, 'value'))
+        self.assertEqual(14.0, buffer.value_at(time.time(), 'value'))
+        buffer.clear()
+        self.assertTrue(math.isnan(buffer.value_at(4.0, 'value')))
+
+if __name__ == '__main__':
+    unittest.main()
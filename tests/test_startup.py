@@ -0,0 +1,39 @@
+import builtins
+import importlib.util
+import sys
+import unittest
+
+from comet_pqc.startup import ImportProfiler
+from comet_pqc.measurements import MEASUREMENT_TYPES
+from comet_pqc.panels import PANEL_TYPES
+
+class ImportProfilerTest(unittest.TestCase):
+
+    def test_profile(self):
+        sys.modules.pop('colorsys', None)
+        original_import = builtins.__import__
+        profiler = ImportProfiler()
+        profiler.start()
+        self.assertTrue(profiler.active)
+        import colorsys
+        import sys as other_sys
+        profiler.mark("imports")
+        profiler.stop()
+        self.assertFalse(profiler.active)
+        self.assertIs(original_import, builtins.__import__)
+        self.assertEqual(['colorsys'], [record.name for record in profiler.records])
+        self.assertEqual(["imports"], [name for name, timestamp in profiler.marks])
+        report = profiler.report()
+        self.assertIn("colorsys", report)
+        self.assertIn("imports:", report)
+
+    def test_registry(self):
+        for registry, package in ((MEASUREMENT_TYPES, 'comet_pqc.measurements'), (PANEL_TYPES, 'comet_pqc.panels')):
+            for key, (module_name, class_name) in registry.items():
+                spec = importlib.util.find_spec(module_name, package)
+                self.assertIsNotNone(spec, key)
+                with open(spec.origin) as f:
+                    self.assertIn(f"class {class_name}(", f.read())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+from comet_pqc.processes.table import AlternateTableProcess
+from comet_pqc.processes.table import ResourceRequest
+
+class FakeTable:
+
+    def __init__(self):
+        self.pos = 0, 0, 0
+        self.joystick = False
+
+class FakeTableProcess(AlternateTableProcess):
+
+    def __init__(self):
+        super().__init__()
+        self.iterations = 0
+        self.events = []
+
+    @property
+    def running(self):
+        self.iterations -= 1
+        return self.iterations >= 0
+
+    def emit(self, *args):
+        self.events.append(args)
+
+    def run_requests(self, context, count):
+        """Run event loop for `count` dequeued requests."""
+        self.iterations = count
+        self.event_loop(context)
+
+class AlternateTableProcessTest(unittest.TestCase):
+
+    def test_priority(self):
+        process = FakeTableProcess()
+        process.enabled = True
+        order = []
+        process.append_status_request('position', lambda context: order.append('position'))
+        process.append_status_request('caldone', lambda context: order.append('caldone'))
+        process.append_request(ResourceRequest(lambda context: order.append('move')))
+        process.append_request(ResourceRequest(lambda context: order.append('stop')))
+        process.run_requests(FakeTable(), 4)
+        self.assertEqual(['move', 'stop', 'position', 'caldone'], order)
+
+    def test_coalesce_status(self):
+        process = FakeTableProcess()
+        process.enabled = True
+        request = process.position()
+        self.assertIs(request, process.position())
+        process.run_requests(FakeTable(), 1)
+        self.assertEqual([('position_changed', 0, 0, 0)], process.events)
+        self.assertEqual((0, 0, 0), process.get_cached_position())
+        # Pending map is cleared on dequeue
+        self.assertIsNot(request, process.position())
+
+    def test_disabled(self):
+        process = FakeTableProcess()
+        process.enabled = False
+        order = []
+        request = process.append_status_request('position', lambda context: order.append('position'))
+        process.append_request(ResourceRequest(lambda context: order.append('move')))
+        process.run_requests(FakeTable(), 1)
+        self.assertEqual([], order)
+        self.assertIsNot(request, process.append_status_request('position', lambda context: None))
+
+    def test_clear_requests(self):
+        process = FakeTableProcess()
+        request = process.position()
+        process._clear_requests()
+        self.assertIsNot(request, process.position())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import logging
+import unittest
+
+import numpy as np
+
+from comet_pqc.benchmark import Benchmark
+from comet_pqc.units import parse_unit
+from comet_pqc.units import conversion_factor
+from comet_pqc.units import unit_factor
+from comet_pqc.units import convert
+from comet_pqc.units import convert_array
+
+try:
+    import pint
+except ImportError:
+    pint = None
+
+class UnitsTest(unittest.TestCase):
+
+    def test_parse_unit(self):
+        self.assertEqual((0, 'V'), parse_unit('V'))
+        self.assertEqual((-12, 'F'), parse_unit('pF'))
+        self.assertEqual((3, 'Hz'), parse_unit('kHz'))
+        self.assertEqual((6, 'Ohm'), parse_unit('MOhm'))
+        self.assertEqual((-6, 'm'), parse_unit('um'))
+        with self.assertRaises(ValueError):
+            parse_unit('uX')
+
+    def test_conversion_factor(self):
+        self.assertEqual(0.001, conversion_factor('um', 'mm'))
+        self.assertEqual(1000.0, conversion_factor('mm', 'um'))
+        self.assertEqual(1e6, unit_factor('uA'))
+        self.assertEqual(1.0, unit_factor('s'))
+        with self.assertRaises(ValueError):
+            conversion_factor('mm', 'mA')
+
+    def test_convert(self):
+        self.assertEqual(2.5, convert(2500, 'um', 'mm'))
+        self.assertAlmostEqual(4.2, convert(4.2e-12, 'F', 'pF'))
+        values = convert_array(np.array([1e-6, 2e-6]), 'A', 'nA')
+        np.testing.assert_allclose([1e3, 2e3], values)
+
+    @unittest.skipIf(pint is None, "pint not installed")
+    def test_pint(self):
+        ureg = pint.UnitRegistry()
+        units = [('um', 'mm'), ('mm', 'um'), ('A', 'uA'), ('pF', 'F'), ('kHz', 'Hz'), ('MOhm', 'kOhm'), ('ms', 's'), ('V', 'mV')]
+        for from_unit, to_unit in units:
+            # pint spells ohm in lower case
+            expected = (42.5 * ureg(from_unit.replace('Ohm', 'ohm'))).to(to_unit.replace('Ohm', 'ohm')).m
+            self.assertAlmostEqual(1.0, convert(42.5, from_unit, to_unit) / expected, places=12)
+
+    @unittest.skipIf(pint is None, "pint not installed")
+    def test_benchmark(self):
+        ureg = pint.UnitRegistry()
+        count = 2000
+        with Benchmark("pint") as pint_bench:
+            pint_values = [round((value * ureg("um")).to("mm").m, 3) for value in range(count)]
+        with Benchmark("units") as units_bench:
+            units_values = [round(convert(value, 'um', 'mm'), 3) for value in range(count)]
+        # Timing is only reported, wall clock times vary on shared runners
+        logging.info("%s, %s", pint_bench, units_bench)
+        self.assertEqual(pint_values, units_values)
+
+if __name__ == '__main__':
+    unittest.main()
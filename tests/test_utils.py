@@ -52,5 +52,12 @@ class UtilsTest(unittest.TestCase):
         self.assertTrue(utils.std_mean_filter([0.250, 0.249], threshold=0.005))
         self.assertFalse(utils.std_mean_filter([0.250, 0.224], threshold=0.005))
 
+    def test_std_mean_filter_index(self):
+        self.assertEqual(1, utils.std_mean_filter_index([0.250, 0.249], threshold=0.005))
+        self.assertEqual(2, utils.std_mean_filter_index([0.2, 0.250, 0.249, 0.251], threshold=0.005))
+        self.assertEqual(4, utils.std_mean_filter_index([0.2, 0.3, 0.250, 0.249, 0.251], threshold=0.005, size=3))
+        self.assertIsNone(utils.std_mean_filter_index([0.250, 0.224], threshold=0.005))
+        self.assertIsNone(utils.std_mean_filter_index([0.250], threshold=0.005))
+
 if __name__ == '__main__':
     unittest.main()
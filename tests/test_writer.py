@@ -0,0 +1,127 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+import numpy as np
+
+from comet_pqc.series import SeriesTable
+from comet_pqc.writer import TextWriter, JSONWriter, NPZWriter, load_npz
+
+def create_data():
+    series = SeriesTable()
+    series.register('voltage')
+    series.register('current')
+    return {
+        'meta': {'sample_name': 'Unittest'},
+        'series_units': {'voltage': 'V', 'current': 'A'},
+        'series': series,
+        'analysis': {}
+    }
+
+class WriterTest(unittest.TestCase):
+
+    def test_text_writer(self):
+        data = create_data()
+        with tempfile.TemporaryDirectory() as path:
+            filename = os.path.join(path, 'data.txt')
+            writer = TextWriter(filename, flush_interval=0)
+            writer.open(data)
+            data['series'].append(voltage=1.0, current=4.2e-9)
+            writer.append(dict(voltage=1.0, current=4.2e-9))
+            with open(filename) as f:
+                self.assertIn("1.000000E+00\t4.200000E-09", f.read())
+            writer.close(data)
+            self.assertFalse(writer.is_open)
+
+    def test_text_writer_flush(self):
+        data = create_data()
+        with tempfile.TemporaryDirectory() as path:
+            filename = os.path.join(path, 'data.txt')
+            writer = TextWriter(filename, flush_interval=60)
+            writer.open(data)
+            writer.append(dict(voltage=1.0, current=4.2e-9))
+            writer.append(dict(voltage=2.0, current=8.4e-9))
+            with open(filename) as f:
+                self.assertNotIn("1.000000E+00", f.read())
+            with mock.patch.object(writer.formatter, 'write_rows', wraps=writer.formatter.write_rows) as write_rows:
+                writer.flush()
+                writer.flush()
+            self.assertEqual(1, write_rows.call_count)
+            writer.close(data)
+            with open(filename) as f:
+                content = f.read()
+            self.assertIn("1.000000E+00\t4.200000E-09", content)
+            self.assertIn("2.000000E+00\t8.400000E-09", content)
+            self.assertLess(content.index("1.000000E+00"), content.index("2.000000E+00"))
+
+    def test_json_writer(self):
+        data = create_data()
+        with tempfile.TemporaryDirectory() as path:
+            filename = os.path.join(path, 'data.json')
+            writer = JSONWriter(filename)
+            writer.open(data)
+            self.assertTrue(os.path.isfile(writer.sidecar_filename))
+            data['series'].append(voltage=1.0, current=4.2e-9)
+            writer.append(dict(voltage=1.0, current=4.2e-9))
+            data['analysis']['spam'] = 42
+            writer.close(data)
+            self.assertFalse(os.path.isfile(writer.sidecar_filename))
+            with open(filename) as f:
+                result = json.load(f)
+            self.assertEqual([1.0], result['series']['voltage'])
+            self.assertEqual({'spam': 42}, result['analysis'])
+
+    def test_close_unopened(self):
+        data = create_data()
+        data['series'].append(voltage=1.0, current=4.2e-9)
+        with tempfile.TemporaryDirectory() as path:
+            filename = os.path.join(path, 'data.txt')
+            writer = TextWriter(filename)
+            writer.close(data)
+            with open(filename) as f:
+                self.assertIn("4.200000E-09", f.read())
+
+    def test_npz_writer(self):
+        data = create_data()
+        data['series'].append(voltage=1.0, current=4.2e-9)
+        data['series'].append(voltage=2.0, current=8.4e-9)
+        data['analysis']['spam'] = {'x_fit': [1.0, 2.0]}
+        with tempfile.TemporaryDirectory() as path:
+            filename = os.path.join(path, 'data.npz')
+            NPZWriter(filename).close(data)
+            for mmap_mode in (None, 'r'):
+                result = load_npz(filename, mmap_mode=mmap_mode)
+                self.assertEqual(data['meta'], result['meta'])
+                self.assertEqual(data['series_units'], result['series_units'])
+                self.assertEqual(data['analysis'], result['analysis'])
+                self.assertEqual([1.0, 2.0], result['series']['voltage'].tolist())
+                self.assertEqual([4.2e-9, 8.4e-9], result['series']['current'].tolist())
+                del result
+
+    def test_npz_writer_close_twice(self):
+        data = create_data()
+        with tempfile.TemporaryDirectory() as path:
+            filename = os.path.join(path, 'data.npz')
+            writer = NPZWriter(filename)
+            writer.close(data)
+            data['meta']['sample_name'] = 'Changed'
+            writer.close(data)
+            self.assertEqual({'sample_name': 'Unittest'}, load_npz(filename)['meta'])
+
+    def test_npz_format_version(self):
+        with tempfile.TemporaryDirectory() as path:
+            filename = os.path.join(path, 'data.npz')
+            buffer = io.BytesIO()
+            np.lib.format.write_array(buffer, np.array([1.0, 2.0]), version=(3, 0))
+            with zipfile.ZipFile(filename, 'w', zipfile.ZIP_STORED) as zf:
+                zf.writestr('series/voltage.npy', buffer.getvalue())
+            self.assertEqual([1.0, 2.0], load_npz(filename)['series']['voltage'].tolist())
+            with self.assertRaises(ValueError):
+                load_npz(filename, mmap_mode='r')
+
+if __name__ == '__main__':
+    unittest.main()